@@ -0,0 +1,31 @@
+"""Index harness_id of connectors, wires and connections
+
+Revision ID: 2c6e8d1a5f93
+Revises: 8e2b6f4a9c15
+Create Date: 2026-10-19 20:11:42.507318
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2c6e8d1a5f93"
+down_revision = "8e2b6f4a9c15"
+branch_labels = None
+depends_on = None
+
+TABLES = ("connectors", "wires", "connections")
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(
+                batch_op.f(f"ix_{table}_harness_id"), ["harness_id"], unique=False
+            )
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f"ix_{table}_harness_id"))
@@ -0,0 +1,208 @@
+"""Create catalog tables and seed sample parts
+
+Revision ID: 3e8b5d0c7a21
+Revises: 9c2f4e7a1b3d
+Create Date: 2026-10-19 11:40:02.551873
+
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3e8b5d0c7a21"
+down_revision = "9c2f4e7a1b3d"
+branch_labels = None
+depends_on = None
+
+# Define table stubs to prevent needing to import the full models
+catalog_parts_table = sa.table(
+    "catalog_parts",
+    sa.column("id", sa.Integer),
+    sa.column("part_number", sa.String),
+    sa.column("voltage_rating", sa.Float),
+    sa.column("is_rohs", sa.Boolean),
+    sa.column("is_ul", sa.Boolean),
+    sa.column("applicable_wire_max_diameter", sa.Float),
+    sa.column("pin_count", sa.Integer),
+    sa.column("pin_positions", sa.JSON(none_as_null=True)),
+    sa.column("outer_diameter", sa.Float),
+    sa.column("applicable_wire_gauge_min", sa.Integer),
+    sa.column("applicable_wire_gauge_max", sa.Integer),
+    sa.column("updated_at", sa.DateTime),
+)
+
+catalog_terminal_series_table = sa.table(
+    "catalog_terminal_series",
+    sa.column("part_id", sa.Integer),
+    sa.column("series", sa.String),
+)
+
+
+def _pin_row(pin_count, pitch):
+    return [{"x": i * pitch, "y": 0.0} for i in range(pin_count)]
+
+
+def upgrade():
+    op.create_table(
+        "catalog_parts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("part_number", sa.String(), nullable=False),
+        sa.Column("voltage_rating", sa.Float(), nullable=True),
+        sa.Column("is_rohs", sa.Boolean(), nullable=True),
+        sa.Column("is_ul", sa.Boolean(), nullable=True),
+        sa.Column("applicable_wire_max_diameter", sa.Float(), nullable=True),
+        sa.Column("pin_count", sa.Integer(), nullable=True),
+        sa.Column("pin_positions", sa.JSON(), nullable=True),
+        sa.Column("outer_diameter", sa.Float(), nullable=True),
+        sa.Column("applicable_wire_gauge_min", sa.Integer(), nullable=True),
+        sa.Column("applicable_wire_gauge_max", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_catalog_parts_part_number"),
+        "catalog_parts",
+        ["part_number"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_catalog_parts_updated_at"),
+        "catalog_parts",
+        ["updated_at"],
+        unique=False,
+    )
+    op.create_table(
+        "catalog_terminal_series",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("part_id", sa.Integer(), nullable=False),
+        sa.Column("series", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["part_id"], ["catalog_parts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_catalog_terminal_series_part_id"),
+        "catalog_terminal_series",
+        ["part_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_catalog_terminal_series_series"),
+        "catalog_terminal_series",
+        ["series"],
+        unique=False,
+    )
+
+    # Seed the sample parts that the mock catalog used to provide
+    now = datetime.utcnow()
+    parts = [
+        # Connectors
+        dict(
+            id=1,
+            part_number="DF13-3S-1.25C",
+            voltage_rating=150.0,
+            applicable_wire_max_diameter=0.9,
+            is_rohs=True,
+            is_ul=True,
+            pin_count=3,
+            pin_positions=_pin_row(3, 1.25),
+        ),
+        dict(
+            id=2,
+            part_number="PHR-3",
+            voltage_rating=100.0,
+            applicable_wire_max_diameter=1.5,
+            is_rohs=True,
+            is_ul=True,
+            pin_count=3,
+            pin_positions=_pin_row(3, 2.0),
+        ),
+        dict(
+            id=3,
+            part_number="OLD-CONN-01",
+            voltage_rating=50.0,
+            applicable_wire_max_diameter=2.0,
+            is_rohs=False,
+            is_ul=True,
+            pin_count=4,
+            pin_positions=_pin_row(4, 2.54),
+        ),
+        # Wires
+        dict(
+            id=4,
+            part_number="UL1007-26-RD",
+            voltage_rating=300.0,
+            outer_diameter=1.2,
+            is_rohs=True,
+            is_ul=True,
+        ),
+        dict(
+            id=5,
+            part_number="UL1007-22-BK",
+            voltage_rating=300.0,
+            outer_diameter=1.6,
+            is_rohs=True,
+            is_ul=True,
+        ),
+        dict(
+            id=6,
+            part_number="THICK-WIRE-01",
+            voltage_rating=600.0,
+            outer_diameter=3.0,
+            is_rohs=True,
+            is_ul=True,
+        ),
+        # Terminals
+        dict(
+            id=7,
+            part_number="DF13-2630SCF",
+            applicable_wire_gauge_min=26,
+            applicable_wire_gauge_max=30,
+            is_rohs=True,
+        ),
+        dict(
+            id=8,
+            part_number="SPH-002T-P0.5S",
+            applicable_wire_gauge_min=24,
+            applicable_wire_gauge_max=28,
+            is_rohs=True,
+        ),
+        dict(
+            id=9,
+            part_number="171662-0153",
+            applicable_wire_gauge_min=22,
+            applicable_wire_gauge_max=26,
+            is_rohs=True,
+        ),
+    ]
+    columns = [c.name for c in catalog_parts_table.columns]
+    op.bulk_insert(
+        catalog_parts_table,
+        [{**dict.fromkeys(columns), **part, "updated_at": now} for part in parts],
+    )
+    op.bulk_insert(
+        catalog_terminal_series_table,
+        [
+            {"part_id": 7, "series": "DF13"},
+            {"part_id": 8, "series": "PHR"},
+            {"part_id": 9, "series": "Molex-KK"},
+        ],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_catalog_terminal_series_series"),
+        table_name="catalog_terminal_series",
+    )
+    op.drop_index(
+        op.f("ix_catalog_terminal_series_part_id"),
+        table_name="catalog_terminal_series",
+    )
+    op.drop_table("catalog_terminal_series")
+    op.drop_index(op.f("ix_catalog_parts_updated_at"), table_name="catalog_parts")
+    op.drop_index(op.f("ix_catalog_parts_part_number"), table_name="catalog_parts")
+    op.drop_table("catalog_parts")
@@ -0,0 +1,29 @@
+"""Add disabled_rules to project_settings
+
+Revision ID: 5a9f3c1e2d47
+Revises: b71d2c9e4f08
+Create Date: 2026-10-19 16:41:08.527319
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5a9f3c1e2d47"
+down_revision = "b71d2c9e4f08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("project_settings", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("disabled_rules", sa.JSON(), nullable=False, server_default="[]")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("project_settings", schema=None) as batch_op:
+        batch_op.drop_column("disabled_rules")
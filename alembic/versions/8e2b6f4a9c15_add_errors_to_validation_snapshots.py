@@ -0,0 +1,27 @@
+"""Add errors to validation_snapshots
+
+Revision ID: 8e2b6f4a9c15
+Revises: d4c7e91f0b38
+Create Date: 2026-10-19 19:05:17.284633
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8e2b6f4a9c15"
+down_revision = "d4c7e91f0b38"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("validation_snapshots", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("errors", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("validation_snapshots", schema=None) as batch_op:
+        batch_op.drop_column("errors")
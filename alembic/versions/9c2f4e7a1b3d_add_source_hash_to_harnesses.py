@@ -0,0 +1,31 @@
+"""Add source_hash to harnesses
+
+Revision ID: 9c2f4e7a1b3d
+Revises: 68cfd8020346
+Create Date: 2026-10-19 09:12:44.318205
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9c2f4e7a1b3d"
+down_revision = "68cfd8020346"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("harnesses", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("source_hash", sa.String(64), nullable=True))
+        batch_op.create_index(
+            batch_op.f("ix_harnesses_source_hash"), ["source_hash"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("harnesses", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_harnesses_source_hash"))
+        batch_op.drop_column("source_hash")
@@ -0,0 +1,32 @@
+"""Add harness changes
+
+Revision ID: a8d41f6c2e70
+Revises: e5a7c3b9d012
+Create Date: 2026-10-20 14:41:37.115482
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a8d41f6c2e70"
+down_revision = "e5a7c3b9d012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "harness_changes",
+        sa.Column("harness_id", sa.String(36), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("entities", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["harness_id"], ["harnesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("harness_id", "revision"),
+    )
+
+
+def downgrade():
+    op.drop_table("harness_changes")
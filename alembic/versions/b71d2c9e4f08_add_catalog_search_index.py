@@ -0,0 +1,226 @@
+"""Add catalog search columns and trigram index
+
+Revision ID: b71d2c9e4f08
+Revises: 3e8b5d0c7a21
+Create Date: 2026-10-19 14:03:27.904116
+
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b71d2c9e4f08"
+down_revision = "3e8b5d0c7a21"
+branch_labels = None
+depends_on = None
+
+# Define table stubs to prevent needing to import the full models
+catalog_parts_table = sa.table(
+    "catalog_parts",
+    sa.column("id", sa.Integer),
+    sa.column("part_number", sa.String),
+    sa.column("part_number_key", sa.String),
+    sa.column("component_type", sa.String),
+    sa.column("manufacturer", sa.String),
+    sa.column("name", sa.String),
+    sa.column("voltage_rating", sa.Float),
+    sa.column("is_rohs", sa.Boolean),
+    sa.column("is_ul", sa.Boolean),
+    sa.column("pin_count", sa.Integer),
+    sa.column("pin_positions", sa.JSON(none_as_null=True)),
+    sa.column("outer_diameter", sa.Float),
+    sa.column("gauge", sa.Float),
+    sa.column("applicable_wire_gauge_min", sa.Integer),
+    sa.column("updated_at", sa.DateTime),
+)
+
+catalog_part_trigrams_table = sa.table(
+    "catalog_part_trigrams",
+    sa.column("trigram", sa.String),
+    sa.column("part_id", sa.Integer),
+)
+
+# Library attributes of the parts seeded by the previous revision
+SEEDED_ATTRIBUTES = {
+    "DF13-3S-1.25C": ("Hirose", "Hirose DF13-3S", None),
+    "PHR-3": ("JST", "JST PH-3P", None),
+    "OLD-CONN-01": (None, None, None),
+    "UL1007-26-RD": ("Generic", "26 AWG Red", 26.0),
+    "UL1007-22-BK": ("Generic", "22 AWG Black", 22.0),
+    "THICK-WIRE-01": (None, None, None),
+    "DF13-2630SCF": ("Hirose", "Hirose DF13 Crimp Terminal", None),
+    "SPH-002T-P0.5S": ("JST", "JST PH Crimp Terminal", None),
+    "171662-0153": ("Molex", "Molex KK Crimp Terminal", None),
+}
+
+
+def _normalize(text):
+    return "".join(ch for ch in text.upper() if ch.isalnum())
+
+
+def _trigrams(text):
+    key = _normalize(text)
+    if len(key) < 3:
+        return {key} if key else set()
+    return {key[i : i + 3] for i in range(len(key) - 2)}
+
+
+def _pin_row(pin_count, pitch):
+    return [{"x": i * pitch, "y": 0.0} for i in range(pin_count)]
+
+
+def upgrade():
+    with op.batch_alter_table("catalog_parts", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("part_number_key", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("component_type", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("manufacturer", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("name", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("gauge", sa.Float(), nullable=True))
+
+    op.create_table(
+        "catalog_part_trigrams",
+        sa.Column("trigram", sa.String(length=3), nullable=False),
+        sa.Column("part_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["part_id"], ["catalog_parts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("trigram", "part_id"),
+    )
+    op.create_index(
+        op.f("ix_catalog_part_trigrams_part_id"),
+        "catalog_part_trigrams",
+        ["part_id"],
+        unique=False,
+    )
+
+    parts = catalog_parts_table
+    conn = op.get_bind()
+
+    # Derive the type of existing parts from the specs they carry
+    for component_type, column in (
+        ("connector", parts.c.pin_count),
+        ("wire", parts.c.outer_diameter),
+        ("terminal", parts.c.applicable_wire_gauge_min),
+    ):
+        conn.execute(
+            parts.update()
+            .where(parts.c.component_type.is_(None), column.is_not(None))
+            .values(component_type=component_type)
+        )
+    for part_number, (manufacturer, name, gauge) in SEEDED_ATTRIBUTES.items():
+        conn.execute(
+            parts.update()
+            .where(parts.c.part_number == part_number)
+            .values(manufacturer=manufacturer, name=name, gauge=gauge)
+        )
+
+    # The component library parts, formerly hardcoded in the components endpoint
+    existing = set(conn.execute(sa.select(parts.c.part_number)).scalars())
+    library = [
+        dict(
+            part_number="XH-2P",
+            component_type="connector",
+            manufacturer="JST",
+            name="JST XH-2P",
+            pin_count=2,
+            pin_positions=_pin_row(2, 2.5),
+        ),
+        dict(
+            part_number="XH-3P",
+            component_type="connector",
+            manufacturer="JST",
+            name="JST XH-3P",
+            pin_count=3,
+            pin_positions=_pin_row(3, 2.5),
+        ),
+        dict(
+            part_number="22-01-3027",
+            component_type="connector",
+            manufacturer="Molex",
+            name="Molex KK-2P",
+            pin_count=2,
+            pin_positions=_pin_row(2, 2.54),
+        ),
+        dict(
+            part_number="UL1007-22-RED",
+            component_type="wire",
+            manufacturer="Generic",
+            name="22 AWG Red",
+            gauge=22.0,
+        ),
+        dict(
+            part_number="UL1007-22-BLK",
+            component_type="wire",
+            manufacturer="Generic",
+            name="22 AWG Black",
+            gauge=22.0,
+        ),
+    ]
+    columns = [c.name for c in parts.columns if c.name != "id"]
+    now = datetime.utcnow()
+    op.bulk_insert(
+        parts,
+        [
+            {**dict.fromkeys(columns), **part, "updated_at": now}
+            for part in library
+            if part["part_number"] not in existing
+        ],
+    )
+
+    # Backfill the normalized part numbers and the search trigrams
+    trigram_rows = []
+    rows = conn.execute(sa.select(parts.c.id, parts.c.part_number, parts.c.name))
+    for part_id, part_number, name in rows.all():
+        conn.execute(
+            parts.update()
+            .where(parts.c.id == part_id)
+            .values(part_number_key=_normalize(part_number))
+        )
+        trigram_rows.extend(
+            {"trigram": trigram, "part_id": part_id}
+            for trigram in _trigrams(part_number) | _trigrams(name or "")
+        )
+    if trigram_rows:
+        op.bulk_insert(catalog_part_trigrams_table, trigram_rows)
+
+    with op.batch_alter_table("catalog_parts", schema=None) as batch_op:
+        batch_op.alter_column(
+            "part_number_key", existing_type=sa.String(), nullable=False
+        )
+        batch_op.create_index(
+            batch_op.f("ix_catalog_parts_part_number_key"),
+            ["part_number_key"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_catalog_parts_component_type"),
+            ["component_type"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_catalog_parts_manufacturer"),
+            ["manufacturer"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_catalog_parts_gauge"), ["gauge"], unique=False
+        )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_catalog_part_trigrams_part_id"), table_name="catalog_part_trigrams"
+    )
+    op.drop_table("catalog_part_trigrams")
+    with op.batch_alter_table("catalog_parts", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_catalog_parts_gauge"))
+        batch_op.drop_index(batch_op.f("ix_catalog_parts_manufacturer"))
+        batch_op.drop_index(batch_op.f("ix_catalog_parts_component_type"))
+        batch_op.drop_index(batch_op.f("ix_catalog_parts_part_number_key"))
+        batch_op.drop_column("gauge")
+        batch_op.drop_column("name")
+        batch_op.drop_column("manufacturer")
+        batch_op.drop_column("component_type")
+        batch_op.drop_column("part_number_key")
@@ -0,0 +1,41 @@
+"""Add harness revision and validation snapshots
+
+Revision ID: d4c7e91f0b38
+Revises: 5a9f3c1e2d47
+Create Date: 2026-10-19 18:22:51.630947
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4c7e91f0b38"
+down_revision = "5a9f3c1e2d47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("harnesses", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("revision", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    op.create_table(
+        "validation_snapshots",
+        sa.Column("harness_id", sa.String(36), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("context_key", sa.String(length=64), nullable=False),
+        sa.Column("entities", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["harness_id"], ["harnesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("harness_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("validation_snapshots")
+    with op.batch_alter_table("harnesses", schema=None) as batch_op:
+        batch_op.drop_column("revision")
@@ -0,0 +1,32 @@
+"""Add catalog version counter
+
+Revision ID: e5a7c3b9d012
+Revises: 2c6e8d1a5f93
+Create Date: 2026-10-20 09:12:05.318204
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5a7c3b9d012"
+down_revision = "2c6e8d1a5f93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_version = op.create_table(
+        "catalog_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # The catalog seeded by earlier migrations is version 1
+    op.bulk_insert(catalog_version, [{"id": 1, "version": 1}])
+
+
+def downgrade():
+    op.drop_table("catalog_version")
@@ -2,6 +2,7 @@ from collections.abc import Generator
 
 from app.core.config import settings
 from app.db.session import SessionLocal
+from app.services.export_cache import export_cache
 from app.services.kicad_engine_service import KiCadEngineService
 
 
@@ -21,5 +22,9 @@ def get_db() -> Generator:
 def get_kicad_engine() -> KiCadEngineService:
     """
     Dependency function that returns an instance of the KiCadEngineService.
+    Generated files are shared through the export cache unless it is disabled.
     """
-    return KiCadEngineService(cli_path=settings.KICAD_CLI_PATH)
+    return KiCadEngineService(
+        cli_path=settings.KICAD_CLI_PATH,
+        cache=export_cache if settings.EXPORT_CACHE_MAX_BYTES else None,
+    )
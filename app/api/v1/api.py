@@ -1,9 +1,20 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import components, harness_exports, harnesses, projects
+from app.api.v1.endpoints import (
+    catalog,
+    components,
+    harness_exports,
+    harnesses,
+    importer,
+    projects,
+    validation,
+)
 
 api_router = APIRouter()
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
+api_router.include_router(importer.router, tags=["import"])
 api_router.include_router(harness_exports.router, prefix="/harnesses", tags=["exports"])
 api_router.include_router(harnesses.router, prefix="/harnesses", tags=["harnesses"])
 api_router.include_router(components.router, prefix="/components", tags=["components"])
+api_router.include_router(catalog.router, prefix="/catalog", tags=["catalog"])
+api_router.include_router(validation.router, prefix="/validation", tags=["validation"])
@@ -0,0 +1,34 @@
+# app/api/v1/endpoints/catalog.py
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.api import deps
+from app.services.catalog_ingest import catalog_ingest_service, detect_format
+
+router = APIRouter()
+
+
+@router.post("/ingest", response_model=schemas.CatalogIngestReport)
+def ingest_catalog(
+    *,
+    db: Session = Depends(deps.get_db),
+    feed: UploadFile = File(...),
+):
+    """
+    Upsert the parts of a supplier catalog feed (.csv, .jsonl or .ndjson).
+    Invalid rows are skipped and listed in the report.
+    """
+    if feed.filename is None:
+        raise HTTPException(status_code=400, detail="File name is missing.")
+
+    try:
+        feed_format = detect_format(feed.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return catalog_ingest_service.ingest(db, feed.file, feed_format)
+    except ValueError as e:
+        # Undecodable input; batches before the error are already committed
+        raise HTTPException(status_code=400, detail=f"Failed to read catalog feed: {e}")
@@ -1,67 +1,48 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.api import deps
+from app.services.component_search import ComponentQuery, component_search_service
 
 router = APIRouter()
 
+# Library pages may be reused briefly, then revalidated with If-None-Match
+CACHE_CONTROL = "private, max-age=60, must-revalidate"
+
 
-@router.get("/")
-def get_components():
+@router.get("/", response_model=schemas.ComponentSearchResult)
+def search_components(
+    *,
+    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    q: str | None = Query(None, description="Part number or name, fuzzy matched"),
+    component_type: schemas.ComponentType | None = Query(None, alias="type"),
+    manufacturer: str | None = None,
+    pin_count: int | None = Query(None, ge=1),
+    gauge: float | None = Query(None, gt=0),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+):
     """
-    Get a list of available components for the library.
+    Search the component library by part number or name, with optional filters
+    on type, manufacturer, pin count and wire gauge. Results are paginated and
+    include facet counts for each filter.
     """
-    # In a real application, this would come from a database.
-    # For Cycle 2, we'll use a hardcoded list.
-    components = [
-        {
-            "id": "jst-xh-2p",
-            "type": "connector",
-            "name": "JST XH-2P",
-            "data": {
-                "manufacturer": "JST",
-                "part_number": "XH-2P",
-                "pins": [{"id": "1"}, {"id": "2"}],
-            },
-        },
-        {
-            "id": "jst-xh-3p",
-            "type": "connector",
-            "name": "JST XH-3P",
-            "data": {
-                "manufacturer": "JST",
-                "part_number": "XH-3P",
-                "pins": [{"id": "1"}, {"id": "2"}, {"id": "3"}],
-            },
-        },
-        {
-            "id": "molex-kk-2p",
-            "type": "connector",
-            "name": "Molex KK-2P",
-            "data": {
-                "manufacturer": "Molex",
-                "part_number": "22-01-3027",
-                "pins": [{"id": "1"}, {"id": "2"}],
-            },
-        },
-        {
-            "id": "wire-red-22awg",
-            "type": "wire",
-            "name": "22 AWG Red",
-            "data": {
-                "manufacturer": "Generic",
-                "part_number": "UL1007-22-RED",
-                "color": "red",
-                "gauge": 22,
-            },
-        },
-        {
-            "id": "wire-black-22awg",
-            "type": "wire",
-            "name": "22 AWG Black",
-            "data": {
-                "manufacturer": "Generic",
-                "part_number": "UL1007-22-BLK",
-                "color": "black",
-                "gauge": 22,
-            },
-        },
-    ]
-    return components
+    query = ComponentQuery(
+        q=q,
+        component_type=component_type,
+        manufacturer=manufacturer,
+        pin_count=pin_count,
+        gauge=gauge,
+        page=page,
+        page_size=page_size,
+    )
+    etag = component_search_service.etag(db, query)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return component_search_service.search(db, query)
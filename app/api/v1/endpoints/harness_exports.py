@@ -1,5 +1,6 @@
 import csv
 import io
+from collections.abc import Iterable, Iterator
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -9,9 +10,27 @@ from starlette.responses import StreamingResponse
 from app.api import deps
 from app.exceptions import HarnessNotFoundException
 from app.services import harness_service
+from app.services.netlist import continuity_tests, netlist_service
 
 router = APIRouter()
 
+# Rows written per chunk of a streamed CSV
+CSV_CHUNK_ROWS = 1000
+
+
+def _csv_chunks(header: list[str], rows: Iterable[Iterable[object]]) -> Iterator[str]:
+    """Writes CSV rows in chunks, so large exports are never held in memory."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(header)
+    for n, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if n % CSV_CHUNK_ROWS == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
+
 
 @router.get("/{harness_id}/strip-list", response_class=StreamingResponse)
 def get_strip_list(
@@ -116,3 +135,32 @@ def get_formboard_pdf(
             "Content-Disposition": f"attachment; filename=formboard-{harness_id}.pdf"
         },
     )
+
+
+@router.get("/{harness_id}/continuity-test", response_class=StreamingResponse)
+def get_continuity_test(
+    *,
+    db: Session = Depends(deps.get_db),
+    harness_id: UUID,
+):
+    """
+    Get the continuity tester program for a harness, derived from its nets:
+    every pin pair within a net must be connected and every pin pair across
+    nets isolated. The CSV is streamed as it is generated.
+    """
+    try:
+        nets = netlist_service.get_nets(db=db, harness_id=harness_id)
+    except HarnessNotFoundException:
+        raise HTTPException(status_code=404, detail="Harness not found")
+
+    return StreamingResponse(
+        _csv_chunks(
+            ["test", "pin_a", "pin_b", "net_a", "net_b"], continuity_tests(nets)
+        ),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=continuity-test-{harness_id}.csv"
+            )
+        },
+    )
@@ -3,7 +3,6 @@ import io
 import os
 import shutil
 from pathlib import Path
-from tempfile import NamedTemporaryFile
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
@@ -12,9 +11,16 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
-from app.exceptions import HarnessNotFoundException, InvalidHarnessDataException
+from app.exceptions import (
+    HarnessNotFoundException,
+    InvalidHarnessDataException,
+    ScratchQuotaException,
+)
 from app.services import harness_service, validation_service
 from app.services.dxf_exporter import DxfExporter
+from app.services.netlist import netlist_service
+from app.services.scratch import scratch_workspace
+from app.services.terminal_assignment import terminal_assignment_service
 
 router = APIRouter()
 
@@ -170,20 +176,23 @@ def get_fromto(
     return harness_service.generate_fromto(db_harness=harness)
 
 
-@router.get("/{harness_id}/validate", response_model=list[schemas.ValidationError])
-def validate_harness(
+@router.get("/{harness_id}/nets", response_model=list[schemas.Net])
+def get_nets(
     *,
     db: Session = Depends(deps.get_db),
     harness_id: UUID,
 ):
     """
-    Validate the harness against project settings.
+    Get the nets of a harness: the groups of pins connected through wires.
+    Pins without wires are listed as single-pin nets.
     """
     try:
-        harness = harness_service.get_harness(db=db, harness_id=harness_id)
+        return netlist_service.get_nets(db=db, harness_id=harness_id)
     except HarnessNotFoundException:
         raise HTTPException(status_code=404, detail="Harness not found")
 
+
+def _get_project_settings(db: Session, harness_id: UUID) -> models.ProjectSettings:
     # This assumes the harness is part of a project and settings are available.
     # In a real app, you might need a more robust way to get from harness to
     # project settings.
@@ -196,11 +205,51 @@ def validate_harness(
         raise HTTPException(
             status_code=400, detail="Project settings not found for this harness."
         )
+    return harness_design.project.settings
 
-    errors = validation_service.validate_harness(
-        db=db, harness=harness, settings=harness_design.project.settings
+
+@router.get("/{harness_id}/validate", response_model=list[schemas.ValidationError])
+def validate_harness(
+    *,
+    db: Session = Depends(deps.get_db),
+    harness_id: UUID,
+):
+    """
+    Validate the harness against project settings. Repeat calls for an
+    unchanged harness, settings and catalog are served from the last result.
+    """
+    # The connectors, wires and connections are only loaded if the last
+    # result cannot be reused
+    harness = db.get(models.Harness, harness_id)
+    if harness is None:
+        raise HTTPException(status_code=404, detail="Harness not found")
+
+    settings = _get_project_settings(db, harness_id)
+    return validation_service.validate_harness(
+        db=db, harness=harness, settings=settings
     )
-    return errors
+
+
+@router.post(
+    "/{harness_id}/auto-assign-terminals",
+    response_model=schemas.TerminalAssignmentReport,
+)
+def auto_assign_terminals(
+    *,
+    db: Session = Depends(deps.get_db),
+    harness_id: UUID,
+    overwrite: bool = False,
+):
+    """
+    Assign compatible catalog terminals to the connection ends of a harness.
+    Terminals already set are kept unless `overwrite` is true.
+    """
+    try:
+        return terminal_assignment_service.auto_assign(
+            db=db, harness_id=harness_id, overwrite=overwrite
+        )
+    except HarnessNotFoundException:
+        raise HTTPException(status_code=404, detail="Harness not found")
 
 
 @router.get("/{harness_id}/procurement/export-csv")
@@ -211,27 +260,21 @@ def export_procurement_csv(
 ):
     """
     Export the Bill of Materials (BOM) as a CSV file for procurement.
-    The export is blocked if validation fails.
+    The export is blocked if validation reports errors; warnings do not
+    block it.
     """
     try:
         harness = harness_service.get_harness(db=db, harness_id=harness_id)
     except HarnessNotFoundException:
         raise HTTPException(status_code=404, detail="Harness not found")
 
-    harness_design = (
-        db.query(models.HarnessDesign)
-        .filter(models.HarnessDesign.harness_id == harness_id)
-        .first()
-    )
-    if not harness_design or not harness_design.project.settings:
-        raise HTTPException(
-            status_code=400, detail="Project settings not found for this harness."
-        )
+    settings = _get_project_settings(db, harness_id)
 
-    # First, run validation
+    # Usually served from the result of the validation the user just ran
     errors = validation_service.validate_harness(
-        db=db, harness=harness, settings=harness_design.project.settings
+        db=db, harness=harness, settings=settings
     )
+    errors = [e for e in errors if e.severity == "error"]
     if errors:
         raise HTTPException(
             status_code=400,
@@ -356,6 +399,7 @@ def update_wire_3d_path(
         p2 = path_in.points[i + 1]
         length += ((p2.x - p1.x) ** 2 + (p2.y - p1.y) ** 2 + (p2.z - p1.z) ** 2) ** 0.5
     wire.length = length * manufacturing_margin
+    harness_service.record_change(db, harness_id, {"wire": {wire.id}})
 
     db.commit()
     db.refresh(wire)
@@ -391,14 +435,17 @@ def get_jig_dxf(
     exporter = DxfExporter(scale=scale)
     dxf_doc = exporter.export_harness_design(harness_design)
 
-    # Save to a temporary file and stream the response
-    with NamedTemporaryFile(delete=False, suffix=".dxf") as tmpfile:
-        dxf_doc.saveas(tmpfile.name)
-        tmpfile.seek(0)
-        return Response(
-            content=tmpfile.read(),
-            media_type="application/vnd.dxf",
-            headers={
-                "Content-Disposition": f"attachment; filename=jig_{harness_id}.dxf"
-            },
-        )
+    # Save to a scratch file, removed with its scope once read
+    try:
+        with scratch_workspace.scope() as scope:
+            path = scope.new_file(".dxf")
+            dxf_doc.saveas(path)
+            content = Path(path).read_bytes()
+    except ScratchQuotaException as e:
+        raise HTTPException(status_code=507, detail=str(e))
+
+    return Response(
+        content=content,
+        media_type="application/vnd.dxf",
+        headers={"Content-Disposition": f"attachment; filename=jig_{harness_id}.dxf"},
+    )
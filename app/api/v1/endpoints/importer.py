@@ -1,9 +1,16 @@
 # app/api/v1/endpoints/import.py
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from app import schemas
 from app.api import deps
+from app.exceptions import ProjectNotFoundException
+from app.services.batch_importer import batch_import_service
 from app.services.importer import importer_service
 
 router = APIRouter()
@@ -36,3 +43,38 @@ def import_dxf(
         raise HTTPException(status_code=400, detail=f"Failed to parse DXF file: {e}")
 
     return harness
+
+
+@router.post("/harnesses/import-dxf-batch", response_model=schemas.BatchImportReport)
+def import_dxf_batch(
+    *,
+    db: Session = Depends(deps.get_db),
+    project_id: int,
+    archive: UploadFile = File(...),
+):
+    """
+    Import every DXF file in a ZIP archive, creating one harness per file.
+    Returns a per-file success/failure report.
+    """
+    if archive.filename is None:
+        raise HTTPException(status_code=400, detail="File name is missing.")
+
+    if not archive.filename.lower().endswith(".zip"):
+        raise HTTPException(
+            status_code=400, detail="Invalid file type. Please upload a .zip file."
+        )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Worker processes read the archive from disk, so spool it to a file
+        archive_path = Path(temp_dir) / "upload.zip"
+        with archive_path.open("wb") as buffer:
+            shutil.copyfileobj(archive.file, buffer)
+        if not zipfile.is_zipfile(archive_path):
+            raise HTTPException(status_code=400, detail="Invalid ZIP archive.")
+
+        try:
+            return batch_import_service.import_path(
+                db=db, source=archive_path, project_id=project_id
+            )
+        except ProjectNotFoundException:
+            raise HTTPException(status_code=404, detail="Project not found")
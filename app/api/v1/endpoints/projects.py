@@ -1,9 +1,12 @@
 # app/api/v1/endpoints/projects.py
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
 
 from app import models, schemas
 from app.api import deps
+from app.services import validation_service
 
 router = APIRouter()
 
@@ -83,11 +86,23 @@ def update_project_settings(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
+    unknown = [
+        name
+        for name in settings_in.disabled_rules
+        if name not in validation_service.registry
+    ]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown validation rules: {', '.join(unknown)}",
+        )
+
     if project.settings:
         # Update existing settings
         project.settings.system_voltage = settings_in.system_voltage
         project.settings.require_rohs = settings_in.require_rohs
         project.settings.require_ul = settings_in.require_ul
+        project.settings.disabled_rules = settings_in.disabled_rules
     else:
         # Create new settings
         project.settings = models.ProjectSettings(**settings_in.model_dump())
@@ -96,3 +111,42 @@ def update_project_settings(
     db.commit()
     db.refresh(project.settings)
     return project.settings
+
+
+@router.get("/{project_id}/validate")
+def validate_project(
+    *,
+    db: Session = Depends(deps.get_db),
+    project_id: int,
+):
+    """
+    Validate every harness of the project concurrently. Results are streamed
+    as NDJSON, one line per harness in order of completion, so the first
+    problems show up before the whole project is checked.
+    """
+    project = db.get(models.Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not project.settings:
+        raise HTTPException(
+            status_code=400, detail="Project settings not found for this project."
+        )
+
+    harness_ids = (
+        db.execute(
+            select(models.HarnessDesign.harness_id)
+            .where(models.HarnessDesign.project_id == project_id)
+            .distinct()
+        )
+        .scalars()
+        .all()
+    )
+    # Each worker opens its own session on the request's database
+    session_factory = sessionmaker(autoflush=False, bind=db.get_bind())
+    results = validation_service.validate_harnesses(
+        session_factory, harness_ids, project.settings
+    )
+    return StreamingResponse(
+        (result.model_dump_json() + "\n" for result in results),
+        media_type="application/x-ndjson",
+    )
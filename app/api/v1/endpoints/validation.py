@@ -0,0 +1,16 @@
+# app/api/v1/endpoints/validation.py
+from fastapi import APIRouter
+
+from app import schemas
+from app.services import validation_service
+
+router = APIRouter()
+
+
+@router.get("/rules", response_model=list[schemas.ValidationRule])
+def list_validation_rules():
+    """
+    List the validation rules, with how often each has run and the time spent
+    in it. Rule names can be disabled per project in the project settings.
+    """
+    return validation_service.describe_rules()
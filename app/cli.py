@@ -0,0 +1,134 @@
+# app/cli.py
+
+"""
+Command-line entry points for maintenance tasks.
+
+Usage:
+    python -m app.cli import-dxf ARCHIVE_OR_DIR --project-id 1
+    python -m app.cli ingest-catalog FEED.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from app import schemas
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.exceptions import ProjectNotFoundException
+from app.services.batch_importer import BatchImportService
+from app.services.catalog import catalog_service
+from app.services.catalog_ingest import CatalogIngestService, detect_format
+from app.services.importer import importer_service
+
+
+def import_dxf(args: argparse.Namespace) -> int:
+    """Imports a ZIP archive or a directory of DXF files into a project."""
+    service = BatchImportService(
+        importer=importer_service,
+        max_workers=args.workers or settings.IMPORT_MAX_WORKERS,
+        batch_size=args.batch_size or settings.IMPORT_BATCH_SIZE,
+    )
+    with SessionLocal() as db:
+        try:
+            report = service.import_path(
+                db=db, source=args.source, project_id=args.project_id
+            )
+        except (ProjectNotFoundException, ValueError) as e:
+            print(f"error: {str(e) or 'Project not found'}", file=sys.stderr)
+            return 2
+
+    for result in report.files:
+        detail = result.error if result.status == "failed" else result.harness_id
+        print(f"{result.status:<9} {result.filename}: {detail}")
+    print(
+        f"{report.imported} imported, {report.duplicates} duplicates, "
+        f"{report.failed} failed"
+    )
+    return 1 if report.failed else 0
+
+
+def _print_ingest_progress(report: schemas.CatalogIngestReport) -> None:
+    print(
+        f"{report.rows} rows read, {report.upserted} upserted, "
+        f"{report.rejected} rejected",
+        file=sys.stderr,
+    )
+
+
+def ingest_catalog(args: argparse.Namespace) -> int:
+    """Upserts the parts of a supplier catalog feed into the catalog tables."""
+    try:
+        feed_format = args.format or detect_format(args.feed.name)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    service = CatalogIngestService(
+        catalog=catalog_service,
+        batch_size=args.batch_size or settings.CATALOG_INGEST_BATCH_SIZE,
+    )
+    with SessionLocal() as db, args.feed.open("rb") as feed:
+        try:
+            report = service.ingest(
+                db, feed, feed_format, progress=_print_ingest_progress
+            )
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+
+    for rejected in report.errors:
+        print(f"rejected  line {rejected.line}: {rejected.error}")
+    if report.rejected > len(report.errors):
+        print(f"... and {report.rejected - len(report.errors)} more rejected rows")
+    print(f"{report.upserted} upserted, {report.rejected} rejected")
+    return 1 if report.rejected else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import-dxf", help="Import a ZIP archive or a directory of DXF files."
+    )
+    import_parser.add_argument("source", type=Path)
+    import_parser.add_argument("--project-id", type=int, required=True)
+    import_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser processes (default: IMPORT_MAX_WORKERS, or CPUs)",
+    )
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Drawings per transaction (default: IMPORT_BATCH_SIZE)",
+    )
+    import_parser.set_defaults(func=import_dxf)
+
+    ingest_parser = subparsers.add_parser(
+        "ingest-catalog", help="Upsert a supplier catalog feed (CSV or JSON Lines)."
+    )
+    ingest_parser.add_argument("feed", type=Path)
+    ingest_parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        default=None,
+        help="Feed format (default: from the file extension)",
+    )
+    ingest_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Rows per transaction (default: CATALOG_INGEST_BATCH_SIZE)",
+    )
+    ingest_parser.set_defaults(func=ingest_catalog)
+
+    args = parser.parse_args(argv)
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,12 +7,90 @@ class Settings(BaseSettings):
 
     Attributes:
         DATABASE_URL: The URL for the application's database.
+        DB_POOL_SIZE: Connections kept open to PostgreSQL.
+        DB_MAX_OVERFLOW: Connections opened beyond the pool under load.
+        DB_POOL_TIMEOUT: Seconds to wait for a free pooled connection.
+        DB_POOL_RECYCLE: Seconds after which a pooled connection is replaced.
+        DB_STATEMENT_TIMEOUT: Seconds after which PostgreSQL cancels a
+            statement. 0 disables the timeout.
+        SQLITE_JOURNAL_MODE: Journal mode of a SQLite database file.
+        SQLITE_MMAP_SIZE: Bytes of a SQLite database file read through memory
+            mapping.
+        SQLITE_BUSY_TIMEOUT: Seconds a SQLite connection waits for a lock held
+            by another one.
         KICAD_CLI_PATH: The full path to the kicad-cli executable.
+        IMPORT_MAX_WORKERS: Worker processes used to parse DXF files in a batch
+            import. Defaults to the number of CPUs.
+        IMPORT_BATCH_SIZE: Number of parsed drawings inserted per transaction
+            in a batch import.
+        CATALOG_API_URL: Base URL of an external catalog API consulted for part
+            numbers missing from the catalog tables. Disabled when unset.
+        CATALOG_API_TIMEOUT: Timeout in seconds of a catalog API request.
+        CATALOG_API_BATCH_SIZE: Maximum part numbers per catalog API request.
+        CATALOG_CACHE_TTL: Seconds a part fetched from the catalog API is
+            cached.
+        CATALOG_CACHE_NEGATIVE_TTL: Seconds a part unknown to the catalog API
+            is cached as missing.
+        CATALOG_CACHE_MAX_SIZE: Maximum part numbers held in the cache.
+        CATALOG_SPEC_CACHE_SIZE: Maximum part numbers whose catalog specs are
+            cached in process for enriching harness components.
+        CATALOG_INGEST_BATCH_SIZE: Number of catalog feed rows upserted per
+            transaction.
+        VALIDATION_MAX_WORKERS: Threads validating harnesses concurrently in a
+            project-wide validation.
+        VALIDATION_DEFAULT_DISABLED_RULES: Validation rules off for new project
+            settings that do not list their own; opt-in rules such as
+            floating_pins, which flags every unwired pin.
+        KICAD_MAX_WORKERS: Maximum kicad-cli processes running at once.
+        KICAD_QUEUE_SIZE: kicad-cli commands allowed to wait for a free
+            worker; further commands are rejected.
+        KICAD_TIMEOUT: Seconds after which a kicad-cli process is killed.
+        EXPORT_CACHE_DIR: Directory of the cache of generated schematics, DXF
+            and BOM files. Defaults to a directory in the system temp dir.
+        EXPORT_CACHE_MAX_BYTES: Size the export cache is kept under by
+            evicting the least recently used files. 0 disables the cache.
+        EXPORT_CACHE_MIN_AGE: Seconds a cached file is kept after it was last
+            returned, even over the size limit, as it may still be read.
+        SCRATCH_DIR: Directory of the temporary files of exports. Defaults to
+            a directory in the system temp dir.
+        SCRATCH_QUOTA_BYTES: Space the temporary files may use; new ones are
+            refused beyond it.
+        SCRATCH_MAX_AGE: Seconds after which temporary files left outside a
+            request scope are removed.
     """
 
     DATABASE_URL: str = "sqlite:///./app/test.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_TIMEOUT: float = 30.0
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT: float = 5.0
     KICAD_CLI_PATH: str = "/usr/bin/kicad-cli"
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000"]
+    IMPORT_MAX_WORKERS: int | None = None
+    IMPORT_BATCH_SIZE: int = 50
+    CATALOG_API_URL: str | None = None
+    CATALOG_API_TIMEOUT: float = 5.0
+    CATALOG_API_BATCH_SIZE: int = 100
+    CATALOG_CACHE_TTL: float = 3600.0
+    CATALOG_CACHE_NEGATIVE_TTL: float = 300.0
+    CATALOG_CACHE_MAX_SIZE: int = 10_000
+    CATALOG_SPEC_CACHE_SIZE: int = 10_000
+    CATALOG_INGEST_BATCH_SIZE: int = 1000
+    VALIDATION_MAX_WORKERS: int = 4
+    VALIDATION_DEFAULT_DISABLED_RULES: list[str] = ["floating_pins"]
+    KICAD_MAX_WORKERS: int = 2
+    KICAD_QUEUE_SIZE: int = 8
+    KICAD_TIMEOUT: float = 120.0
+    EXPORT_CACHE_DIR: str | None = None
+    EXPORT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    EXPORT_CACHE_MIN_AGE: float = 300.0
+    SCRATCH_DIR: str | None = None
+    SCRATCH_QUOTA_BYTES: int = 1024 * 1024 * 1024
+    SCRATCH_MAX_AGE: float = 3600.0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,87 @@
+# app/db/profiles.py
+
+"""
+Database Profiles
+
+The engine options for the database in `DATABASE_URL`, picked by its
+backend:
+
+- PostgreSQL: a pool of `DB_POOL_SIZE` connections that grows by up to
+  `DB_MAX_OVERFLOW` under load, checks connections before use and recycles
+  them after `DB_POOL_RECYCLE` seconds. Every statement is cancelled by the
+  server after `DB_STATEMENT_TIMEOUT` seconds.
+- SQLite: connections switch the database to write-ahead logging, where
+  readers do not block the writer and commits only sync the log, memory-map
+  up to `SQLITE_MMAP_SIZE` bytes of the file and wait up to
+  `SQLITE_BUSY_TIMEOUT` seconds for a lock instead of failing at once.
+  In-memory databases, private to their connection, keep the defaults of
+  SQLite and its Python driver.
+"""
+
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import URL, make_url
+
+from app.core.config import Settings, settings
+
+
+def _is_memory(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def engine_options(url: URL, config: Settings = settings) -> dict[str, Any]:
+    """Returns the `create_engine` keyword arguments of a database."""
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        connect_args: dict[str, Any] = {"check_same_thread": False}
+        if not _is_memory(url):
+            connect_args["timeout"] = config.SQLITE_BUSY_TIMEOUT
+        return {"connect_args": connect_args}
+    if backend == "postgresql":
+        options: dict[str, Any] = {
+            "pool_size": config.DB_POOL_SIZE,
+            "max_overflow": config.DB_MAX_OVERFLOW,
+            "pool_timeout": config.DB_POOL_TIMEOUT,
+            "pool_recycle": config.DB_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+        if config.DB_STATEMENT_TIMEOUT:
+            timeout_ms = int(config.DB_STATEMENT_TIMEOUT * 1000)
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+        return options
+    return {}
+
+
+def sqlite_pragmas(url: URL, config: Settings = settings) -> dict[str, str | int]:
+    """Returns the PRAGMAs set on each new connection to a SQLite database."""
+    if _is_memory(url):
+        return {}
+    return {
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": "NORMAL",
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "busy_timeout": int(config.SQLITE_BUSY_TIMEOUT * 1000),
+    }
+
+
+def create_db_engine(
+    url: str | URL | None = None, config: Settings = settings
+) -> Engine:
+    """Creates the engine of a database, by default `DATABASE_URL`."""
+    url = make_url(url or config.DATABASE_URL)
+    engine = create_engine(url, **engine_options(url, config))
+
+    if url.get_backend_name() == "sqlite":
+        pragmas = sqlite_pragmas(url, config)
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+    return engine
@@ -8,3 +8,19 @@ class ProjectNotFoundException(Exception):
 
 class InvalidHarnessDataException(Exception):
     pass
+
+
+class CatalogUnavailableException(Exception):
+    pass
+
+
+class KiCadBusyException(Exception):
+    pass
+
+
+class KiCadTimeoutException(Exception):
+    pass
+
+
+class ScratchQuotaException(Exception):
+    pass
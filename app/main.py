@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.api import deps
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.services.scratch import scratch_workspace
 
 app = FastAPI(title="Harness Design SaaS")
 
@@ -56,3 +57,11 @@ def debug_db_status(db: Session = Depends(deps.get_db)):
             "details": str(e),
             "database_url_in_use": db_url,
         }
+
+
+@app.get("/debug/scratch-status")
+def debug_scratch_status():
+    """
+    Debug endpoint reporting the use of the scratch workspace of exports.
+    """
+    return {"directory": str(scratch_workspace.root), **scratch_workspace.metrics()}
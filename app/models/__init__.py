@@ -1,8 +1,19 @@
+from .catalog import (
+    CatalogPart,
+    CatalogPartTrigram,
+    CatalogTerminalSeries,
+    CatalogVersion,
+)
 from .harness import Connection, Connector, Harness, Pin, Wire
 from .harness_design import HarnessDesign
 from .project import Project, ProjectSettings
+from .validation import HarnessChange, ValidationSnapshot
 
 __all__ = [
+    "CatalogPart",
+    "CatalogPartTrigram",
+    "CatalogTerminalSeries",
+    "CatalogVersion",
     "HarnessDesign",
     "Project",
     "ProjectSettings",
@@ -11,4 +22,6 @@ __all__ = [
     "Pin",
     "Wire",
     "Connection",
+    "ValidationSnapshot",
+    "HarnessChange",
 ]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class CatalogPart(Base):
+    """A component (connector, wire or terminal) in the parts catalog."""
+
+    __tablename__ = "catalog_parts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    part_number: Mapped[str] = mapped_column(String, unique=True, index=True)
+    # Upper-cased alphanumerics of the part number, for prefix search
+    part_number_key: Mapped[str] = mapped_column(String, index=True)
+
+    # Library attributes
+    component_type: Mapped[str | None] = mapped_column(
+        String, nullable=True, index=True
+    )
+    manufacturer: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # Common specs
+    voltage_rating: Mapped[float | None] = mapped_column(Float, nullable=True)
+    is_rohs: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    is_ul: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+
+    # Connector specs
+    applicable_wire_max_diameter: Mapped[float | None] = mapped_column(
+        Float, nullable=True
+    )
+    pin_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    pin_positions: Mapped[list | None] = mapped_column(
+        JSON(none_as_null=True), nullable=True
+    )
+
+    # Wire specs
+    outer_diameter: Mapped[float | None] = mapped_column(Float, nullable=True)
+    gauge: Mapped[float | None] = mapped_column(Float, nullable=True, index=True)
+
+    # Terminal specs
+    applicable_wire_gauge_min: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    applicable_wire_gauge_max: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
+
+    compatible_series: Mapped[list["CatalogTerminalSeries"]] = relationship(
+        "CatalogTerminalSeries",
+        back_populates="part",
+        cascade="all, delete-orphan",
+    )
+    trigrams: Mapped[list["CatalogPartTrigram"]] = relationship(
+        "CatalogPartTrigram", cascade="all, delete-orphan"
+    )
+
+
+class CatalogTerminalSeries(Base):
+    """A connector series that a terminal part is compatible with."""
+
+    __tablename__ = "catalog_terminal_series"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    part_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("catalog_parts.id", ondelete="CASCADE"), index=True
+    )
+    series: Mapped[str] = mapped_column(String, index=True)
+
+    part: Mapped[CatalogPart] = relationship(
+        "CatalogPart", back_populates="compatible_series"
+    )
+
+
+class CatalogPartTrigram(Base):
+    """
+    A three-character substring of a part's normalized part number or name,
+    indexing the part for fuzzy search.
+    """
+
+    __tablename__ = "catalog_part_trigrams"
+
+    trigram: Mapped[str] = mapped_column(String(3), primary_key=True)
+    part_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("catalog_parts.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class CatalogVersion(Base):
+    """
+    The version of the catalog, a single row bumped by every catalog write.
+    Caches of catalog-derived data are keyed by it.
+    """
+
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
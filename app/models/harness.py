@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import uuid
+from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, Boolean, Float, ForeignKey, String
+from sqlalchemy import JSON, Boolean, Float, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+if TYPE_CHECKING:
+    from app.models.validation import HarnessChange, ValidationSnapshot
+
 
 class Harness(Base):
     __tablename__ = "harnesses"
@@ -17,6 +21,14 @@ class Harness(Base):
     )
     name: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
     three_d_model_path: Mapped[str | None] = mapped_column(String, nullable=True)
+    # SHA-256 of the DXF file the harness was imported from
+    source_hash: Mapped[str | None] = mapped_column(
+        String(64), index=True, nullable=True
+    )
+    # Incremented whenever the connectors, wires or connections change
+    revision: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     connectors: Mapped[list["Connector"]] = relationship(
         "Connector", back_populates="harness", cascade="all, delete-orphan"
@@ -27,6 +39,13 @@ class Harness(Base):
     connections: Mapped[list["Connection"]] = relationship(
         "Connection", back_populates="harness", cascade="all, delete-orphan"
     )
+    # Deleted by the ORM too, as SQLite does not enforce ON DELETE CASCADE
+    validation_snapshot: Mapped["ValidationSnapshot | None"] = relationship(
+        "ValidationSnapshot", uselist=False, cascade="all, delete-orphan"
+    )
+    changes: Mapped[list["HarnessChange"]] = relationship(
+        "HarnessChange", cascade="all, delete-orphan"
+    )
 
 
 class Connector(Base):
@@ -39,7 +58,7 @@ class Connector(Base):
     manufacturer: Mapped[str] = mapped_column(String, nullable=False)
     part_number: Mapped[str] = mapped_column(String, nullable=False)
     harness_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("harnesses.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("harnesses.id"), index=True, nullable=False
     )
 
     # Technical Specifications (from Catalog)
@@ -83,7 +102,7 @@ class Wire(Base):
     gauge: Mapped[float] = mapped_column(Float, nullable=False)
     length: Mapped[float] = mapped_column(Float, nullable=False)
     harness_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("harnesses.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("harnesses.id"), index=True, nullable=False
     )
 
     # Technical Specifications (from Catalog)
@@ -105,7 +124,7 @@ class Connection(Base):
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     harness_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("harnesses.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("harnesses.id"), index=True, nullable=False
     )
     wire_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("wires.id"), nullable=False
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
@@ -19,7 +20,7 @@ class HarnessDesign(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(Integer, ForeignKey("projects.id"))
-    harness_id: Mapped[int] = mapped_column(
+    harness_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("harnesses.id")
     )
     design_data: Mapped[dict[str, Any]] = mapped_column(JSON)
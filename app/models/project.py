@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.config import settings
 from app.db.base import Base
 
 if TYPE_CHECKING:
@@ -41,4 +42,12 @@ class ProjectSettings(Base):
     require_rohs: Mapped[bool] = mapped_column(Boolean, default=False)
     require_ul: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Names of the validation rules turned off for the project
+    disabled_rules: Mapped[list[str]] = mapped_column(
+        JSON,
+        nullable=False,
+        default=lambda: list(settings.VALIDATION_DEFAULT_DISABLED_RULES),
+        server_default="[]",
+    )
+
     project: Mapped["Project"] = relationship("Project", back_populates="settings")
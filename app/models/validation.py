@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ValidationSnapshot(Base):
+    """
+    The last validation result of a harness, in full and per entity, for
+    serving repeat validations and re-validating only the entities that
+    changed since.
+    """
+
+    __tablename__ = "validation_snapshots"
+
+    harness_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("harnesses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Harness revision the snapshot was taken at
+    revision: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Digest of the active rules, project settings and catalog version
+    context_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Entity id -> {"type": ..., "label": ..., "errors": {rule name: [error, ...]}},
+    # for the entities with errors
+    entities: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # The full result, served as is while revision and context_key still match
+    errors: Mapped[list[dict[str, Any]] | None] = mapped_column(JSON, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class HarnessChange(Base):
+    """
+    The entities an edit of a harness changed, recorded per revision, so a
+    validation can re-check just those since its last snapshot.
+    """
+
+    __tablename__ = "harness_changes"
+
+    harness_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("harnesses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Harness revision the edit produced
+    revision: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Entity type -> ids of the entities added, changed or deleted
+    entities: Mapped[dict[str, list[str]]] = mapped_column(JSON, nullable=False)
@@ -1,3 +1,15 @@
+from .catalog import (
+    CatalogIngestReport,
+    CatalogRow,
+    ComponentFacets,
+    ComponentSearchResult,
+    ComponentType,
+    LibraryComponent,
+    LibraryComponentData,
+    LibraryPin,
+    PinPosition,
+    RejectedCatalogRow,
+)
 from .harness import (
     BomItem,
     BomResponse,
@@ -8,8 +20,11 @@ from .harness import (
     Harness,
     HarnessCreate,
     HarnessFull,
+    Net,
     Path3D,
     Point3D,
+    TerminalAssignment,
+    TerminalAssignmentReport,
     Wire,
     WireLength,
 )
@@ -19,10 +34,23 @@ from .harness_design import (
     HarnessDesign,
     HarnessDesignSaveResponse,
 )
+from .importer import BatchImportReport, FileImportResult
 from .project import Project, ProjectCreate, ProjectSettings, ProjectSettingsCreate
-from .validation import ValidationError
+from .validation import HarnessValidationResult, ValidationError, ValidationRule
 
 __all__ = [
+    "CatalogIngestReport",
+    "CatalogRow",
+    "ComponentFacets",
+    "ComponentSearchResult",
+    "ComponentType",
+    "LibraryComponent",
+    "LibraryComponentData",
+    "LibraryPin",
+    "PinPosition",
+    "RejectedCatalogRow",
+    "BatchImportReport",
+    "FileImportResult",
     "DesignData",
     "DesignSave",
     "Project",
@@ -30,9 +58,12 @@ __all__ = [
     "ProjectSettings",
     "ProjectSettingsCreate",
     "HarnessCreate",
+    "HarnessValidationResult",
     "ValidationError",
+    "ValidationRule",
     "Harness",
     "HarnessFull",
+    "Net",
     "HarnessDesignSaveResponse",
     "BomResponse",
     "BomItem",
@@ -40,6 +71,8 @@ __all__ = [
     "CutlistItem",
     "FromToResponse",
     "FromToItem",
+    "TerminalAssignment",
+    "TerminalAssignmentReport",
     "HarnessDesign",
     "Point3D",
     "Path3D",
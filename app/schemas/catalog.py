@@ -0,0 +1,122 @@
+# app/schemas/catalog.py
+import json
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+ComponentType = Literal["connector", "wire", "terminal"]
+
+
+class PinPosition(BaseModel):
+    x: float
+    y: float
+
+
+class CatalogRow(BaseModel):
+    """
+    One part of a supplier catalog feed. CSV feeds give `pin_positions` as a
+    JSON array and `compatible_connector_series` separated by semicolons.
+    """
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    part_number: str = Field(..., min_length=1)
+    component_type: ComponentType | None = None
+    manufacturer: str | None = None
+    name: str | None = None
+    voltage_rating: float | None = Field(None, gt=0)
+    is_rohs: bool | None = None
+    is_ul: bool | None = None
+    applicable_wire_max_diameter: float | None = Field(None, gt=0)
+    pin_count: int | None = Field(None, ge=1)
+    pin_positions: list[PinPosition] | None = None
+    outer_diameter: float | None = Field(None, gt=0)
+    gauge: float | None = Field(None, gt=0)
+    applicable_wire_gauge_min: int | None = Field(None, ge=0)
+    applicable_wire_gauge_max: int | None = Field(None, ge=0)
+    compatible_connector_series: list[str] | None = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def blank_as_none(cls, value: Any) -> Any:
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+    @field_validator("pin_positions", mode="before")
+    @classmethod
+    def parse_pin_positions(cls, value: Any) -> Any:
+        if isinstance(value, str) and value.strip():
+            return json.loads(value)
+        return value
+
+    @field_validator("compatible_connector_series", mode="before")
+    @classmethod
+    def split_series(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [s.strip() for s in value.split(";") if s.strip()] or None
+        return value
+
+    @model_validator(mode="after")
+    def check_consistency(self) -> "CatalogRow":
+        gauge_min = self.applicable_wire_gauge_min
+        gauge_max = self.applicable_wire_gauge_max
+        if gauge_min is not None and gauge_max is not None and gauge_min > gauge_max:
+            raise ValueError("applicable_wire_gauge_min exceeds the maximum")
+        if self.pin_positions is not None and len(self.pin_positions) != (
+            self.pin_count or 0
+        ):
+            raise ValueError("pin_positions must list one position per pin")
+        return self
+
+
+class RejectedCatalogRow(BaseModel):
+    line: int
+    part_number: str | None = None
+    error: str
+
+
+class CatalogIngestReport(BaseModel):
+    rows: int = 0
+    upserted: int = 0
+    rejected: int = 0
+    # The first rejected rows only, so the report stays small for bad feeds
+    errors: list[RejectedCatalogRow] = []
+
+
+# --- Component Library Schemas ---
+
+
+class LibraryPin(BaseModel):
+    id: str
+
+
+class LibraryComponentData(BaseModel):
+    manufacturer: str | None = None
+    part_number: str
+    pins: list[LibraryPin] = []
+    gauge: float | None = None
+
+
+class LibraryComponent(BaseModel):
+    id: str
+    type: str | None = None
+    name: str
+    data: LibraryComponentData
+
+
+class ComponentFacets(BaseModel):
+    """Number of matching parts per value of each filterable attribute."""
+
+    component_type: dict[str, int] = {}
+    manufacturer: dict[str, int] = {}
+    pin_count: dict[str, int] = {}
+    gauge: dict[str, int] = {}
+
+
+class ComponentSearchResult(BaseModel):
+    items: list[LibraryComponent]
+    total: int
+    page: int
+    page_size: int
+    facets: ComponentFacets
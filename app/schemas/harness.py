@@ -1,3 +1,4 @@
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -116,6 +117,26 @@ class FromToResponse(BaseModel):
     items: list[FromToItem]
 
 
+class Net(BaseModel):
+    name: str
+    pins: list[str] = Field(..., description="e.g., ['CONN1-1', 'CONN2-3']")
+    wires: list[str]
+
+
+class TerminalAssignment(BaseModel):
+    connection_id: UUID
+    side: Literal["a", "b"]
+    # None when no catalog terminal fits the connector and wire gauge
+    terminal_part_number: str | None = None
+
+
+class TerminalAssignmentReport(BaseModel):
+    assigned: int = 0
+    kept: int = 0
+    unresolved: int = 0
+    assignments: list[TerminalAssignment] = []
+
+
 # --- 3D Schemas ---
 
 
@@ -0,0 +1,19 @@
+# app/schemas/importer.py
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class FileImportResult(BaseModel):
+    filename: str
+    status: Literal["imported", "duplicate", "failed"]
+    harness_id: UUID | None = None
+    error: str | None = None
+
+
+class BatchImportReport(BaseModel):
+    imported: int
+    duplicates: int
+    failed: int
+    files: list[FileImportResult]
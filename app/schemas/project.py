@@ -1,5 +1,7 @@
 # app/schemas/project.py
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.config import settings
 
 
 class ProjectBase(BaseModel):
@@ -20,6 +22,9 @@ class ProjectSettingsBase(BaseModel):
     system_voltage: float | None = None
     require_rohs: bool = False
     require_ul: bool = False
+    disabled_rules: list[str] = Field(
+        default_factory=lambda: list(settings.VALIDATION_DEFAULT_DISABLED_RULES)
+    )
 
 
 class ProjectSettingsCreate(ProjectSettingsBase):
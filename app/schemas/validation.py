@@ -1,4 +1,7 @@
 # app/schemas/validation.py
+from typing import Literal
+from uuid import UUID
+
 from pydantic import BaseModel
 
 
@@ -7,3 +10,27 @@ class ValidationError(BaseModel):
     component_type: str
     message: str
     error_type: str
+    # Warnings are reported but do not block exports
+    severity: Literal["error", "warning"] = "error"
+
+
+class ValidationRule(BaseModel):
+    name: str
+    entity_types: list[str]
+    description: str
+    # Cumulative counters since the service started
+    runs: int = 0
+    calls: int = 0
+    reused: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+class HarnessValidationResult(BaseModel):
+    """One line of a project validation stream."""
+
+    harness_id: UUID
+    name: str | None = None
+    errors: list[ValidationError] = []
+    # Set when the harness could not be validated at all
+    failure: str | None = None
@@ -0,0 +1,281 @@
+# app/services/batch_importer.py
+
+"""
+Batch DXF Import Service
+
+Imports many DXF drawings, from a ZIP archive or a directory, into one project.
+Parsing is CPU-bound and independent per file, so it runs in a pool of worker
+processes. The parsed drawings are written by the calling process in batches,
+one transaction per batch, and every file gets its own success/failure entry in
+the returned report.
+
+Files are identified by the SHA-256 of their content. Workers hash a file before
+parsing it and skip the parse when the project already holds a harness imported
+from the same content; such files are reported as duplicates of that harness.
+"""
+
+import io
+import multiprocessing
+import os
+import uuid
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.config import settings
+from app.exceptions import ProjectNotFoundException
+from app.services.importer import (
+    ImporterService,
+    ParsedDrawing,
+    hash_stream,
+    importer_service,
+)
+
+
+@dataclass(frozen=True)
+class ImportJob:
+    """A single DXF file to import, either on disk or inside a ZIP archive."""
+
+    filename: str
+    source: str  # Path to the DXF file or to the ZIP archive containing it
+    member: str | None = None  # Name of the DXF file inside the archive
+
+
+def collect_jobs(source: Path) -> list[ImportJob]:
+    """Lists the DXF files in a directory (recursively) or a ZIP archive."""
+    if source.is_dir():
+        return [
+            ImportJob(filename=str(path.relative_to(source)), source=str(path))
+            for path in sorted(source.rglob("*"))
+            if path.is_file() and path.suffix.lower() == ".dxf"
+        ]
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            return [
+                ImportJob(
+                    filename=info.filename, source=str(source), member=info.filename
+                )
+                for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(".dxf")
+            ]
+    raise ValueError(f"{source} is neither a directory nor a ZIP archive.")
+
+
+@dataclass(frozen=True)
+class _ParseOutcome:
+    job: ImportJob
+    source_hash: str | None = None
+    parsed: ParsedDrawing | None = None
+    error: str | None = None
+
+
+class _ParseContext:
+    """
+    What the parses of one import share: the content hashes already imported
+    into the target project, and the archives opened so far. Archives stay
+    open so their central directory is read once instead of once per member.
+    """
+
+    def __init__(self, known_hashes: frozenset[str]):
+        self.known_hashes = known_hashes
+        self._archives: dict[str, zipfile.ZipFile] = {}
+
+    def open_archive(self, path: str) -> zipfile.ZipFile:
+        if path not in self._archives:
+            self._archives[path] = zipfile.ZipFile(path)
+        return self._archives[path]
+
+    def close(self) -> None:
+        while self._archives:
+            self._archives.popitem()[1].close()
+
+
+# The context of a worker process, set by its initializer; in-process parses
+# get a context of their own
+_worker_context: _ParseContext | None = None
+
+
+def _init_worker(known_hashes: frozenset[str]) -> None:
+    global _worker_context
+    _worker_context = _ParseContext(known_hashes)
+
+
+def _parse_in_worker(job: ImportJob) -> _ParseOutcome:
+    assert _worker_context is not None
+    return _parse_job(job, _worker_context)
+
+
+def _parse_job(job: ImportJob, context: _ParseContext) -> _ParseOutcome:
+    """Hashes and parses one DXF file. Never raises, as it may run in a worker."""
+    source_hash = None
+    try:
+        if job.member is None:
+            dxf_file: IO[bytes] = open(job.source, "rb")
+        else:
+            dxf_file = io.BytesIO(context.open_archive(job.source).read(job.member))
+        with dxf_file:
+            source_hash = hash_stream(dxf_file)
+            if source_hash in context.known_hashes:
+                return _ParseOutcome(job, source_hash)
+            parsed = importer_service.parse_dxf(dxf_file)
+    except Exception as e:
+        return _ParseOutcome(job, source_hash, error=str(e) or type(e).__name__)
+    parsed.name = Path(job.filename).stem
+    parsed.source_hash = source_hash
+    return _ParseOutcome(job, source_hash, parsed)
+
+
+class BatchImportService:
+    def __init__(
+        self,
+        importer: ImporterService,
+        max_workers: int | None = None,
+        batch_size: int = 50,
+    ):
+        self.importer = importer
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
+    def import_path(
+        self, db: Session, source: Path, project_id: int
+    ) -> schemas.BatchImportReport:
+        """
+        Imports every DXF file found in `source` into the given project.
+        """
+        if db.get(models.Project, project_id) is None:
+            raise ProjectNotFoundException()
+
+        known = self.importer.find_imported(db, project_id)
+        results: list[schemas.FileImportResult] = []
+        pending: list[tuple[ImportJob, ParsedDrawing]] = []
+        # Files whose content repeats another file of the same archive
+        repeated: list[tuple[ImportJob, str]] = []
+        pending_hashes: set[str] = set()
+
+        for outcome in self._parse_all(collect_jobs(source), frozenset(known)):
+            job, source_hash = outcome.job, outcome.source_hash
+            if outcome.error is not None or source_hash is None:
+                results.append(
+                    schemas.FileImportResult(
+                        filename=job.filename, status="failed", error=outcome.error
+                    )
+                )
+            elif source_hash in known:
+                results.append(
+                    schemas.FileImportResult(
+                        filename=job.filename,
+                        status="duplicate",
+                        harness_id=known[source_hash],
+                    )
+                )
+            elif source_hash in pending_hashes or outcome.parsed is None:
+                repeated.append((job, source_hash))
+            else:
+                pending.append((job, outcome.parsed))
+                pending_hashes.add(source_hash)
+                if len(pending) >= self.batch_size:
+                    results.extend(self._insert_batch(db, pending, project_id, known))
+                    pending = []
+        if pending:
+            results.extend(self._insert_batch(db, pending, project_id, known))
+
+        for job, source_hash in repeated:
+            if source_hash in known:
+                results.append(
+                    schemas.FileImportResult(
+                        filename=job.filename,
+                        status="duplicate",
+                        harness_id=known[source_hash],
+                    )
+                )
+            else:
+                results.append(
+                    schemas.FileImportResult(
+                        filename=job.filename,
+                        status="failed",
+                        error="Duplicate of a file that failed to import.",
+                    )
+                )
+
+        return schemas.BatchImportReport(
+            imported=sum(1 for r in results if r.status == "imported"),
+            duplicates=sum(1 for r in results if r.status == "duplicate"),
+            failed=sum(1 for r in results if r.status == "failed"),
+            files=results,
+        )
+
+    def _parse_all(
+        self, jobs: list[ImportJob], known_hashes: frozenset[str]
+    ) -> Iterator[_ParseOutcome]:
+        """Parses the jobs in worker processes, yielding results in job order."""
+        if self.max_workers == 1 or len(jobs) <= 1:
+            # Not shared with concurrent imports running in this process
+            context = _ParseContext(known_hashes)
+            try:
+                for job in jobs:
+                    yield _parse_job(job, context)
+            finally:
+                context.close()
+            return
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(jobs))
+        # "spawn" avoids forking a multi-threaded server process
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(known_hashes,),
+        ) as pool:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            yield from pool.map(_parse_in_worker, jobs, chunksize=chunksize)
+
+    def _insert_batch(
+        self,
+        db: Session,
+        pending: list[tuple[ImportJob, ParsedDrawing]],
+        project_id: int,
+        known: dict[str, uuid.UUID],
+    ) -> list[schemas.FileImportResult]:
+        try:
+            harness_ids = self.importer.import_parsed(
+                db, [parsed for _, parsed in pending], project_id
+            )
+        except SQLAlchemyError as e:
+            db.rollback()
+            if len(pending) == 1:
+                return [
+                    schemas.FileImportResult(
+                        filename=pending[0][0].filename, status="failed", error=str(e)
+                    )
+                ]
+            # Retry one file at a time so only the offending files are reported
+            return [
+                result
+                for item in pending
+                for result in self._insert_batch(db, [item], project_id, known)
+            ]
+
+        for (_, parsed), harness_id in zip(pending, harness_ids):
+            if parsed.source_hash is not None:
+                known[parsed.source_hash] = harness_id
+
+        return [
+            schemas.FileImportResult(
+                filename=job.filename, status="imported", harness_id=harness_id
+            )
+            for (job, _), harness_id in zip(pending, harness_ids)
+        ]
+
+
+batch_import_service = BatchImportService(
+    importer=importer_service,
+    max_workers=settings.IMPORT_MAX_WORKERS,
+    batch_size=settings.IMPORT_BATCH_SIZE,
+)
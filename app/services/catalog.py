@@ -1,21 +1,51 @@
 # app/services/catalog.py
 
 """
-Mock Catalog Service
+Catalog Service
 
-This service simulates an external catalog API (like MISUMI) to fetch technical
-specifications for components based on their part number.
+Looks up the technical specifications of components by part number. The catalog
+is stored in the `catalog_parts` table, indexed by part number, with the
+connector series compatible with each terminal in `catalog_terminal_series`.
+Lookups for a whole set of part numbers resolve in a single query. Part numbers
+missing from the tables can be resolved by an external catalog API (see
+`catalog_client`).
+
+Specs read from the tables can also be served from an in-process cache, which
+is dropped whenever the catalog version changes, so that creating or updating
+harnesses does not query the same parts over and over.
 """
 
-from typing import Dict, List, TypedDict
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+from typing import Any, Dict, List, TypedDict, cast
+
+from sqlalchemy import RowMapping, delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.exceptions import CatalogUnavailableException
+from app.services.catalog_client import CatalogClient, build_catalog_client
+
+logger = logging.getLogger(__name__)
 
 
 class PinData(TypedDict):
     pin_count: int
-    pin_positions: list[dict[str, float]]  # e.g., [{"x": 0, "y": 0}, ...]
+    # Pin locations relative to the block base point, e.g. [{"x": 0, "y": 0}, ...]
+    pin_positions: list[dict[str, float]]
 
 
 class ComponentSpec(TypedDict, total=False):
+    # Library attributes
+    component_type: str | None  # "connector", "wire" or "terminal"
+    manufacturer: str | None
+    name: str | None
+
     # Common specs
     voltage_rating: float | None
     is_rohs: bool | None
@@ -27,6 +57,7 @@ class ComponentSpec(TypedDict, total=False):
 
     # Wire specs
     outer_diameter: float | None
+    gauge: float | None
 
     # Terminal specs
     applicable_wire_gauge_min: int | None
@@ -34,82 +65,278 @@ class ComponentSpec(TypedDict, total=False):
     compatible_connector_series: List[str] | None
 
 
-# Mock database for component specifications.
-# In a real-world scenario, this would be fetched from an external API or a
-# dedicated database.
-MOCK_CATALOG_DB: Dict[str, ComponentSpec] = {
-    # Connectors
-    "DF13-3S-1.25C": {
-        "voltage_rating": 150.0,  # Volts
-        "applicable_wire_max_diameter": 0.9,  # mm
-        "is_rohs": True,
-        "is_ul": True,
-        "pins": {"pin_count": 3, "pin_positions": []},
-    },
-    "PHR-3": {
-        "voltage_rating": 100.0,
-        "applicable_wire_max_diameter": 1.5,
-        "is_rohs": True,
-        "is_ul": True,
-        "pins": {"pin_count": 3, "pin_positions": []},
-    },
-    # Connector that is not RoHS compliant
-    "OLD-CONN-01": {
-        "voltage_rating": 50.0,
-        "applicable_wire_max_diameter": 2.0,
-        "is_rohs": False,
-        "is_ul": True,
-        "pins": {"pin_count": 4, "pin_positions": []},
-    },
-    # Wires
-    "UL1007-26-RD": {
-        "voltage_rating": 300.0,
-        "outer_diameter": 1.2,  # mm
-        "is_rohs": True,
-        "is_ul": True,
-    },
-    "UL1007-22-BK": {
-        "voltage_rating": 300.0,
-        "outer_diameter": 1.6,
-        "is_rohs": True,
-        "is_ul": True,
-    },
-    # Wire with a large diameter
-    "THICK-WIRE-01": {
-        "voltage_rating": 600.0,
-        "outer_diameter": 3.0,
-        "is_rohs": True,
-        "is_ul": True,
-    },
-    # Terminals
-    "DF13-2630SCF": {
-        "applicable_wire_gauge_min": 26,
-        "applicable_wire_gauge_max": 30,
-        "compatible_connector_series": ["DF13"],
-        "is_rohs": True,
-    },
-    "SPH-002T-P0.5S": {
-        "applicable_wire_gauge_min": 24,
-        "applicable_wire_gauge_max": 28,
-        "compatible_connector_series": ["PHR"],
-        "is_rohs": True,
-    },
-    "171662-0153": {
-        "applicable_wire_gauge_min": 22,
-        "applicable_wire_gauge_max": 26,
-        "compatible_connector_series": ["Molex-KK"],
-        "is_rohs": True,
-    },
-}
+# Spec fields stored as plain columns of `catalog_parts`
+SCALAR_SPEC_FIELDS = (
+    "component_type",
+    "manufacturer",
+    "name",
+    "voltage_rating",
+    "is_rohs",
+    "is_ul",
+    "applicable_wire_max_diameter",
+    "outer_diameter",
+    "gauge",
+    "applicable_wire_gauge_min",
+    "applicable_wire_gauge_max",
+)
+
+# Spec fields copied onto the connectors and wires of a harness
+CONNECTOR_SPEC_FIELDS = (
+    "voltage_rating",
+    "applicable_wire_max_diameter",
+    "is_rohs",
+    "is_ul",
+)
+WIRE_SPEC_FIELDS = ("voltage_rating", "outer_diameter", "is_rohs", "is_ul")
+
+# Keeps IN (...) lists well below the bound-parameter limits of every backend
+_LOOKUP_CHUNK_SIZE = 900
+# Primary key of the single row of `catalog_version`
+_VERSION_ROW = 1
+
+
+def _chunks(items: list[str], size: int) -> Iterable[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def normalize_part_number(text: str) -> str:
+    """
+    Reduces a part number (or search text) to its upper-cased alphanumerics,
+    so that "df13-3s", "DF13 3S" and "DF133S" compare equal.
+    """
+    return "".join(ch for ch in text.upper() if ch.isalnum())
+
+
+def trigrams(text: str) -> set[str]:
+    """Returns the three-character substrings of normalized text."""
+    key = normalize_part_number(text)
+    if len(key) < 3:
+        return {key} if key else set()
+    return {key[i : i + 3] for i in range(len(key) - 2)}
+
+
+def spec_attributes(
+    spec: ComponentSpec | None, fields: Iterable[str]
+) -> dict[str, Any]:
+    """
+    Returns the given spec fields as component attributes, None for fields
+    the spec (if any) does not define.
+    """
+    values = cast(Mapping[str, Any], spec or {})
+    return {field: values.get(field) for field in fields}
+
+
+def _part_row(part_number: str, spec: ComponentSpec, now: datetime) -> dict[str, Any]:
+    """Flattens a ComponentSpec into a `catalog_parts` row."""
+    row: dict[str, Any] = {field: spec.get(field) for field in SCALAR_SPEC_FIELDS}
+    pins = spec.get("pins")
+    row.update(
+        part_number=part_number,
+        part_number_key=normalize_part_number(part_number),
+        pin_count=pins["pin_count"] if pins else None,
+        pin_positions=pins["pin_positions"] if pins else None,
+        updated_at=now,
+    )
+    return row
 
 
 class CatalogService:
-    def get_specification(self, part_number: str) -> ComponentSpec | None:
+    def __init__(self, external: CatalogClient | None = None, cache_size: int = 0):
+        self.external = external
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, ComponentSpec] = OrderedDict()
+        self._cache_version: str | None = None
+        self._cache_lock = threading.Lock()
+
+    def get_specification(self, db: Session, part_number: str) -> ComponentSpec | None:
         """
         Retrieves the technical specifications for a given part number.
         Returns None if the part number is not found in the catalog.
         """
-        return MOCK_CATALOG_DB.get(part_number)
+        return self.get_specifications(db, [part_number]).get(part_number)
+
+    def get_specifications(
+        self, db: Session, part_numbers: Iterable[str]
+    ) -> Dict[str, ComponentSpec]:
+        """
+        Retrieves the technical specifications for a set of part numbers in a
+        single query. Part numbers that are not in the catalog tables are
+        looked up in the external catalog, if any, in one batch. Part numbers
+        that are not found are omitted from the returned mapping.
+        """
+        requested = sorted(set(part_numbers))
+        found = self._read_specifications(db, requested)
+        found.update(self._fetch_external([pn for pn in requested if pn not in found]))
+        return found
+
+    def get_cached_specifications(
+        self, db: Session, part_numbers: Iterable[str]
+    ) -> Dict[str, ComponentSpec]:
+        """
+        Same as `get_specifications`, but parts found in the catalog tables are
+        cached until the catalog version changes, so repeated lookups cost a
+        single version query. Parts the tables lack are never cached here;
+        the external catalog client caches those on its own terms.
+        """
+        requested = set(part_numbers)
+        if not requested:
+            return {}
+        version = self.get_version(db)
+        found: Dict[str, ComponentSpec] = {}
+        with self._cache_lock:
+            if self._cache_version != version:
+                self._cache.clear()
+                self._cache_version = version
+            for part_number in requested:
+                spec = self._cache.get(part_number)
+                if spec is not None:
+                    self._cache.move_to_end(part_number)
+                    found[part_number] = spec
+
+        missing = sorted(requested - found.keys())
+        stored = self._read_specifications(db, missing)
+        with self._cache_lock:
+            if self._cache_version == version:
+                self._cache.update(stored)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        found.update(stored)
+        found.update(self._fetch_external([pn for pn in missing if pn not in stored]))
+        return found
+
+    def _read_specifications(
+        self, db: Session, requested: list[str]
+    ) -> Dict[str, ComponentSpec]:
+        """Reads the specs of the given part numbers from the catalog tables."""
+        part = models.CatalogPart
+        series = models.CatalogTerminalSeries
+        columns = [getattr(part, field) for field in SCALAR_SPEC_FIELDS]
+
+        specs: Dict[str, Dict[str, Any]] = {}
+        for chunk in _chunks(requested, _LOOKUP_CHUNK_SIZE):
+            query = (
+                select(
+                    part.part_number,
+                    part.pin_count,
+                    part.pin_positions,
+                    series.series,
+                    *columns,
+                )
+                .outerjoin(series, series.part_id == part.id)
+                .where(part.part_number.in_(chunk))
+                .order_by(part.part_number, series.id)
+            )
+            for row in db.execute(query).mappings():
+                spec = specs.get(row["part_number"])
+                if spec is None:
+                    spec = specs[row["part_number"]] = self._spec_from_row(row)
+                if row["series"] is not None:
+                    spec.setdefault("compatible_connector_series", []).append(
+                        row["series"]
+                    )
+        return {pn: cast(ComponentSpec, spec) for pn, spec in specs.items()}
+
+    def _fetch_external(self, missing: list[str]) -> Dict[str, ComponentSpec]:
+        if self.external is None or not missing:
+            return {}
+        try:
+            return dict(self.external.fetch_specifications(missing))
+        except CatalogUnavailableException as e:
+            # Missing parts are reported by validation as missing specs
+            logger.warning("External catalog lookup failed: %s", e)
+            return {}
+
+    def upsert_specifications(
+        self, db: Session, specs: Mapping[str, ComponentSpec]
+    ) -> None:
+        """
+        Inserts or replaces the specifications of the given part numbers in one
+        transaction.
+        """
+        if not specs:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [_part_row(pn, spec, now) for pn, spec in specs.items()]
+        part = models.CatalogPart
+
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            stmt = dialect_insert(part)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[part.part_number],
+                set_={
+                    key: stmt.excluded[key] for key in rows[0] if key != "part_number"
+                },
+            )
+            db.execute(stmt, rows)
+        else:
+            for chunk in _chunks(list(specs), _LOOKUP_CHUNK_SIZE):
+                db.execute(delete(part).where(part.part_number.in_(chunk)))
+            db.execute(insert(part), rows)
+
+        # Replace the compatible connector series and search trigrams
+        part_ids: dict[str, int] = {}
+        for chunk in _chunks(list(specs), _LOOKUP_CHUNK_SIZE):
+            query = select(part.part_number, part.id).where(part.part_number.in_(chunk))
+            part_ids.update((pn, part_id) for pn, part_id in db.execute(query))
+            chunk_ids = [part_ids[pn] for pn in chunk]
+            for child in (models.CatalogTerminalSeries, models.CatalogPartTrigram):
+                db.execute(delete(child).where(child.part_id.in_(chunk_ids)))
+        series_rows = [
+            {"part_id": part_ids[pn], "series": series}
+            for pn, spec in specs.items()
+            for series in spec.get("compatible_connector_series") or []
+        ]
+        if series_rows:
+            db.execute(insert(models.CatalogTerminalSeries), series_rows)
+        trigram_rows = [
+            {"part_id": part_ids[pn], "trigram": trigram}
+            for pn, spec in specs.items()
+            for trigram in trigrams(pn) | trigrams(spec.get("name") or "")
+        ]
+        if trigram_rows:
+            db.execute(insert(models.CatalogPartTrigram), trigram_rows)
+        self._bump_version(db)
+        db.commit()
+
+    def get_version(self, db: Session) -> str:
+        """
+        Returns a token that changes whenever parts are added, updated or
+        removed, for keying caches of catalog-derived data. It is read from
+        a single row, so checking it costs one primary key lookup.
+        """
+        version = db.scalar(
+            select(models.CatalogVersion.version).where(
+                models.CatalogVersion.id == _VERSION_ROW
+            )
+        )
+        return str(version or 0)
+
+    @staticmethod
+    def _bump_version(db: Session) -> None:
+        """Bumps the catalog version in the transaction of a catalog write."""
+        row = models.CatalogVersion
+        bumped = db.execute(
+            update(row).where(row.id == _VERSION_ROW).values(version=row.version + 1)
+        )
+        if not bumped.rowcount:  # type: ignore[attr-defined]
+            db.execute(insert(row).values(id=_VERSION_ROW, version=1))
+
+    @staticmethod
+    def _spec_from_row(row: RowMapping) -> Dict[str, Any]:
+        spec: Dict[str, Any] = {
+            field: row[field] for field in SCALAR_SPEC_FIELDS if row[field] is not None
+        }
+        if row["pin_count"] is not None:
+            spec["pins"] = {
+                "pin_count": row["pin_count"],
+                "pin_positions": row["pin_positions"] or [],
+            }
+        return spec
 
 
-catalog_service = CatalogService()
+catalog_service = CatalogService(
+    external=build_catalog_client(), cache_size=settings.CATALOG_SPEC_CACHE_SIZE
+)
@@ -0,0 +1,200 @@
+# app/services/catalog_client.py
+
+"""
+External Catalog Client
+
+Resolves part numbers that are missing from the local catalog tables against a
+supplier catalog API (e.g. MISUMI). Clients are pluggable: anything with a
+`fetch_specifications` method can back the catalog service.
+
+- `HttpCatalogClient` keeps a pool of keep-alive connections and requests part
+  numbers in batches, one POST per `batch_size` part numbers.
+- `CachedCatalogClient` puts a bounded TTL/LRU cache in front of any client.
+  Part numbers the API does not know are cached as misses for a shorter time,
+  so repeated lookups of unknown parts do not reach the API either. Concurrent
+  lookups of the same part number are coalesced: the first caller fetches it
+  and the others wait for that result instead of sending their own request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Protocol
+
+import httpx
+
+from app.core.config import settings
+from app.exceptions import CatalogUnavailableException
+
+if TYPE_CHECKING:
+    from app.services.catalog import ComponentSpec
+
+
+class CatalogClient(Protocol):
+    def fetch_specifications(
+        self, part_numbers: Sequence[str]
+    ) -> dict[str, "ComponentSpec"]:
+        """
+        Returns the specifications of the given part numbers. Part numbers
+        unknown to the catalog are omitted from the returned mapping.
+        """
+        ...
+
+
+class HttpCatalogClient:
+    """
+    Client for a catalog API answering `POST {base_url}/specifications` with
+    `{"part_numbers": [...]}` by `{"specifications": {part_number: spec}}`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        batch_size: int = 100,
+        max_connections: int = 10,
+        transport: httpx.BaseTransport | None = None,
+    ):
+        self.batch_size = batch_size
+        self._client = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    def fetch_specifications(
+        self, part_numbers: Sequence[str]
+    ) -> dict[str, "ComponentSpec"]:
+        specs: dict[str, "ComponentSpec"] = {}
+        for start in range(0, len(part_numbers), self.batch_size):
+            chunk = list(part_numbers[start : start + self.batch_size])
+            try:
+                response = self._client.post(
+                    "/specifications", json={"part_numbers": chunk}
+                )
+                response.raise_for_status()
+                payload = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                raise CatalogUnavailableException(str(e)) from e
+            if not isinstance(payload, dict):
+                raise CatalogUnavailableException(
+                    "Catalog API returned a malformed response."
+                )
+            found = payload.get("specifications") or {}
+            if not isinstance(found, dict) or not all(
+                isinstance(spec, dict) for spec in found.values()
+            ):
+                raise CatalogUnavailableException(
+                    "Catalog API returned a malformed specifications payload."
+                )
+            specs.update(found)
+        return specs
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class CachedCatalogClient:
+    def __init__(
+        self,
+        client: CatalogClient,
+        ttl: float = 3600.0,
+        negative_ttl: float = 300.0,
+        max_size: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._clock = clock
+        # part_number -> (expires_at, spec), None marking a cached miss
+        self._entries: OrderedDict[str, tuple[float, "ComponentSpec | None"]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[str, Future["ComponentSpec | None"]] = {}
+        self._lock = threading.Lock()
+
+    def fetch_specifications(
+        self, part_numbers: Sequence[str]
+    ) -> dict[str, "ComponentSpec"]:
+        found: dict[str, "ComponentSpec"] = {}
+        to_fetch: list[str] = []
+        waiting: dict[str, Future["ComponentSpec | None"]] = {}
+
+        with self._lock:
+            now = self._clock()
+            for part_number in dict.fromkeys(part_numbers):
+                entry = self._entries.get(part_number)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(part_number)
+                    if entry[1] is not None:
+                        found[part_number] = entry[1]
+                    continue
+                future = self._in_flight.get(part_number)
+                if future is None:
+                    # This caller fetches the part; later callers wait for it
+                    future = self._in_flight[part_number] = Future()
+                    to_fetch.append(part_number)
+                waiting[part_number] = future
+
+        if to_fetch:
+            self._fetch(to_fetch)
+
+        for part_number, future in waiting.items():
+            spec = future.result()
+            if spec is not None:
+                found[part_number] = spec
+        return found
+
+    def invalidate(self, part_numbers: Sequence[str] | None = None) -> None:
+        """Drops the given part numbers, or every entry, from the cache."""
+        with self._lock:
+            if part_numbers is None:
+                self._entries.clear()
+            else:
+                for part_number in part_numbers:
+                    self._entries.pop(part_number, None)
+
+    def _fetch(self, part_numbers: list[str]) -> None:
+        try:
+            specs = self.client.fetch_specifications(part_numbers)
+        except BaseException as e:
+            # Failures are not cached; waiting callers see the same error
+            with self._lock:
+                for part_number in part_numbers:
+                    self._in_flight.pop(part_number).set_exception(e)
+            raise
+
+        with self._lock:
+            now = self._clock()
+            for part_number in part_numbers:
+                spec = specs.get(part_number)
+                ttl = self.ttl if spec is not None else self.negative_ttl
+                self._entries[part_number] = (now + ttl, spec)
+                self._entries.move_to_end(part_number)
+                self._in_flight.pop(part_number).set_result(spec)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+def build_catalog_client() -> CatalogClient | None:
+    """Creates the cached external catalog client, if an API is configured."""
+    if not settings.CATALOG_API_URL:
+        return None
+    return CachedCatalogClient(
+        HttpCatalogClient(
+            settings.CATALOG_API_URL,
+            timeout=settings.CATALOG_API_TIMEOUT,
+            batch_size=settings.CATALOG_API_BATCH_SIZE,
+        ),
+        ttl=settings.CATALOG_CACHE_TTL,
+        negative_ttl=settings.CATALOG_CACHE_NEGATIVE_TTL,
+        max_size=settings.CATALOG_CACHE_MAX_SIZE,
+    )
@@ -0,0 +1,178 @@
+# app/services/catalog_ingest.py
+
+"""
+Catalog Ingest Service
+
+Loads supplier catalog feeds (CSV or JSON Lines) into the catalog tables. The
+feed is read as a stream and upserted in batches, one short transaction per
+batch, so memory stays bounded by the batch size whatever the size of the feed
+and readers of the catalog are never held up by one long write. Rows failing
+validation are skipped and reported with their line number.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterator
+from pathlib import PurePath
+from typing import IO, Any, Literal, cast
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.core.config import settings
+from app.services.catalog import CatalogService, ComponentSpec, catalog_service
+
+FeedFormat = Literal["csv", "jsonl"]
+
+FEED_FORMATS: dict[str, FeedFormat] = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def detect_format(filename: str) -> FeedFormat:
+    """Returns the feed format implied by a file name."""
+    suffix = PurePath(filename).suffix.lower()
+    if suffix not in FEED_FORMATS:
+        raise ValueError(
+            f"Unsupported catalog feed '{filename}'. "
+            f"Expected one of: {', '.join(FEED_FORMATS)}."
+        )
+    return FEED_FORMATS[suffix]
+
+
+def _read_records(
+    text: IO[str], feed_format: FeedFormat
+) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    """Yields (line number, record or parse error) for each data row."""
+    if feed_format == "csv":
+        reader = csv.DictReader(text)
+        try:
+            for record in reader:
+                if None in record:
+                    yield reader.line_num, "Row has more fields than the header."
+                else:
+                    yield reader.line_num, cast(dict[str, Any], record)
+        except csv.Error as e:
+            raise ValueError(f"line {reader.line_num}: {e}") from e
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e.msg}"
+            continue
+        if isinstance(record, dict):
+            yield line_number, record
+        else:
+            yield line_number, "Expected a JSON object."
+
+
+def _format_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+def _to_spec(row: schemas.CatalogRow) -> ComponentSpec:
+    spec = cast(
+        ComponentSpec,
+        row.model_dump(
+            exclude={"part_number", "pin_count", "pin_positions"}, exclude_none=True
+        ),
+    )
+    if row.pin_count is not None:
+        spec["pins"] = {
+            "pin_count": row.pin_count,
+            "pin_positions": [p.model_dump() for p in row.pin_positions or []],
+        }
+    return spec
+
+
+class CatalogIngestService:
+    def __init__(
+        self,
+        catalog: CatalogService,
+        batch_size: int = 1000,
+        max_reported_errors: int = 100,
+    ):
+        self.catalog = catalog
+        self.batch_size = batch_size
+        self.max_reported_errors = max_reported_errors
+
+    def ingest(
+        self,
+        db: Session,
+        feed: IO[bytes],
+        feed_format: FeedFormat,
+        progress: Callable[[schemas.CatalogIngestReport], None] | None = None,
+    ) -> schemas.CatalogIngestReport:
+        """
+        Validates and upserts every row of a catalog feed. `progress` is called
+        with the running report after each committed batch.
+        """
+        report = schemas.CatalogIngestReport()
+        # Keyed by part number, so a part repeated in a batch is written once
+        batch: dict[str, ComponentSpec] = {}
+
+        def flush() -> None:
+            self.catalog.upsert_specifications(db, batch)
+            report.upserted += len(batch)
+            batch.clear()
+            if progress is not None:
+                progress(report)
+
+        text = io.TextIOWrapper(feed, encoding="utf-8-sig", newline="")
+        try:
+            for line, record in _read_records(text, feed_format):
+                report.rows += 1
+                if isinstance(record, str):
+                    self._reject(report, line, None, record)
+                    continue
+                try:
+                    row = schemas.CatalogRow.model_validate(record)
+                except ValidationError as e:
+                    part_number = record.get("part_number")
+                    self._reject(
+                        report,
+                        line,
+                        str(part_number) if part_number else None,
+                        _format_error(e),
+                    )
+                    continue
+                batch[row.part_number] = _to_spec(row)
+                if len(batch) >= self.batch_size:
+                    flush()
+            if batch:
+                flush()
+        finally:
+            # Leave the caller's stream open
+            text.detach()
+        return report
+
+    def _reject(
+        self,
+        report: schemas.CatalogIngestReport,
+        line: int,
+        part_number: str | None,
+        error: str,
+    ) -> None:
+        report.rejected += 1
+        if len(report.errors) < self.max_reported_errors:
+            report.errors.append(
+                schemas.RejectedCatalogRow(
+                    line=line, part_number=part_number, error=error
+                )
+            )
+
+
+catalog_ingest_service = CatalogIngestService(
+    catalog=catalog_service, batch_size=settings.CATALOG_INGEST_BATCH_SIZE
+)
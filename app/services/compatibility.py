@@ -0,0 +1,196 @@
+# app/services/compatibility.py
+
+"""
+Terminal Compatibility Index
+
+Precomputes, from the catalog, which terminals fit which connector series and
+wire gauges, so that validation and terminal suggestions are dictionary
+lookups instead of scans of each terminal's compatible series.
+
+The index is an immutable snapshot tagged with the catalog version it was
+built from. `CompatibilityService` rebuilds it when the catalog changes.
+"""
+
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.catalog import CatalogService, ComponentSpec, catalog_service
+
+
+@dataclass(frozen=True)
+class TerminalInfo:
+    part_number: str
+    gauge_min: int | None
+    gauge_max: int | None
+    # Connector series the terminal fits; empty when the catalog lists none
+    series: frozenset[str]
+
+    @classmethod
+    def from_spec(cls, part_number: str, spec: ComponentSpec) -> "TerminalInfo":
+        return cls(
+            part_number=part_number,
+            gauge_min=spec.get("applicable_wire_gauge_min"),
+            gauge_max=spec.get("applicable_wire_gauge_max"),
+            series=frozenset(spec.get("compatible_connector_series") or ()),
+        )
+
+    def accepts_gauge(self, gauge: float) -> bool:
+        return (
+            self.gauge_min is not None
+            and self.gauge_max is not None
+            and self.gauge_min <= gauge <= self.gauge_max
+        )
+
+    def fits_series(self, series: str) -> bool:
+        return not self.series or series in self.series
+
+
+def _fit_order(terminal: TerminalInfo) -> tuple[float, str]:
+    if terminal.gauge_min is None or terminal.gauge_max is None:
+        return float("inf"), terminal.part_number
+    return terminal.gauge_max - terminal.gauge_min, terminal.part_number
+
+
+class CompatibilityIndex:
+    def __init__(self, version: str, terminals: Iterable[TerminalInfo]):
+        self.version = version
+        self._terminals = {t.part_number: t for t in terminals}
+
+        by_series: dict[str, list[str]] = defaultdict(list)
+        by_series_gauge: dict[tuple[str, int], list[str]] = defaultdict(list)
+        # Terminals with the narrowest gauge range come first in each bucket,
+        # so the head of a bucket is the tightest fit
+        for terminal in sorted(self._terminals.values(), key=_fit_order):
+            for series in terminal.series:
+                by_series[series].append(terminal.part_number)
+                if terminal.gauge_min is None or terminal.gauge_max is None:
+                    continue
+                for gauge in range(terminal.gauge_min, terminal.gauge_max + 1):
+                    by_series_gauge[series, gauge].append(terminal.part_number)
+        self._by_series = {k: tuple(v) for k, v in by_series.items()}
+        self._by_series_gauge = {k: tuple(v) for k, v in by_series_gauge.items()}
+
+        # Longest series first, so "DF13B" wins over "DF13" should both be
+        # catalog series
+        self._series_names = sorted(self._by_series, key=len, reverse=True)
+        self._connector_series: dict[str, str] = {}
+
+    def terminal(self, part_number: str) -> TerminalInfo | None:
+        return self._terminals.get(part_number)
+
+    def connector_series(self, part_number: str) -> str:
+        """
+        Returns the series of a connector part number: the longest catalog
+        series it starts with, up to a hyphen or its end, or else the text
+        before its first hyphen. Results are memoized per part number.
+        """
+        series = self._connector_series.get(part_number)
+        if series is None:
+            series = next(
+                (
+                    s
+                    for s in self._series_names
+                    if part_number.startswith(s)
+                    and part_number[len(s) : len(s) + 1] in ("", "-")
+                ),
+                part_number.split("-")[0],
+            )
+            self._connector_series[part_number] = series
+        return series
+
+    def terminals_for_series(self, series: str) -> tuple[str, ...]:
+        return self._by_series.get(series, ())
+
+    def suggest_terminals(
+        self, connector_part_number: str, gauge: float
+    ) -> tuple[str, ...]:
+        """
+        Returns the terminals fitting both a connector and a wire gauge,
+        tightest gauge range first.
+        """
+        if not float(gauge).is_integer():
+            return ()
+        series = self.connector_series(connector_part_number)
+        return self._by_series_gauge.get((series, int(gauge)), ())
+
+
+class CompatibilityService:
+    def __init__(self, catalog: CatalogService):
+        self.catalog = catalog
+        self._index: CompatibilityIndex | None = None
+        self._lock = threading.Lock()
+
+    def get_index(self, db: Session) -> CompatibilityIndex:
+        """Returns the index for the current catalog, rebuilding it if stale."""
+        version = self.catalog.get_version(db)
+        index = self._index
+        if index is not None and index.version == version:
+            return index
+        with self._lock:
+            if self._index is None or self._index.version != version:
+                self._index = CompatibilityIndex(version, self._load_terminals(db))
+            return self._index
+
+    def get_terminals(
+        self, db: Session, index: CompatibilityIndex, part_numbers: Iterable[str]
+    ) -> dict[str, TerminalInfo]:
+        """
+        Resolves terminal part numbers from the index. Part numbers it does not
+        hold are looked up in the catalog in one batch, which also covers the
+        external catalog.
+        """
+        found: dict[str, TerminalInfo] = {}
+        missing: set[str] = set()
+        for part_number in part_numbers:
+            terminal = index.terminal(part_number)
+            if terminal is None:
+                missing.add(part_number)
+            else:
+                found[part_number] = terminal
+        if missing:
+            specs = self.catalog.get_specifications(db, missing)
+            found.update(
+                (pn, TerminalInfo.from_spec(pn, spec)) for pn, spec in specs.items()
+            )
+        return found
+
+    @staticmethod
+    def _load_terminals(db: Session) -> list[TerminalInfo]:
+        part = models.CatalogPart
+        series = models.CatalogTerminalSeries
+        rows = db.execute(
+            select(
+                part.part_number,
+                part.applicable_wire_gauge_min,
+                part.applicable_wire_gauge_max,
+                series.series,
+            )
+            .outerjoin(series, series.part_id == part.id)
+            .where(
+                or_(
+                    part.component_type == "terminal",
+                    part.applicable_wire_gauge_min.is_not(None),
+                    part.applicable_wire_gauge_max.is_not(None),
+                    series.id.is_not(None),
+                )
+            )
+        )
+        gauges: dict[str, tuple[int | None, int | None]] = {}
+        series_by_part: dict[str, set[str]] = defaultdict(set)
+        for part_number, gauge_min, gauge_max, series_name in rows:
+            gauges[part_number] = (gauge_min, gauge_max)
+            if series_name is not None:
+                series_by_part[part_number].add(series_name)
+        return [
+            TerminalInfo(pn, gauge_min, gauge_max, frozenset(series_by_part[pn]))
+            for pn, (gauge_min, gauge_max) in gauges.items()
+        ]
+
+
+compatibility_service = CompatibilityService(catalog=catalog_service)
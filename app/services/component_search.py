@@ -0,0 +1,214 @@
+# app/services/component_search.py
+
+"""
+Component Library Search
+
+Searches the catalog for the component library panel. Free-text queries match
+parts in two ways, both answered from indexes rather than by scanning the
+catalog:
+
+- Prefix: the normalized query is a prefix of the normalized part number,
+  resolved as a range scan on `catalog_parts.part_number_key`.
+- Fuzzy: the part shares enough trigrams with the query, counted from
+  `catalog_part_trigrams`. This tolerates typos and matches inside part
+  numbers and names.
+
+Prefix matches rank first, then parts by the share of query trigrams they
+contain. Results are paginated and come with facet counts for the filterable
+attributes. A search runs two statements, the page and a summary of the total
+and every facet count, each matching the query once. Each result is tagged
+with an ETag derived from the catalog version, so clients can revalidate
+cached pages cheaply.
+"""
+
+import hashlib
+import math
+from collections import defaultdict
+from dataclasses import astuple, dataclass
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    case,
+    func,
+    literal,
+    null,
+    select,
+    union,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.services.catalog import (
+    CatalogService,
+    catalog_service,
+    normalize_part_number,
+    trigrams,
+)
+
+# Share of the query trigrams a part must contain to count as a fuzzy match
+MIN_SIMILARITY = 0.4
+
+# Sorts after every character a normalized part number can contain
+_KEY_UPPER_BOUND = "\U0010ffff"
+
+FACETS = ("component_type", "manufacturer", "pin_count", "gauge")
+
+
+@dataclass(frozen=True)
+class ComponentQuery:
+    q: str | None = None
+    component_type: str | None = None
+    manufacturer: str | None = None
+    pin_count: int | None = None
+    gauge: float | None = None
+    page: int = 1
+    page_size: int = 50
+
+
+def _facet_key(value: object) -> str:
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def _to_component(part: models.CatalogPart) -> schemas.LibraryComponent:
+    return schemas.LibraryComponent(
+        id=part.part_number,
+        type=part.component_type,
+        name=part.name or part.part_number,
+        data=schemas.LibraryComponentData(
+            manufacturer=part.manufacturer,
+            part_number=part.part_number,
+            pins=[
+                schemas.LibraryPin(id=str(n))
+                for n in range(1, (part.pin_count or 0) + 1)
+            ],
+            gauge=part.gauge,
+        ),
+    )
+
+
+class ComponentSearchService:
+    def __init__(self, catalog: CatalogService):
+        self.catalog = catalog
+
+    def etag(self, db: Session, query: ComponentQuery) -> str:
+        """Returns the ETag of a query's result for the current catalog."""
+        key = repr((self.catalog.get_version(db), astuple(query)))
+        return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+    def search(
+        self, db: Session, query: ComponentQuery
+    ) -> schemas.ComponentSearchResult:
+        part = models.CatalogPart
+        filters = self._filters(query)
+        stmt: Select = select(part).where(*filters)
+        order_by: list[ColumnElement] = []
+
+        key = normalize_part_number(query.q or "")
+        if key:
+            prefix = and_(
+                part.part_number_key >= key,
+                part.part_number_key < key + _KEY_UPPER_BOUND,
+            )
+            candidates = [select(part.id.label("id")).where(prefix)]
+
+            grams = trigrams(key)
+            hits = None
+            if len(key) >= 3:
+                trigram = models.CatalogPartTrigram
+                hits = (
+                    select(trigram.part_id, func.count().label("hits"))
+                    .where(trigram.trigram.in_(grams))
+                    .group_by(trigram.part_id)
+                    .having(func.count() >= math.ceil(len(grams) * MIN_SIMILARITY))
+                    # Read for both matching and ranking, but counted once
+                    .cte("hits")
+                )
+                candidates.append(select(hits.c.part_id))
+
+            matched = union(*candidates).subquery()
+            stmt = stmt.join(matched, matched.c.id == part.id)
+            order_by.append(case((prefix, 1), else_=0).desc())
+            if hits is not None:
+                stmt = stmt.outerjoin(hits, hits.c.part_id == part.id)
+                order_by.append(func.coalesce(hits.c.hits, 0).desc())
+        order_by.append(part.part_number.asc())
+
+        page = (
+            db.execute(
+                stmt.order_by(*order_by)
+                .limit(query.page_size)
+                .offset((query.page - 1) * query.page_size)
+            )
+            .scalars()
+            .all()
+        )
+        total, facets = self._summarize(db, stmt)
+        return schemas.ComponentSearchResult(
+            items=[_to_component(p) for p in page],
+            total=total,
+            page=query.page,
+            page_size=query.page_size,
+            facets=facets,
+        )
+
+    @staticmethod
+    def _summarize(db: Session, stmt: Select) -> tuple[int, schemas.ComponentFacets]:
+        """
+        Counts the parts a search matches and their facet values in one
+        statement. The matches are a CTE read by every count, which both
+        PostgreSQL and SQLite materialize once as it is read more than once.
+        """
+        facet_columns = [getattr(models.CatalogPart, name) for name in FACETS]
+        matches = stmt.with_only_columns(*facet_columns).cte("matches")
+
+        def counts(facet: str | None) -> Select:
+            columns = [
+                matches.c[name].label(name)
+                if name == facet
+                else null().cast(matches.c[name].type).label(name)
+                for name in FACETS
+            ]
+            count = select(
+                literal(facet or "").label("facet"), *columns, func.count()
+            ).select_from(matches)
+            if facet is None:
+                return count
+            column = matches.c[facet]
+            return count.where(column.is_not(None)).group_by(column)
+
+        total = 0
+        found: dict[str, list[tuple[Any, int]]] = defaultdict(list)
+        summary = union_all(counts(None), *(counts(name) for name in FACETS))
+        for facet, *values, n in db.execute(summary):
+            if facet:
+                found[facet].append((values[FACETS.index(facet)], n))
+            else:
+                total = n
+
+        facets = schemas.ComponentFacets()
+        for name, value_counts in found.items():
+            # Most common values first
+            value_counts.sort(key=lambda item: (-item[1], item[0]))
+            setattr(facets, name, {_facet_key(v): n for v, n in value_counts})
+        return total, facets
+
+    @staticmethod
+    def _filters(query: ComponentQuery) -> list[ColumnElement[bool]]:
+        part = models.CatalogPart
+        filters: list[ColumnElement[bool]] = []
+        if query.component_type is not None:
+            filters.append(part.component_type == query.component_type)
+        if query.manufacturer is not None:
+            filters.append(part.manufacturer == query.manufacturer)
+        if query.pin_count is not None:
+            filters.append(part.pin_count == query.pin_count)
+        if query.gauge is not None:
+            filters.append(part.gauge == query.gauge)
+        return filters
+
+
+component_search_service = ComponentSearchService(catalog=catalog_service)
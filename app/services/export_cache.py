@@ -0,0 +1,133 @@
+# app/services/export_cache.py
+
+"""
+Export Cache
+
+A content-addressed disk cache for generated KiCad files. An output is stored
+under a key hashed from everything it is derived from (the design or the
+input file contents, and the settings that shape the output), so a repeated
+export is a file lookup and needs neither schematic generation nor kicad-cli.
+
+The cache keeps the total size of its files under a limit by evicting the
+least recently used ones. The cache directory is the index: the modification
+time of a file is its last use, touched on every hit, so processes sharing the
+directory see each other's files and uses. A file returned within the last
+`min_age` seconds is never evicted, as its caller may not have read it yet.
+Outputs are written to a hidden temporary file in the cache directory and
+renamed into place, so a reader never sees a partial file.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+from app.core.config import settings
+
+
+def cache_key(*parts: object) -> str:
+    """Hashes JSON-serializable parts into a key, independent of dict order."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExportCache:
+    def __init__(self, directory: str | Path, max_bytes: int, min_age: float = 0.0):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self.hits = 0
+        self.misses = 0
+        # Serializes the hits and evictions of this process; other processes
+        # only race evictions against hits within `min_age`
+        self._lock = threading.Lock()
+
+    def get_or_create(
+        self, key: str, suffix: str, create: Callable[[str], None]
+    ) -> str:
+        """
+        Returns the path of the cached output for a key, calling
+        `create(path)` to write it on a miss. The returned file belongs to the
+        cache and must not be modified or deleted; it is kept for at least
+        `min_age` seconds.
+        """
+        path = self.directory / key[:2] / f"{key}{suffix}"
+        with self._lock:
+            try:
+                # Precise, as file times are only updated every clock tick
+                now = time.time()
+                os.utime(path, (now, now))
+                self.hits += 1
+                return str(path)
+            except FileNotFoundError:
+                self.misses += 1
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The temporary name keeps the suffix, as kicad-cli picks formats by it
+        temp_path = path.parent / f".{key}-{uuid.uuid4().hex}{suffix}"
+        try:
+            create(str(temp_path))
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        with self._lock:
+            self._evict(keep=path)
+        return str(path)
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        """The cached files on disk with their last use and size, oldest first."""
+        files = []
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return sorted(files)
+
+    def _evict(self, keep: Path) -> None:
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        cutoff = time.time() - self.min_age
+        for used, size, path in files:
+            if total <= self.max_bytes or used >= cutoff:
+                break
+            if path == keep:
+                continue
+            try:
+                # Another process may have used the file since the scan
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+export_cache = ExportCache(
+    settings.EXPORT_CACHE_DIR
+    or Path(tempfile.gettempdir()) / "harness-cad-export-cache",
+    max_bytes=settings.EXPORT_CACHE_MAX_BYTES,
+    min_age=settings.EXPORT_CACHE_MIN_AGE,
+)
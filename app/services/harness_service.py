@@ -1,4 +1,6 @@
 import io
+from collections import defaultdict
+from typing import Any
 from uuid import UUID
 
 import wireviz.wireviz
@@ -15,13 +17,55 @@ from reportlab.platypus import (
     Table,
     TableStyle,
 )
+from sqlalchemy import update
 from sqlalchemy.orm import Session, joinedload
 
 from app import models, schemas
 from app.exceptions import HarnessNotFoundException, InvalidHarnessDataException
+from app.services.catalog import (
+    CONNECTOR_SPEC_FIELDS,
+    WIRE_SPEC_FIELDS,
+    CatalogService,
+    catalog_service,
+    spec_attributes,
+)
+
+# Connection fields copied as is from the input
+_ASSEMBLY_FIELDS = (
+    "strip_length_a",
+    "strip_length_b",
+    "terminal_part_number_a",
+    "terminal_part_number_b",
+    "marking_text_a",
+    "marking_text_b",
+)
+
+
+def _connection_key(connection: models.Connection) -> tuple[str, ...]:
+    """Identifies a connection by the logical ids of its wire and pins."""
+    return (
+        connection.wire.logical_id,
+        connection.from_pin.connector.logical_id,
+        connection.from_pin.logical_id,
+        connection.to_pin.connector.logical_id,
+        connection.to_pin.logical_id,
+    )
+
+
+def _assign(entity: Any, **values: Any) -> bool:
+    """Sets the attributes that differ, and returns whether there were any."""
+    dirty = False
+    for field, value in values.items():
+        if getattr(entity, field) != value:
+            setattr(entity, field, value)
+            dirty = True
+    return dirty
 
 
 class HarnessService:
+    def __init__(self, catalog: CatalogService):
+        self.catalog = catalog
+
     def create_harness(
         self, db: Session, harness_in: schemas.HarnessCreate
     ) -> models.Harness:
@@ -31,65 +75,7 @@ class HarnessService:
         db.add(db_harness)
         db.flush()
 
-        # Create Connectors and Pins
-        connector_map = {}
-        pin_map = {}
-        for conn_in in harness_in.connectors:
-            db_conn = models.Connector()
-            db_conn.logical_id = conn_in.id
-            db_conn.manufacturer = conn_in.manufacturer
-            db_conn.part_number = conn_in.part_number
-            db_conn.harness_id = db_harness.id
-            db.add(db_conn)
-            db.flush()
-            connector_map[conn_in.id] = db_conn
-            for pin_in in conn_in.pins:
-                db_pin = models.Pin()
-                db_pin.logical_id = pin_in.id
-                db_pin.connector_id = db_conn.id
-                db.add(db_pin)
-                db.flush()
-                pin_map[f"{conn_in.id}-{pin_in.id}"] = db_pin
-
-        # Create Wires
-        wire_map = {}
-        for wire_in in harness_in.wires:
-            db_wire = models.Wire()
-            db_wire.logical_id = wire_in.id
-            db_wire.manufacturer = wire_in.manufacturer
-            db_wire.part_number = wire_in.part_number
-            db_wire.color = wire_in.color
-            db_wire.gauge = wire_in.gauge
-            db_wire.length = wire_in.length
-            db_wire.harness_id = db_harness.id
-            db.add(db_wire)
-            db.flush()
-            wire_map[wire_in.id] = db_wire
-
-        # Create Connections
-        for conn_data in harness_in.connections:
-            from_pin_key = f"{conn_data.from_connector_id}-{conn_data.from_pin_id}"
-            to_pin_key = f"{conn_data.to_connector_id}-{conn_data.to_pin_id}"
-
-            if from_pin_key not in pin_map or to_pin_key not in pin_map:
-                raise InvalidHarnessDataException("Pin not found for connection.")
-            if conn_data.wire_id not in wire_map:
-                raise InvalidHarnessDataException("Wire not found for connection.")
-
-            db_connection = models.Connection()
-            db_connection.harness_id = db_harness.id
-            db_connection.wire_id = wire_map[conn_data.wire_id].id
-            db_connection.from_pin_id = pin_map[from_pin_key].id
-            db_connection.to_pin_id = pin_map[to_pin_key].id
-
-            # Add assembly instructions
-            db_connection.strip_length_a = conn_data.strip_length_a
-            db_connection.strip_length_b = conn_data.strip_length_b
-            db_connection.terminal_part_number_a = conn_data.terminal_part_number_a
-            db_connection.terminal_part_number_b = conn_data.terminal_part_number_b
-            db_connection.marking_text_a = conn_data.marking_text_a
-            db_connection.marking_text_b = conn_data.marking_text_b
-            db.add(db_connection)
+        self._add_components(db, db_harness, harness_in)
 
         db.commit()
         db.refresh(db_harness)
@@ -99,31 +85,227 @@ class HarnessService:
         self, db: Session, harness_id: UUID, harness_in: schemas.HarnessCreate
     ) -> models.Harness:
         db_harness = self.get_harness(db=db, harness_id=harness_id)
+        db_harness.name = harness_in.name
 
-        # Clear existing data
-        for connection in db_harness.connections:
-            db.delete(connection)
-        for wire in db_harness.wires:
-            db.delete(wire)
-        for connector in db_harness.connectors:
-            db.delete(connector)  # Pins will be cascade-deleted
-        db.flush()
+        changed = self._sync_components(db, db_harness, harness_in)
+        if any(changed.values()):
+            self.record_change(db, db_harness.id, changed)
 
-        # Update harness name
-        db_harness.name = harness_in.name
+        db.commit()
+        db.refresh(db_harness)
+        return db_harness
+
+    def record_change(
+        self, db: Session, harness_id: UUID, changed: dict[str, set[UUID]]
+    ) -> int:
+        """
+        Bumps the revision of a harness and records the ids of the entities
+        the edit added, changed or deleted, keyed by entity type, for
+        validation to re-check. Returns the new revision.
+        """
+        revision = db.execute(
+            update(models.Harness)
+            .where(models.Harness.id == harness_id)
+            .values(revision=models.Harness.revision + 1)
+            .returning(models.Harness.revision)
+        ).scalar_one()
+        db.add(
+            models.HarnessChange(
+                harness_id=harness_id,
+                revision=revision,
+                entities={
+                    entity_type: sorted(str(entity_id) for entity_id in ids)
+                    for entity_type, ids in changed.items()
+                    if ids
+                },
+            )
+        )
+        return revision
+
+    def _sync_components(
+        self, db: Session, db_harness: models.Harness, harness_in: schemas.HarnessCreate
+    ) -> dict[str, set[UUID]]:
+        """
+        Brings the connectors, pins, wires and connections of a harness in
+        line with the input. Components are matched by logical id, and
+        connections by wire and pins, so unchanged rows keep their ids.
+        Returns the ids of the connectors, wires and connections added,
+        changed or deleted.
+        """
+        connectors_in = {c.id: c for c in harness_in.connectors}
+        wires_in = {w.id: w for w in harness_in.wires}
+        if len(connectors_in) < len(harness_in.connectors):
+            raise InvalidHarnessDataException("Duplicate connector id.")
+        if len(wires_in) < len(harness_in.wires):
+            raise InvalidHarnessDataException("Duplicate wire id.")
+        pins_in = {(c.id, p.id) for c in harness_in.connectors for p in c.pins}
+        for conn_data in harness_in.connections:
+            if (conn_data.from_connector_id, conn_data.from_pin_id) not in pins_in or (
+                conn_data.to_connector_id,
+                conn_data.to_pin_id,
+            ) not in pins_in:
+                raise InvalidHarnessDataException("Pin not found for connection.")
+            if conn_data.wire_id not in wires_in:
+                raise InvalidHarnessDataException("Wire not found for connection.")
+
+        changed: dict[str, set[UUID]] = {
+            "connector": set(),
+            "wire": set(),
+            "connection": set(),
+        }
+        # Added or changed rows, whose ids are only known after the flush
+        touched: list[tuple[str, models.Connector | models.Wire | models.Connection]]
+        touched = []
+
+        # Connections, matched by wire and pins; those left over are deleted,
+        # which changes the connectors at their ends too
+        existing: dict[tuple[str, ...], list[models.Connection]] = defaultdict(list)
+        for existing_connection in db_harness.connections:
+            existing[_connection_key(existing_connection)].append(existing_connection)
+        kept: list[models.Connection | None] = []
+        for conn_data in harness_in.connections:
+            matches = existing.get(
+                (
+                    conn_data.wire_id,
+                    conn_data.from_connector_id,
+                    conn_data.from_pin_id,
+                    conn_data.to_connector_id,
+                    conn_data.to_pin_id,
+                )
+            )
+            kept.append(matches.pop(0) if matches else None)
+        for removed in [c for matches in existing.values() for c in matches]:
+            changed["connection"].add(removed.id)
+            changed["connector"].add(removed.from_pin.connector_id)
+            changed["connector"].add(removed.to_pin.connector_id)
+            db_harness.connections.remove(removed)
+
+        # Connectors and their pins
+        specs = self.catalog.get_cached_specifications(
+            db,
+            {c.part_number for c in harness_in.connectors}
+            | {w.part_number for w in harness_in.wires},
+        )
+        pin_map: dict[tuple[str, str], models.Pin] = {}
+        db_connectors = {}
+        for existing_conn in list(db_harness.connectors):
+            if existing_conn.logical_id in connectors_in and (
+                existing_conn.logical_id not in db_connectors
+            ):
+                db_connectors[existing_conn.logical_id] = existing_conn
+            else:
+                changed["connector"].add(existing_conn.id)
+                db_harness.connectors.remove(existing_conn)  # Pins are deleted with it
+        for conn_in in harness_in.connectors:
+            db_conn = db_connectors.get(conn_in.id)
+            dirty = db_conn is None
+            if db_conn is None:
+                db_conn = models.Connector(logical_id=conn_in.id)
+                db_harness.connectors.append(db_conn)
+            dirty |= _assign(
+                db_conn,
+                manufacturer=conn_in.manufacturer,
+                part_number=conn_in.part_number,
+                **spec_attributes(
+                    specs.get(conn_in.part_number), CONNECTOR_SPEC_FIELDS
+                ),
+            )
+            pin_ids = {pin_in.id for pin_in in conn_in.pins}
+            for db_pin in list(db_conn.pins):
+                if db_pin.logical_id in pin_ids and (
+                    (conn_in.id, db_pin.logical_id) not in pin_map
+                ):
+                    pin_map[conn_in.id, db_pin.logical_id] = db_pin
+                else:
+                    db_conn.pins.remove(db_pin)
+                    dirty = True
+            for pin_in in conn_in.pins:
+                if (conn_in.id, pin_in.id) not in pin_map:
+                    db_pin = models.Pin(logical_id=pin_in.id)
+                    db_conn.pins.append(db_pin)
+                    pin_map[conn_in.id, pin_in.id] = db_pin
+                    dirty = True
+            if dirty:
+                touched.append(("connector", db_conn))
+
+        # Wires
+        db_wires = {}
+        for existing_wire in list(db_harness.wires):
+            logical_id = existing_wire.logical_id
+            if logical_id in wires_in and logical_id not in db_wires:
+                db_wires[logical_id] = existing_wire
+            else:
+                changed["wire"].add(existing_wire.id)
+                db_harness.wires.remove(existing_wire)
+        for wire_in in harness_in.wires:
+            db_wire = db_wires.get(wire_in.id)
+            dirty = db_wire is None
+            if db_wire is None:
+                db_wire = db_wires[wire_in.id] = models.Wire(logical_id=wire_in.id)
+                db_harness.wires.append(db_wire)
+            dirty |= _assign(
+                db_wire,
+                manufacturer=wire_in.manufacturer,
+                part_number=wire_in.part_number,
+                color=wire_in.color,
+                gauge=wire_in.gauge,
+                length=wire_in.length,
+                **spec_attributes(specs.get(wire_in.part_number), WIRE_SPEC_FIELDS),
+            )
+            if dirty:
+                touched.append(("wire", db_wire))
+
+        # Connections kept get the assembly instructions of the input, the
+        # others are created
+        for conn_data, db_connection in zip(harness_in.connections, kept):
+            dirty = db_connection is None
+            if db_connection is None:
+                db_connection = models.Connection(
+                    wire=db_wires[conn_data.wire_id],
+                    from_pin=pin_map[
+                        conn_data.from_connector_id, conn_data.from_pin_id
+                    ],
+                    to_pin=pin_map[conn_data.to_connector_id, conn_data.to_pin_id],
+                )
+                db_harness.connections.append(db_connection)
+            dirty |= _assign(
+                db_connection,
+                **{field: getattr(conn_data, field) for field in _ASSEMBLY_FIELDS},
+            )
+            if dirty:
+                touched.append(("connection", db_connection))
 
-        # Re-create components from the input schema
-        connector_map = {}
+        db.flush()
+        for entity_type, entity in touched:
+            changed[entity_type].add(entity.id)
+        return changed
+
+    def _add_components(
+        self, db: Session, db_harness: models.Harness, harness_in: schemas.HarnessCreate
+    ) -> None:
+        """
+        Adds the connectors, pins, wires and connections of the input to the
+        harness. Connectors and wires are enriched with their catalog specs,
+        looked up in one batch for all distinct part numbers.
+        """
+        specs = self.catalog.get_cached_specifications(
+            db,
+            {c.part_number for c in harness_in.connectors}
+            | {w.part_number for w in harness_in.wires},
+        )
+
+        # Create Connectors and Pins
         pin_map = {}
         for conn_in in harness_in.connectors:
-            db_conn = models.Connector()
+            db_conn = models.Connector(
+                **spec_attributes(specs.get(conn_in.part_number), CONNECTOR_SPEC_FIELDS)
+            )
             db_conn.logical_id = conn_in.id
             db_conn.manufacturer = conn_in.manufacturer
             db_conn.part_number = conn_in.part_number
             db_conn.harness_id = db_harness.id
             db.add(db_conn)
             db.flush()
-            connector_map[conn_in.id] = db_conn
             for pin_in in conn_in.pins:
                 db_pin = models.Pin()
                 db_pin.logical_id = pin_in.id
@@ -132,9 +314,12 @@ class HarnessService:
                 db.flush()
                 pin_map[f"{conn_in.id}-{pin_in.id}"] = db_pin
 
+        # Create Wires
         wire_map = {}
         for wire_in in harness_in.wires:
-            db_wire = models.Wire()
+            db_wire = models.Wire(
+                **spec_attributes(specs.get(wire_in.part_number), WIRE_SPEC_FIELDS)
+            )
             db_wire.logical_id = wire_in.id
             db_wire.manufacturer = wire_in.manufacturer
             db_wire.part_number = wire_in.part_number
@@ -146,6 +331,7 @@ class HarnessService:
             db.flush()
             wire_map[wire_in.id] = db_wire
 
+        # Create Connections
         for conn_data in harness_in.connections:
             from_pin_key = f"{conn_data.from_connector_id}-{conn_data.from_pin_id}"
             to_pin_key = f"{conn_data.to_connector_id}-{conn_data.to_pin_id}"
@@ -162,18 +348,10 @@ class HarnessService:
             db_connection.to_pin_id = pin_map[to_pin_key].id
 
             # Add assembly instructions
-            db_connection.strip_length_a = conn_data.strip_length_a
-            db_connection.strip_length_b = conn_data.strip_length_b
-            db_connection.terminal_part_number_a = conn_data.terminal_part_number_a
-            db_connection.terminal_part_number_b = conn_data.terminal_part_number_b
-            db_connection.marking_text_a = conn_data.marking_text_a
-            db_connection.marking_text_b = conn_data.marking_text_b
+            for field in _ASSEMBLY_FIELDS:
+                setattr(db_connection, field, getattr(conn_data, field))
             db.add(db_connection)
 
-        db.commit()
-        db.refresh(db_harness)
-        return db_harness
-
     def get_harness(self, db: Session, harness_id: UUID) -> models.Harness:
         db_harness = (
             db.query(models.Harness)
@@ -374,4 +552,4 @@ class HarnessService:
         return buffer.getvalue()
 
 
-harness_service = HarnessService()
+harness_service = HarnessService(catalog=catalog_service)
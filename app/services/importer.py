@@ -1,44 +1,291 @@
 # app/services/importer.py
 
+import hashlib
 import io
-from typing import IO, cast
+import math
+import uuid
+from dataclasses import dataclass, field
+from typing import IO, Any, cast
 
 import ezdxf
 from ezdxf.document import Drawing
-from ezdxf.entities import Insert
+from ezdxf.entities import Insert, Line, LWPolyline
+from ezdxf.layouts import Modelspace
+from ezdxf.tools.codepage import toencoding
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app import models
-from app.services.catalog import CatalogService, catalog_service
+from app.services.catalog import (
+    CONNECTOR_SPEC_FIELDS,
+    WIRE_SPEC_FIELDS,
+    CatalogService,
+    ComponentSpec,
+    catalog_service,
+    spec_attributes,
+)
+from app.services.spatial_index import GridIndex
+
+Point = tuple[float, float]
+
+# Maximum distance, in drawing units, between a wire end and the pin it snaps to
+DEFAULT_SNAP_TOLERANCE = 0.5
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Bytes searched for the header variables; the HEADER section comes first in a DXF
+_HEADER_SEARCH_SIZE = 64 * 1024
+
+# DXF R2007 (AC1021) and later are always UTF-8 encoded
+_UTF8_MIN_ACADVER = "AC1021"
+
+
+def hash_stream(stream: IO[bytes]) -> str:
+    """
+    Returns the SHA-256 hex digest of a binary stream, read in chunks, and
+    rewinds the stream so it can be parsed afterwards.
+    """
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(_HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ParsedConnector:
+    """A connector block reference collected from the DXF modelspace."""
+
+    logical_id: str
+    part_number: str
+    insert: Point = (0.0, 0.0)
+    rotation: float = 0.0  # Degrees, counter-clockwise
+    scale: Point = (1.0, 1.0)
+
+    def to_world(self, x: float, y: float) -> Point:
+        """Transforms a block-local point into drawing coordinates."""
+        sx, sy = x * self.scale[0], y * self.scale[1]
+        angle = math.radians(self.rotation)
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        return (
+            self.insert[0] + sx * cos_a - sy * sin_a,
+            self.insert[1] + sx * sin_a + sy * cos_a,
+        )
+
+
+@dataclass(frozen=True)
+class ParsedWire:
+    """An open LINE or LWPOLYLINE collected from the DXF modelspace."""
+
+    layer: str
+    start: Point
+    end: Point
+    length: float
+
+
+@dataclass
+class ParsedDrawing:
+    """Everything the importer needs from a DXF, free of any database state."""
+
+    connectors: list[ParsedConnector] = field(default_factory=list)
+    wires: list[ParsedWire] = field(default_factory=list)
+    name: str = "Imported Harness"
+    source_hash: str | None = None  # SHA-256 of the DXF file
+
+    @property
+    def part_numbers(self) -> set[str]:
+        """Distinct part numbers referenced by connectors and wire layers."""
+        return {c.part_number for c in self.connectors} | {w.layer for w in self.wires}
+
+
+@dataclass
+class _ImportRows:
+    harnesses: list[dict[str, Any]] = field(default_factory=list)
+    harness_designs: list[dict[str, Any]] = field(default_factory=list)
+    connectors: list[dict[str, Any]] = field(default_factory=list)
+    pins: list[dict[str, Any]] = field(default_factory=list)
+    wires: list[dict[str, Any]] = field(default_factory=list)
+    connections: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _polyline_length(points: list[tuple[float, float, float]]) -> float:
+    """Length of an open LWPOLYLINE given (x, y, bulge) vertices."""
+    length = 0.0
+    for (x1, y1, bulge), (x2, y2, _) in zip(points, points[1:]):
+        chord = math.hypot(x2 - x1, y2 - y1)
+        if bulge:
+            # The bulge is tan(theta / 4) of the arc's included angle theta
+            theta = 4 * math.atan(abs(bulge))
+            length += chord * (theta / 2) / math.sin(theta / 2)
+        else:
+            length += chord
+    return length
+
+
+def decode_dxf(data: bytes) -> tuple[str, str]:
+    """
+    Detects the text encoding of a DXF file from its contents and decodes it,
+    returning the encoding and the text.
+
+    R2007+ files are always UTF-8. Older files that are valid UTF-8 throughout
+    are read as UTF-8, as that is what most tools write today. Otherwise the
+    $DWGCODEPAGE header variable (e.g. ANSI_932 for Japanese) decides, falling
+    back to cp1252. The file is decoded strictly, at most once as UTF-8 and
+    once in its code page.
+
+    Raises:
+        ValueError: If the file is not valid text in the detected encoding.
+    """
+    header: dict[bytes, str] = {}
+    # DXF lines end in \n or \r\n; other line breaks may be text content
+    lines = [line.strip() for line in data[:_HEADER_SEARCH_SIZE].split(b"\n")]
+    for i, tag in enumerate(lines[:-2]):
+        if tag in (b"$ACADVER", b"$DWGCODEPAGE"):
+            header[tag] = lines[i + 2].decode("latin-1")
+        elif tag == b"ENDSEC":
+            break
+
+    if header.get(b"$ACADVER", "") >= _UTF8_MIN_ACADVER:
+        encoding = "utf-8"
+    else:
+        if not data.isascii():
+            try:
+                return "utf-8", data.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+        encoding = toencoding(header.get(b"$DWGCODEPAGE", "ANSI_1252"))
+    try:
+        return encoding, data.decode(encoding)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"DXF file is not valid {encoding} text: {e}") from e
 
 
 class ImporterService:
-    def __init__(self, catalog_service: CatalogService):
+    def __init__(
+        self,
+        catalog_service: CatalogService,
+        snap_tolerance: float = DEFAULT_SNAP_TOLERANCE,
+    ):
         self.catalog_service = catalog_service
+        self.snap_tolerance = snap_tolerance
 
     def import_dxf(
         self, db: Session, dxf_file: IO[bytes], project_id: int
     ) -> models.Harness:
         """
-        Parses a DXF file to import connectors and create a new harness.
+        Parses a DXF file to import connectors and wires into a new harness.
+
+        If the same file was already imported into the project, the existing
+        harness is returned and the file is not parsed again.
         """
-        doc: Drawing
-        try:
-            # Attempt to read the DXF file with UTF-8 encoding
-            doc = ezdxf.read(io.TextIOWrapper(dxf_file, encoding="utf-8"))
-        except UnicodeDecodeError:
-            # If UTF-8 fails, reset stream and try with a common legacy encoding
-            dxf_file.seek(0)
-            doc = ezdxf.read(io.TextIOWrapper(dxf_file, encoding="cp1252"))
-        msp = doc.modelspace()
+        source_hash = hash_stream(dxf_file)
+        harness_id = self.find_imported(db, project_id, {source_hash}).get(source_hash)
+        if harness_id is None:
+            parsed = self.parse_dxf(dxf_file)
+            parsed.source_hash = source_hash
+            [harness_id] = self.import_parsed(db, [parsed], project_id)
+        return db.query(models.Harness).filter(models.Harness.id == harness_id).one()
+
+    def find_imported(
+        self, db: Session, project_id: int, source_hashes: set[str] | None = None
+    ) -> dict[str, uuid.UUID]:
+        """
+        Maps the content hashes of DXF files already imported into the project
+        to their harness IDs, optionally restricted to the given hashes.
+        """
+        query = (
+            select(models.Harness.source_hash, models.Harness.id)
+            .join(
+                models.HarnessDesign,
+                models.HarnessDesign.harness_id == models.Harness.id,
+            )
+            .where(models.HarnessDesign.project_id == project_id)
+        )
+        if source_hashes is not None:
+            query = query.where(models.Harness.source_hash.in_(source_hashes))
+        return {
+            source_hash: harness_id
+            for source_hash, harness_id in db.execute(query)
+            if source_hash is not None
+        }
+
+    def parse_dxf(self, dxf_file: IO[bytes]) -> ParsedDrawing:
+        """
+        Reads a DXF stream and collects its connectors and wires. This step does
+        not touch the database, so it can run in a separate worker process.
 
-        # Create a new Harness to host the imported components
-        db_harness = models.Harness(name="Imported Harness")
-        db.add(db_harness)
-        db.flush()
+        The encoding is detected from the whole file, which is decoded strictly
+        and parsed once.
+
+        Raises:
+            ValueError: If the file is not valid text in the detected encoding.
+        """
+        _, text = decode_dxf(dxf_file.read())
+        doc = ezdxf.read(io.StringIO(text))
+        return self.parse_drawing(doc)
+
+    def import_parsed(
+        self, db: Session, drawings: list[ParsedDrawing], project_id: int
+    ) -> list[uuid.UUID]:
+        """
+        Creates one harness per parsed drawing and returns their IDs.
+
+        The distinct part numbers of all drawings are resolved with a single
+        catalog lookup, and every table is then written with one bulk INSERT,
+        all within a single transaction.
+        """
+        part_numbers: set[str] = set()
+        for parsed in drawings:
+            part_numbers |= parsed.part_numbers
+        specs = self.catalog_service.get_specifications(db, part_numbers)
+
+        rows = _ImportRows()
+        harness_ids = []
+        for parsed in drawings:
+            harness_id = uuid.uuid4()
+            harness_ids.append(harness_id)
+            rows.harnesses.append(
+                {
+                    "id": harness_id,
+                    "name": parsed.name,
+                    "source_hash": parsed.source_hash,
+                }
+            )
+            # Associate the new harness with the project via HarnessDesign
+            rows.harness_designs.append(
+                {
+                    "project_id": project_id,
+                    "harness_id": harness_id,
+                    "design_data": {"nodes": [], "edges": []},
+                }
+            )
+            self._build_rows(rows, harness_id, parsed, specs)
+
+        for model, table_rows in (
+            (models.Harness, rows.harnesses),
+            (models.Connector, rows.connectors),
+            (models.Pin, rows.pins),
+            (models.Wire, rows.wires),
+            (models.Connection, rows.connections),
+            (models.HarnessDesign, rows.harness_designs),
+        ):
+            if table_rows:
+                db.execute(insert(model), table_rows)
+        db.commit()
+
+        return harness_ids
+
+    def parse_drawing(self, doc: Drawing) -> ParsedDrawing:
+        """Collects connectors and wires from the modelspace of a DXF document."""
+        msp = doc.modelspace()
+        return ParsedDrawing(
+            connectors=self._collect_connectors(msp),
+            wires=self._collect_wires(msp),
+        )
 
-        imported_connectors = []
-        # Find all block references (INSERT entities) in the modelspace
+    def _collect_connectors(self, msp: Modelspace) -> list[ParsedConnector]:
+        """Collects block references (INSERT entities) carrying connector data."""
+        parsed = []
         for block_ref in msp.query("INSERT"):
             if not isinstance(block_ref, Insert):
                 continue
@@ -49,48 +296,133 @@ class ImporterService:
             if not part_number or not ref_des:
                 continue  # Skip blocks that don't have the required attributes
 
-            db_connector = models.Connector(
-                logical_id=ref_des,
-                manufacturer="Unknown",  # Manufacturer is not in the DXF
-                part_number=part_number,
-                harness_id=db_harness.id,
+            location = insert_entity.dxf.insert
+            parsed.append(
+                ParsedConnector(
+                    logical_id=ref_des,
+                    part_number=part_number,
+                    insert=(location.x, location.y),
+                    rotation=insert_entity.dxf.rotation,
+                    scale=(insert_entity.dxf.xscale, insert_entity.dxf.yscale),
+                )
             )
-            db.add(db_connector)
-            db.flush()
-
-            # Enrich with catalog data
-            spec = self.catalog_service.get_specification(part_number)
-            if spec:
-                db_connector.voltage_rating = spec.get("voltage_rating")
-                db_connector.applicable_wire_max_diameter = spec.get(
-                    "applicable_wire_max_diameter"
+        return parsed
+
+    def _collect_wires(self, msp: Modelspace) -> list[ParsedWire]:
+        """
+        Collects LINE and open LWPOLYLINE entities as wire candidates. Closed
+        polylines are outlines (e.g. connector bodies) and are ignored.
+        """
+        parsed = []
+        for entity in msp.query("LINE LWPOLYLINE"):
+            if isinstance(entity, Line):
+                start, end = entity.dxf.start, entity.dxf.end
+                parsed.append(
+                    ParsedWire(
+                        layer=entity.dxf.layer,
+                        start=(start.x, start.y),
+                        end=(end.x, end.y),
+                        length=start.distance(end),
+                    )
                 )
-                db_connector.is_rohs = spec.get("is_rohs")
-                db_connector.is_ul = spec.get("is_ul")
+            elif isinstance(entity, LWPolyline):
+                points = [
+                    (float(x), float(y), float(b))
+                    for x, y, b in entity.get_points("xyb")
+                ]
+                if entity.closed or len(points) < 2 or points[0][:2] == points[-1][:2]:
+                    continue
+                parsed.append(
+                    ParsedWire(
+                        layer=entity.dxf.layer,
+                        start=points[0][:2],
+                        end=points[-1][:2],
+                        length=_polyline_length(points),
+                    )
+                )
+        return parsed
 
-                # Create pins based on catalog data
-                pin_data = spec.get("pins")
-                if pin_data:
-                    for i in range(pin_data["pin_count"]):
-                        db_pin = models.Pin(
-                            logical_id=str(i + 1),
-                            connector_id=db_connector.id,
-                        )
-                        db.add(db_pin)
+    def _build_rows(
+        self,
+        rows: _ImportRows,
+        harness_id: uuid.UUID,
+        parsed: ParsedDrawing,
+        specs: dict[str, ComponentSpec],
+    ) -> None:
+        """
+        Appends the rows of one drawing for the bulk INSERTs, enriched with the
+        catalog data. Primary keys are generated up front so that pins and
+        connections can reference their parents without a flush per row.
+        """
+        wire_count = 0
+        pin_index: GridIndex[uuid.UUID] = GridIndex(self.snap_tolerance)
 
-            imported_connectors.append(db_connector)
+        for connector in parsed.connectors:
+            connector_id = uuid.uuid4()
+            spec = specs.get(connector.part_number) or {}
+            rows.connectors.append(
+                {
+                    "id": connector_id,
+                    "logical_id": connector.logical_id,
+                    "manufacturer": "Unknown",  # Manufacturer is not in the DXF
+                    "part_number": connector.part_number,
+                    "harness_id": harness_id,
+                    **spec_attributes(spec, CONNECTOR_SPEC_FIELDS),
+                }
+            )
 
-        db.commit()
-        db.refresh(db_harness)
+            # Create pins based on catalog data
+            pin_data = spec.get("pins")
+            if not pin_data:
+                continue
+            positions = pin_data["pin_positions"]
+            for i in range(pin_data["pin_count"]):
+                pin_id = uuid.uuid4()
+                rows.pins.append(
+                    {
+                        "id": pin_id,
+                        "logical_id": str(i + 1),
+                        "connector_id": connector_id,
+                    }
+                )
+                if i < len(positions):
+                    x, y = connector.to_world(positions[i]["x"], positions[i]["y"])
+                    pin_index.insert(x, y, pin_id)
 
-        # Associate the new harness with the project via HarnessDesign
-        harness_design = models.HarnessDesign(
-            project_id=project_id, harness_id=db_harness.id
-        )
-        db.add(harness_design)
-        db.commit()
+        # Snap both ends of every wire to a pin; unmatched wires are skipped
+        for wire in parsed.wires:
+            from_pin_id = pin_index.nearest(*wire.start)
+            to_pin_id = pin_index.nearest(*wire.end)
+            if from_pin_id is None or to_pin_id is None or from_pin_id == to_pin_id:
+                continue
 
-        return db_harness
+            wire_id = uuid.uuid4()
+            wire_count += 1
+            # Wires are identified by their layer when it is a catalog part
+            wire_spec = specs.get(wire.layer)
+            part_number = wire.layer if wire_spec else "Unknown"
+            rows.wires.append(
+                {
+                    "id": wire_id,
+                    "logical_id": f"W{wire_count}",
+                    "manufacturer": "Unknown",
+                    "part_number": part_number,
+                    "color": "Unknown",
+                    "gauge": 0.0,  # Gauge is not in the DXF
+                    "length": wire.length,
+                    "harness_id": harness_id,
+                    **spec_attributes(wire_spec, WIRE_SPEC_FIELDS),
+                }
+            )
+            rows.connections.append(
+                {
+                    "id": uuid.uuid4(),
+                    "harness_id": harness_id,
+                    "wire_id": wire_id,
+                    "from_pin_id": from_pin_id,
+                    "to_pin_id": to_pin_id,
+                }
+            )
 
 
 importer_service = ImporterService(catalog_service=catalog_service)
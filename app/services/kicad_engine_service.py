@@ -1,10 +1,116 @@
-import subprocess
-import tempfile
+import re
+import shutil
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 from pathlib import Path
 
 import kicad_sch_api as ksa
 
-from app.schemas.harness_design import HarnessDesign
+from app.exceptions import InvalidHarnessDataException
+from app.schemas.harness_design import HarnessDesign, Node
+from app.services.export_cache import ExportCache, cache_key, file_digest
+from app.services.kicad_runner import KiCadCliRunner, get_runner
+from app.services.netlist import DisjointSet
+from app.services.scratch import ScratchScope, ScratchWorkspace, scratch_workspace
+from app.services.symbol_library import get_symbol_cache
+
+# Part of every cache key; bump it when the generated files change for the
+# same input
+GENERATOR_VERSION = 3
+
+# Outputs `run_pipeline` can export from a generated schematic
+PIPELINE_OUTPUTS = ("dxf", "bom")
+
+CONNECTOR_NODE_TYPES = {"connector", "customConnector"}
+# Connector_Generic has single-row connectors of 1 to 60 pins
+MAX_CONNECTOR_PINS = 60
+# Schematic grid, in mm. Connectors are placed top to bottom in columns;
+# the column sizes are in grid units.
+GRID = 2.54
+COLUMN_TOP = 10
+COLUMN_HEIGHT = 100
+COLUMN_WIDTH = 20
+
+
+def _package_version(name: str) -> str | None:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _natural_key(text: str) -> list[str | int]:
+    """Sorts "pin10" after "pin9"."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", text)]
+
+
+def _pin_numbers(handles: Iterable[str]) -> list[tuple[int, str]]:
+    """
+    Numbers the pins of a connector, returning (number, handle) pairs in
+    order. A numeric handle is the pin number itself; other handles get the
+    numbers after the highest one, in natural order.
+    """
+    ordered = sorted(handles, key=_natural_key)
+    numbers: dict[str, int] = {}
+    taken: set[int] = set()
+    for handle in ordered:
+        # A handle like "01" after "1" is numbered as a non-numeric one
+        if handle.isdigit() and int(handle) > 0 and int(handle) not in taken:
+            numbers[handle] = int(handle)
+            taken.add(int(handle))
+    number = max(taken, default=0)
+    for handle in ordered:
+        if handle not in numbers:
+            number += 1
+            numbers[handle] = number
+    return sorted((number, handle) for handle, number in numbers.items())
+
+
+def design_netlist(
+    design: HarnessDesign,
+) -> tuple[list[tuple[Node, list[tuple[int, str]]]], dict[tuple[str, str], str]]:
+    """
+    Returns each connector node with its numbered pins in order, as (number,
+    handle) pairs, and the net of every pin, keyed by (node id, handle). The
+    pins of a connector are the handles its edges end on; an edge end without
+    a handle gets a pin of its own. Nets are named after their first pin, as
+    "<connector label>-<pin number>".
+    """
+    connectors = {
+        node.id: node for node in design.nodes if node.type in CONNECTOR_NODE_TYPES
+    }
+    handles: dict[str, set[str]] = {node_id: set() for node_id in connectors}
+    nets: DisjointSet[tuple[str, str]] = DisjointSet()
+    for edge in design.edges:
+        ends = [
+            (node_id, handle or edge.id)
+            for node_id, handle in (
+                (edge.source, edge.sourceHandle),
+                (edge.target, edge.targetHandle),
+            )
+            if node_id in connectors
+        ]
+        for node_id, handle in ends:
+            handles[node_id].add(handle)
+            nets.add((node_id, handle))
+        if len(ends) == 2:
+            nets.union(*ends)
+
+    pins = [
+        (connectors[node_id], _pin_numbers(node_handles))
+        for node_id, node_handles in handles.items()
+    ]
+    labels = {
+        (node.id, handle): f"{node.data.label}-{number}"
+        for node, node_pins in pins
+        for number, handle in node_pins
+    }
+    net_names = {
+        root: min((labels[pin] for pin in members), key=_natural_key)
+        for root, members in nets.groups().items()
+    }
+    return pins, {pin: net_names[nets.find(pin)] for pin in labels}
 
 
 class KiCadEngineService:
@@ -12,99 +118,226 @@ class KiCadEngineService:
     A service to interact with KiCad CLI and kicad-sch-api.
     """
 
-    def __init__(self, cli_path: str):
+    def __init__(
+        self,
+        cli_path: str,
+        runner: KiCadCliRunner | None = None,
+        cache: ExportCache | None = None,
+        workspace: ScratchWorkspace | None = None,
+    ):
         """
         Initializes the KiCadEngineService.
 
         Args:
             cli_path: The full path to the kicad-cli executable.
+            runner: The runner executing kicad-cli commands. Defaults to the
+                process-wide runner of `cli_path`, which bounds the number of
+                concurrent kicad-cli processes.
+            cache: A cache for the generated files. Without one, every call
+                writes a new temporary file.
+            workspace: The scratch workspace of temporary files. Defaults to
+                the process-wide workspace.
         """
         self.cli_path = cli_path
+        self.runner = runner or get_runner(cli_path)
+        self.cache = cache
+        self.workspace = workspace or scratch_workspace
 
-    def generate_sch_from_json(self, design_data: HarnessDesign) -> str:
+    def generate_sch_from_json(
+        self,
+        design_data: HarnessDesign,
+        scope: ScratchScope | None = None,
+        pin_counts: Mapping[str, int] | None = None,
+    ) -> str:
         """
-        Generates a KiCad schematic file from JSON design data.
+        Generates a KiCad schematic file from JSON design data. Each
+        connector node is a generic connector symbol whose pins are numbered
+        after the handles the wires end on, and every wired pin gets a label
+        naming its net, so the edges are connected in the schematic's
+        netlist.
 
         Args:
             design_data: The Pydantic model of the design data.
+            scope: The scratch scope to write an uncached file to, removed
+                with it. Without one, the file is removed by age.
+            pin_counts: The catalog pin count of connector part numbers. A
+                symbol has as many pins as its part, or as the highest pin
+                number used if that is more or the part is unknown.
 
         Returns:
             The file path of the generated .kicad_sch file.
+
+        Raises:
+            InvalidHarnessDataException: If a connector has more pins than
+                any connector symbol.
         """
-        sch = ksa.Schematic()
-        for node in design_data.nodes:
-            if node.type == "connector":
-                # Using a simple component for demonstration in Cycle 1
+        pins, nets = design_netlist(design_data)
+        pin_counts = pin_counts or {}
+        sizes = []
+        for node, node_pins in pins:
+            part_number = node.data.part_number
+            size = max(
+                node_pins[-1][0] if node_pins else 1,
+                pin_counts.get(part_number, 0) if part_number else 0,
+            )
+            if size > MAX_CONNECTOR_PINS:
+                raise InvalidHarnessDataException(
+                    f"Connector {node.data.label} has {size} pins; "
+                    f"at most {MAX_CONNECTOR_PINS} are supported."
+                )
+            sizes.append(size)
+
+        def create(path: str) -> None:
+            # Symbols are looked up in the shared cache of parsed libraries
+            get_symbol_cache()
+            sch = ksa.Schematic()
+            x, y = COLUMN_WIDTH, COLUMN_TOP
+            for n, ((node, node_pins), size) in enumerate(zip(pins, sizes), 1):
+                height = size + 3
+                if y + height > COLUMN_HEIGHT and y > COLUMN_TOP:
+                    x, y = x + COLUMN_WIDTH, COLUMN_TOP
+                reference = f"J{n}"
                 sch.components.add(
-                    lib_id="Connector:Conn_01x02",
-                    ref=f"U{node.id}",
-                    unit=1,
-                    value="Conn",
+                    lib_id=f"Connector_Generic:Conn_01x{size:02d}",
+                    reference=reference,
+                    value=node.data.label,
+                    position=(round(x * GRID, 2), round(y * GRID, 2)),
                 )
+                for number, handle in node_pins:
+                    sch.add_label(nets[node.id, handle], pin=(reference, str(number)))
+                y += height
+            sch.save(path)
 
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=".kicad_sch", mode="w"
-        ) as temp_file:
-            sch.save(temp_file.name)
-            return temp_file.name
+        return self._output(
+            lambda: ("kicad_sch", design_data.model_dump(mode="json"), sizes),
+            ".kicad_sch",
+            create,
+            scope,
+        )
 
-    def export_dxf(self, sch_file_path: str) -> str:
+    def export_dxf(self, sch_file_path: str, scope: ScratchScope | None = None) -> str:
         """
         Exports a DXF file from a KiCad schematic file.
 
         Args:
             sch_file_path: The path to the .kicad_sch file.
+            scope: The scratch scope to write an uncached file to.
 
         Returns:
             The file path of the generated .dxf file.
         """
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".dxf") as temp_dxf_file:
-            temp_dxf_path = temp_dxf_file.name
-
-        cmd = [
-            self.cli_path,
-            "sch",
-            "export",
-            "dxf",
-            "--output",
-            temp_dxf_path,
-            sch_file_path,
-        ]
-        subprocess.run(cmd, check=True, capture_output=True)
-        return temp_dxf_path
 
-    def export_bom(self, sch_file_path: str) -> str:
+        def create(path: str) -> None:
+            self.runner.run(["sch", "export", "dxf", "--output", path, sch_file_path])
+
+        return self._output(
+            lambda: ("dxf", file_digest(sch_file_path)), ".dxf", create, scope
+        )
+
+    def export_bom(self, sch_file_path: str, scope: ScratchScope | None = None) -> str:
         """
         Exports a BOM file from a KiCad schematic file.
 
         Args:
             sch_file_path: The path to the .kicad_sch file.
+            scope: The scratch scope to write an uncached file to.
 
         Returns:
             The file path of the generated BOM file (e.g., .csv).
         """
-        # kicad-cli for bom export creates a file with a fixed name in the output dir
-        # Let's create a temporary directory to be sure about the output path
-        with tempfile.TemporaryDirectory() as temp_dir:
-            cmd = [
-                self.cli_path,
-                "sch",
-                "export",
-                "bom",
-                "--output-dir",
-                str(temp_dir),
-                sch_file_path,
-            ]
-            subprocess.run(cmd, check=True, capture_output=True)
-
-            # The output file name is based on the input sch file name
-            generated_bom_files = list(Path(temp_dir).glob("*.csv"))
-            if not generated_bom_files:
-                raise FileNotFoundError("BOM file was not generated by kicad-cli.")
-
-            # Move the generated file to a persistent temporary location
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=".csv"
-            ) as final_bom_file:
-                Path(generated_bom_files[0]).rename(final_bom_file.name)
-                return final_bom_file.name
+
+        def create(path: str) -> None:
+            # kicad-cli for bom export creates a file with a fixed name in the
+            # output dir, so run it in a scratch directory of its own
+            with self.workspace.scope() as bom_scope:
+                output_dir = bom_scope.new_dir()
+                args = [
+                    "sch",
+                    "export",
+                    "bom",
+                    "--output-dir",
+                    output_dir,
+                    sch_file_path,
+                ]
+                self.runner.run(args)
+
+                # The output file name is based on the input sch file name
+                generated_bom_files = list(Path(output_dir).glob("*.csv"))
+                if not generated_bom_files:
+                    raise FileNotFoundError("BOM file was not generated by kicad-cli.")
+                shutil.move(generated_bom_files[0], path)
+
+        return self._output(
+            lambda: ("bom", file_digest(sch_file_path)), ".csv", create, scope
+        )
+
+    def run_pipeline(
+        self,
+        design_data: HarnessDesign,
+        outputs: Iterable[str],
+        scope: ScratchScope | None = None,
+        pin_counts: Mapping[str, int] | None = None,
+    ) -> dict[str, str]:
+        """
+        Generates the schematic of a design once and exports each requested
+        output from it, running the kicad-cli exports concurrently.
+
+        Args:
+            design_data: The Pydantic model of the design data.
+            outputs: The outputs to export, from `PIPELINE_OUTPUTS`.
+            scope: The scratch scope to write uncached files to.
+            pin_counts: The catalog pin count of connector part numbers, see
+                `generate_sch_from_json`.
+
+        Returns:
+            The file paths of the schematic, under "kicad_sch", and of each
+            requested output, under its name.
+
+        Raises:
+            ValueError: If an output is unknown.
+        """
+        requested = list(dict.fromkeys(outputs))
+        unknown = [output for output in requested if output not in PIPELINE_OUTPUTS]
+        if unknown:
+            raise ValueError(f"Unknown outputs: {', '.join(unknown)}")
+
+        artifacts = {
+            "kicad_sch": self.generate_sch_from_json(design_data, scope, pin_counts)
+        }
+        if not requested:
+            return artifacts
+        exports = {"dxf": self.export_dxf, "bom": self.export_bom}
+        # The runner bounds the kicad-cli processes; these threads only wait
+        with ThreadPoolExecutor(max_workers=len(requested)) as executor:
+            futures = {
+                output: executor.submit(exports[output], artifacts["kicad_sch"], scope)
+                for output in requested
+            }
+        for output, future in futures.items():
+            artifacts[output] = future.result()
+        return artifacts
+
+    def _output(
+        self,
+        key: Callable[[], tuple[object, ...]],
+        suffix: str,
+        create: Callable[[str], None],
+        scope: ScratchScope | None = None,
+    ) -> str:
+        """
+        Returns the path of an output written by `create(path)`. With a cache,
+        outputs are keyed by what `key()` returns and the settings that shape
+        them, and only written on a miss. Without one, they are written to the
+        scratch workspace.
+        """
+        if self.cache is None:
+            path = (scope or self.workspace).new_file(suffix)
+            create(path)
+            return path
+
+        settings_key = {
+            "generator": GENERATOR_VERSION,
+            "kicad_cli": self.cli_path,
+            "kicad_sch_api": _package_version("kicad-sch-api"),
+        }
+        return self.cache.get_or_create(cache_key(*key(), settings_key), suffix, create)
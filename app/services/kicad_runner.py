@@ -0,0 +1,204 @@
+# app/services/kicad_runner.py
+
+"""
+KiCad CLI Runner
+
+Runs `kicad-cli` commands on a bounded pool of worker threads, one process per
+worker at most, so concurrent exports cannot fork an unbounded number of KiCad
+processes. Commands beyond the pool wait in a bounded queue; when the queue is
+full new commands are rejected at once with `KiCadBusyException`, which lets
+callers shed load instead of piling up.
+
+Each command has a timeout after which its process is killed. Commands can be
+awaited from async code with `run_async`; cancelling the awaiting task drops
+a queued command or kills a running one. Shutting the runner down stops every
+pending command, whose callers get a `CancelledError`.
+"""
+
+import asyncio
+import subprocess
+import threading
+from collections.abc import Sequence
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+from app.core.config import settings
+from app.exceptions import KiCadBusyException, KiCadTimeoutException
+
+
+class KiCadCliRunner:
+    def __init__(
+        self,
+        cli_path: str,
+        max_workers: int = 2,
+        queue_size: int = 8,
+        timeout: float = 120.0,
+    ):
+        self.cli_path = cli_path
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        # The threads are started on the first command and reused after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="kicad-cli"
+        )
+        self._lock = threading.Lock()
+        # Commands submitted and not finished, running or queued
+        self._pending = 0
+        self._futures: set[Future] = set()
+        self._closed = False
+        self._processes: dict[Future, subprocess.Popen] = {}
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(
+        self, args: Sequence[str], timeout: float | None = None
+    ) -> Future[subprocess.CompletedProcess]:
+        """
+        Queues `kicad-cli` with the given arguments and returns its future.
+        Raises `KiCadBusyException` when all workers are busy and the queue
+        is full.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_size:
+                raise KiCadBusyException(
+                    f"{self._pending} kicad-cli commands are already pending."
+                )
+            self._pending += 1
+            future: Future[subprocess.CompletedProcess] = Future()
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        try:
+            inner = self._executor.submit(
+                self._execute, future, [self.cli_path, *args], timeout or self.timeout
+            )
+        except BaseException:
+            self._release()
+            raise
+
+        def cancel_queued(f: Future) -> None:
+            if f.cancelled():
+                inner.cancel()
+
+        def release_cancelled(f: Future) -> None:
+            # A command cancelled before it started never reaches _execute
+            if f.cancelled():
+                self._release()
+
+        future.add_done_callback(cancel_queued)
+        inner.add_done_callback(release_cancelled)
+        return future
+
+    def run(
+        self, args: Sequence[str], timeout: float | None = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Runs `kicad-cli` and waits for it. Raises `CalledProcessError` if it
+        fails and `KiCadTimeoutException` if it does not finish in time.
+        """
+        return self.submit(args, timeout).result()
+
+    async def run_async(
+        self, args: Sequence[str], timeout: float | None = None
+    ) -> subprocess.CompletedProcess:
+        """Like `run`, but awaitable. Cancelling it stops the command."""
+        future = self.submit(args, timeout)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.cancel(future)
+            raise
+
+    def cancel(self, future: Future) -> None:
+        """Cancels a queued command or kills the process of a running one."""
+        if future.cancel():
+            return
+        with self._lock:
+            process = self._processes.get(future)
+        if process is not None:
+            process.kill()
+
+    def shutdown(self) -> None:
+        """
+        Kills running commands and drops queued ones. Both raise
+        `CancelledError` to their callers.
+        """
+        with self._lock:
+            self._closed = True
+            futures = list(self._futures)
+            processes = list(self._processes.values())
+        for future in futures:
+            # Only queued commands can be cancelled; running ones are killed
+            future.cancel()
+        for process in processes:
+            process.kill()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _execute(
+        self,
+        future: Future[subprocess.CompletedProcess],
+        cmd: list[str],
+        timeout: float,
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            self._release()
+            return
+        try:
+            result = self._communicate(future, cmd, timeout)
+        except BaseException as e:
+            # The place is freed before waiters are woken up
+            self._release()
+            future.set_exception(e)
+        else:
+            self._release()
+            future.set_result(result)
+
+    def _communicate(
+        self, future: Future, cmd: list[str], timeout: float
+    ) -> subprocess.CompletedProcess:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        with self._lock:
+            self._processes[future] = process
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise KiCadTimeoutException(
+                f"kicad-cli did not finish within {timeout} seconds."
+            )
+        finally:
+            with self._lock:
+                self._processes.pop(future, None)
+        if process.returncode and self._closed:
+            raise CancelledError("The kicad-cli runner was shut down.")
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+        return subprocess.CompletedProcess(cmd, 0, stdout, stderr)
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+_runners: dict[str, KiCadCliRunner] = {}
+_runners_lock = threading.Lock()
+
+
+def get_runner(cli_path: str) -> KiCadCliRunner:
+    """Returns the process-wide runner of a `kicad-cli` executable."""
+    with _runners_lock:
+        runner = _runners.get(cli_path)
+        if runner is None:
+            runner = _runners[cli_path] = KiCadCliRunner(
+                cli_path,
+                max_workers=settings.KICAD_MAX_WORKERS,
+                queue_size=settings.KICAD_QUEUE_SIZE,
+                timeout=settings.KICAD_TIMEOUT,
+            )
+        return runner
@@ -0,0 +1,238 @@
+# app/services/netlist.py
+
+"""
+Net Extraction
+
+A net is a set of pins that are electrically connected through wires. Nets
+are extracted from the pin pairs of the connections of a harness with a
+union-find (disjoint set) structure, using path compression and union by
+size, so building them is near-linear in the number of connections.
+
+`NetlistService` lists the nets and builds the topology of a stored harness
+from column queries; `HarnessTopology` summarizes pin usage and nets for the
+topology validation rules. `continuity_tests` turns nets into the pin pairs
+of an electrical test program.
+"""
+
+from collections import Counter, defaultdict
+from collections.abc import Hashable, Iterable, Iterator
+from itertools import combinations
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.exceptions import HarnessNotFoundException
+
+T = TypeVar("T", bound=Hashable)
+
+
+class DisjointSet(Generic[T]):
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self._parent: dict[T, T] = {}
+        self._size: dict[T, int] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: T) -> None:
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+
+    def find(self, item: T) -> T:
+        """Returns the representative of the set of an item, adding it if new."""
+        self.add(item)
+        root = item
+        while self._parent[root] != root:
+            root = self._parent[root]
+        # Path compression: point every item on the way at the root
+        while self._parent[item] != root:
+            self._parent[item], item = root, self._parent[item]
+        return root
+
+    def union(self, a: T, b: T) -> T:
+        """Merges the sets of two items and returns the new representative."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        # Union by size keeps the trees shallow
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        return root_a
+
+    def groups(self) -> dict[T, list[T]]:
+        """Returns the items of each set, keyed by representative."""
+        groups: dict[T, list[T]] = defaultdict(list)
+        for item in self._parent:
+            groups[self.find(item)].append(item)
+        return groups
+
+
+class HarnessTopology:
+    """Pin usage and nets of a harness, computed once for all its pins."""
+
+    def __init__(
+        self,
+        pin_connectors: Iterable[tuple[UUID, UUID]],
+        connections: Iterable[tuple[UUID, UUID]],
+    ) -> None:
+        """
+        Takes the (pin, connector) pairs of the harness and the
+        (from pin, to pin) pairs of its connections.
+        """
+        connector_of = self.connector_of = dict(pin_connectors)
+        self.nets: DisjointSet[UUID] = DisjointSet()
+        # Pins joined by wires between two pins of the same connector
+        self.jumpers: DisjointSet[UUID] = DisjointSet()
+        # Number of wire ends on each pin
+        self.usage: Counter[UUID] = Counter()
+        for from_pin_id, to_pin_id in connections:
+            # A wire looping back on its pin counts once; the loopback is
+            # reported on its own
+            self.usage.update({from_pin_id, to_pin_id})
+            self.nets.union(from_pin_id, to_pin_id)
+            from_connector = connector_of.get(from_pin_id)
+            if from_connector is not None and from_connector == connector_of.get(
+                to_pin_id
+            ):
+                self.jumpers.union(from_pin_id, to_pin_id)
+        self._connector_pins: dict[tuple[UUID, UUID], list[UUID]] = defaultdict(list)
+        for pin_id, connector_id in connector_of.items():
+            self._connector_pins[self.nets.find(pin_id), connector_id].append(pin_id)
+
+    def shorted_with(self, connector_id: UUID, pin_id: UUID) -> list[UUID]:
+        """
+        Returns the other pins of the same connector that share a net with a
+        pin without being jumpered to it. Pins joined by wires running
+        between pins of the connector itself are intended jumpers, and may
+        carry the net on to other connectors, as in a daisy chain.
+        """
+        jumper = self.jumpers.find(pin_id)
+        return [
+            other
+            for other in self._connector_pins[self.nets.find(pin_id), connector_id]
+            if other != pin_id and self.jumpers.find(other) != jumper
+        ]
+
+    def net_connectors(self, connector_ids: set[UUID]) -> set[UUID]:
+        """
+        Returns the connectors with a pin on any net of the pins of the given
+        connectors, the given ones included.
+        """
+        roots = {
+            self.nets.find(pin_id)
+            for pin_id, connector_id in self.connector_of.items()
+            if connector_id in connector_ids
+        }
+        return {
+            connector_id
+            for pin_id, connector_id in self.connector_of.items()
+            if self.nets.find(pin_id) in roots
+        }
+
+
+def build_nets(
+    pin_labels: dict[UUID, str], connections: Iterable[tuple[UUID, UUID, str]]
+) -> list[schemas.Net]:
+    """
+    Groups pins into nets from the (from pin, to pin, wire) triples of the
+    connections. Every pin is in exactly one net; pins without wires form
+    single-pin nets. Each net is named after its first pin.
+    """
+    nets: DisjointSet[UUID] = DisjointSet(pin_labels)
+    wires: dict[UUID, list[str]] = defaultdict(list)
+    ends: list[tuple[UUID, str]] = []
+    for from_pin_id, to_pin_id, wire in connections:
+        nets.union(from_pin_id, to_pin_id)
+        ends.append((from_pin_id, wire))
+    for pin_id, wire in ends:
+        wires[nets.find(pin_id)].append(wire)
+
+    result = []
+    for root, pin_ids in nets.groups().items():
+        pins = sorted(pin_labels.get(pin_id, str(pin_id)) for pin_id in pin_ids)
+        result.append(schemas.Net(name=pins[0], pins=pins, wires=sorted(wires[root])))
+    result.sort(key=lambda net: net.name)
+    return result
+
+
+def continuity_tests(nets: list[schemas.Net]) -> Iterator[tuple[str, ...]]:
+    """
+    Yields the pin pairs a continuity tester checks, as (test, pin, pin, net,
+    net) rows: every pair of pins within a net must be connected
+    ("CONTINUITY") and every pair of pins in different nets isolated
+    ("ISOLATION"). The pairs are generated lazily; only the pin list is held
+    in memory.
+    """
+    for net in nets:
+        for a, b in combinations(net.pins, 2):
+            yield "CONTINUITY", a, b, net.name, net.name
+
+    pins = [(pin, net.name) for net in nets for pin in net.pins]
+    end = 0
+    for net in nets:
+        # Pair each pin with the pins of all the nets after its own
+        end += len(net.pins)
+        for pin in net.pins:
+            for n in range(end, len(pins)):
+                other, other_net = pins[n]
+                yield "ISOLATION", pin, other, net.name, other_net
+
+
+class NetlistService:
+    def get_nets(self, db: Session, harness_id: UUID) -> list[schemas.Net]:
+        """Extracts the nets of a harness without loading its ORM graph."""
+        if db.get(models.Harness, harness_id) is None:
+            raise HarnessNotFoundException()
+
+        pin, connector = models.Pin, models.Connector
+        pins = db.execute(
+            select(pin.id, connector.logical_id, pin.logical_id)
+            .join(connector, connector.id == pin.connector_id)
+            .where(connector.harness_id == harness_id)
+        )
+        pin_labels = {
+            pin_id: f"{connector_label}-{pin_label}"
+            for pin_id, connector_label, pin_label in pins
+        }
+        connections = db.execute(
+            select(
+                models.Connection.from_pin_id,
+                models.Connection.to_pin_id,
+                models.Wire.logical_id,
+            )
+            .join(models.Wire, models.Wire.id == models.Connection.wire_id)
+            .where(models.Connection.harness_id == harness_id)
+        )
+        return build_nets(
+            pin_labels,
+            (
+                (from_pin_id, to_pin_id, wire_label)
+                for from_pin_id, to_pin_id, wire_label in connections
+            ),
+        )
+
+    def get_topology(self, db: Session, harness_id: UUID) -> HarnessTopology:
+        """Builds the topology of a harness without loading its ORM graph."""
+        pin, connector = models.Pin, models.Connector
+        pins = db.execute(
+            select(pin.id, pin.connector_id)
+            .join(connector, connector.id == pin.connector_id)
+            .where(connector.harness_id == harness_id)
+        )
+        connections = db.execute(
+            select(models.Connection.from_pin_id, models.Connection.to_pin_id).where(
+                models.Connection.harness_id == harness_id
+            )
+        )
+        return HarnessTopology(
+            ((pin_id, connector_id) for pin_id, connector_id in pins),
+            ((from_pin_id, to_pin_id) for from_pin_id, to_pin_id in connections),
+        )
+
+
+netlist_service = NetlistService()
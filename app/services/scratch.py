@@ -0,0 +1,231 @@
+# app/services/scratch.py
+
+"""
+Scratch Workspace
+
+Temporary files of the export paths are created in one managed directory
+instead of ad hoc temporary files. Files are handed out either from a scope,
+a per-request directory removed with everything in it when the scope exits,
+or directly from the workspace for files that must outlive the call that
+made them; those are removed by a sweep once they are older than the
+workspace's maximum age.
+
+The workspace refuses new files while the space in use is over its quota and
+keeps counters of what it created and released. The space in use is a
+running count rather than a walk of the workspace: the sweep measures what
+it keeps, releases subtract what was counted, and allocations re-measure
+only the active scopes and the unscoped files handed out since the sweep.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.exceptions import ScratchQuotaException
+
+
+@dataclass
+class ScratchMetrics:
+    active_scopes: int = 0
+    files_created: int = 0
+    bytes_in_use: int = 0
+    bytes_released: int = 0
+    quota_rejections: int = 0
+
+
+def _size(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
+
+
+class ScratchScope:
+    def __init__(self, workspace: "ScratchWorkspace", path: Path):
+        self.workspace = workspace
+        self.path = path
+
+    def new_file(self, suffix: str = "") -> str:
+        """Returns a new file path in the scope. The file is not created."""
+        return self.workspace._allocate(self.path, suffix)
+
+    def new_dir(self) -> str:
+        """Creates a directory in the scope and returns its path."""
+        path = Path(self.new_file())
+        path.mkdir()
+        return str(path)
+
+
+class ScratchWorkspace:
+    def __init__(self, root: str | Path, quota_bytes: int, max_age: float):
+        self.root = Path(root)
+        self.quota_bytes = quota_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._metrics = ScratchMetrics()
+        self._active: set[Path] = set()
+        self._last_sweep = 0.0
+        # Bytes counted per top-level entry of the workspace, and their total
+        self._sizes: dict[Path, int] = {}
+        self._bytes_in_use = 0
+        # Unscoped files handed out since the last sweep, by allocation time
+        self._recent: dict[Path, float] = {}
+
+    @contextmanager
+    def scope(self) -> Iterator[ScratchScope]:
+        """A directory for the files of one request, removed on exit."""
+        path = Path(self._allocate(self.root, ""))
+        path.mkdir()
+        with self._lock:
+            self._active.add(path)
+            self._recent.pop(path, None)
+            self._metrics.active_scopes += 1
+        try:
+            yield ScratchScope(self, path)
+        finally:
+            with self._lock:
+                self._active.discard(path)
+                self._metrics.active_scopes -= 1
+            self._remove(path)
+
+    def new_file(self, suffix: str = "") -> str:
+        """
+        Returns a new file path directly in the workspace, for files that
+        outlive the call creating them. They are removed by `sweep` once
+        older than `max_age`. The file is not created.
+        """
+        return self._allocate(self.root, suffix)
+
+    def sweep(self) -> int:
+        """
+        Removes the files and the directories of finished scopes older than
+        `max_age`, including those left by previous processes. Returns the
+        number of bytes released.
+        """
+        if not self.root.exists():
+            return 0
+        cutoff = time.time() - self.max_age
+        released = 0
+        kept: dict[Path, int] = {}
+        for path in self.root.iterdir():
+            with self._lock:
+                if path in self._active:
+                    continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    released += self._remove(path)
+                else:
+                    kept[path] = _size(path)
+            except FileNotFoundError:
+                continue
+
+        recent_cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            for path in list(self._sizes):
+                if path not in kept and path not in self._active:
+                    self._count(path, None)
+            for path, size in kept.items():
+                self._count(path, size)
+            # Files measured here are counted; those not written yet are
+            # re-measured until they are, or are too old to ever be
+            self._recent = {
+                path: allocated
+                for path, allocated in self._recent.items()
+                if path not in kept and allocated > recent_cutoff
+            }
+        return released
+
+    def usage(self) -> int:
+        """Bytes used by the files in the workspace, as last counted."""
+        with self._lock:
+            return self._bytes_in_use
+
+    def metrics(self) -> dict[str, Any]:
+        self._refresh()
+        with self._lock:
+            metrics = ScratchMetrics(**asdict(self._metrics))
+            metrics.bytes_in_use = self._bytes_in_use
+        return asdict(metrics)
+
+    def _allocate(self, directory: Path, suffix: str) -> str:
+        now = time.monotonic()
+        # Stale files are swept at most once a minute, on allocation
+        with self._lock:
+            sweep_due = now - self._last_sweep > 60
+            if sweep_due:
+                self._last_sweep = now
+        if sweep_due:
+            self.sweep()
+        self._refresh()
+        with self._lock:
+            over_quota = self._bytes_in_use >= self.quota_bytes
+            if over_quota:
+                self._metrics.quota_rejections += 1
+        if over_quota:
+            raise ScratchQuotaException(
+                f"Scratch space is over its quota of {self.quota_bytes} bytes."
+            )
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{uuid.uuid4().hex}{suffix}"
+        with self._lock:
+            self._metrics.files_created += 1
+            if directory == self.root:
+                self._recent[path] = now
+        return str(path)
+
+    def _refresh(self) -> None:
+        """
+        Re-measures the active scopes and the recent unscoped files, whose
+        contents may have grown since they were handed out.
+        """
+        with self._lock:
+            paths = [*self._active, *self._recent]
+        sizes: dict[Path, int] = {}
+        for path in paths:
+            try:
+                sizes[path] = _size(path)
+            except FileNotFoundError:
+                continue
+        with self._lock:
+            for path, size in sizes.items():
+                # Skips entries released while they were measured
+                if path in self._active or path in self._recent:
+                    self._count(path, size)
+
+    def _count(self, path: Path, size: int | None) -> None:
+        """
+        Sets the bytes counted for a top-level entry, or stops counting it
+        when `size` is None. Called with the lock held.
+        """
+        self._bytes_in_use += (size or 0) - self._sizes.pop(path, 0)
+        if size is not None:
+            self._sizes[path] = size
+
+    def _remove(self, path: Path) -> int:
+        try:
+            size = _size(path)
+        except FileNotFoundError:
+            return 0
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._metrics.bytes_released += size
+            self._count(path, None)
+            self._recent.pop(path, None)
+        return size
+
+
+scratch_workspace = ScratchWorkspace(
+    settings.SCRATCH_DIR or Path(tempfile.gettempdir()) / "harness-cad-scratch",
+    quota_bytes=settings.SCRATCH_QUOTA_BYTES,
+    max_age=settings.SCRATCH_MAX_AGE,
+)
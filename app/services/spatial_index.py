@@ -0,0 +1,49 @@
+# app/services/spatial_index.py
+
+"""
+Uniform grid index for snapping points to nearby targets.
+
+Targets are bucketed into square cells whose size equals the snap tolerance, so a
+radius query only has to inspect the 3x3 block of cells around the query point.
+Building the index is O(n) and each query is O(1) on average, which keeps
+matching all wire endpoints of a large drawing close to linear.
+"""
+
+import math
+from collections import defaultdict
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class GridIndex(Generic[T]):
+    def __init__(self, tolerance: float):
+        if tolerance <= 0:
+            raise ValueError("tolerance must be positive")
+        self.tolerance = tolerance
+        self._cells: dict[tuple[int, int], list[tuple[float, float, T]]] = defaultdict(
+            list
+        )
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.tolerance), math.floor(y / self.tolerance)
+
+    def insert(self, x: float, y: float, item: T) -> None:
+        """Adds an item located at (x, y) to the index."""
+        self._cells[self._cell(x, y)].append((x, y, item))
+
+    def nearest(self, x: float, y: float) -> T | None:
+        """
+        Returns the item closest to (x, y) within the tolerance, or None if no
+        item is close enough.
+        """
+        cx, cy = self._cell(x, y)
+        best: T | None = None
+        best_distance = self.tolerance
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for tx, ty, item in self._cells.get((cx + dx, cy + dy), ()):
+                    distance = math.hypot(tx - x, ty - y)
+                    if distance <= best_distance:
+                        best, best_distance = item, distance
+        return best
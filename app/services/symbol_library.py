@@ -0,0 +1,130 @@
+# app/services/symbol_library.py
+
+"""
+Symbol Library Cache
+
+kicad-sch-api looks symbols up in a process-wide cache, which loads a symbol
+on first use by reading and parsing the whole library file holding it, and
+parses the file again to resolve the parent of a derived symbol.
+Connector_Generic holds a Conn_01xNN symbol for every pin count, so a harness
+with many connector sizes had the library parsed once per size.
+
+`SymbolLibraryCache` keeps every library file it parses in memory, indexed by
+symbol name and invalidated when the file changes, so each library is parsed
+once per process. It also serializes symbol loads, which kicad-sch-api's
+cache does not, as schematics may be generated from several threads.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+
+import sexpdata
+from kicad_sch_api.library.cache import SymbolDefinition, set_symbol_cache
+from kicad_sch_api.library.cache import SymbolLibraryCache as _BaseCache
+
+logger = logging.getLogger(__name__)
+
+PROPERTY = sexpdata.Symbol("property")
+SYMBOL = sexpdata.Symbol("symbol")
+
+
+class SymbolLibraryCache(_BaseCache):
+    def __init__(self) -> None:
+        super().__init__(enable_persistence=False)
+        self._lock = threading.RLock()
+        # Symbols of each parsed library file by name, with the file's mtime
+        self._libraries: dict[Path, tuple[float, dict[str, list[Any]]]] = {}
+        self.parsed_files = 0
+
+    def get_symbol(self, lib_id: str) -> SymbolDefinition | None:
+        with self._lock:
+            return super().get_symbol(lib_id)
+
+    def library_symbols(self, library_path: Path) -> dict[str, list[Any]]:
+        """Returns the raw symbols of a library file, parsing it when changed."""
+        with self._lock:
+            mtime = library_path.stat().st_mtime
+            cached = self._libraries.get(library_path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            content = library_path.read_text(encoding="utf-8")
+            parsed = sexpdata.loads(content, true=None, false=None, nil=None)
+            symbols = {
+                str(item[1]).strip('"'): item
+                for item in parsed
+                if isinstance(item, list) and len(item) > 1 and item[0] == SYMBOL
+            }
+            self._libraries[library_path] = (mtime, symbols)
+            self.parsed_files += 1
+            return symbols
+
+    def _parse_kicad_symbol_file(
+        self, library_path: Path, lib_id: str
+    ) -> dict[str, Any] | None:
+        """
+        Extracts a symbol from the parsed library, as the base class does from
+        a fresh parse of the file. This overrides and mirrors a private method
+        of kicad-sch-api 0.5.6, which is why the dependency is pinned to 0.5.x.
+        """
+        try:
+            symbols = self.library_symbols(library_path)
+        except (OSError, ValueError) as e:
+            logger.error("Could not parse symbol library %s: %s", library_path, e)
+            return None
+
+        symbol_data = symbols.get(lib_id.split(":", 1)[1])
+        if symbol_data is None:
+            return None
+        extends = self._check_extends_directive(symbol_data)
+        if extends is not None and extends in symbols:
+            symbol_data = self._merge_parent_into_child(symbol_data, symbols[extends])
+            extends = None
+
+        result: dict[str, Any] = {
+            "raw_data": symbol_data,
+            "reference_prefix": "U",
+            "description": "",
+            "keywords": "",
+            "datasheet": "~",
+            "extends": extends,
+            "property_positions": {},
+        }
+        properties = {
+            "Reference": "reference_prefix",
+            "Description": "Description",
+            "ki_keywords": "keywords",
+            "Datasheet": "Datasheet",
+        }
+        for item in symbol_data[1:]:
+            if not (isinstance(item, list) and len(item) > 2 and item[0] == PROPERTY):
+                continue
+            name = str(item[1]).strip('"')
+            position = self._extract_property_position(item)
+            if position:
+                result["property_positions"][name] = position
+            if name in properties:
+                result[properties[name]] = str(item[2])
+        result["pins"] = self._extract_pins_from_symbol(symbol_data)
+        result["units"] = self._count_symbol_units(symbol_data)
+        return result
+
+
+_symbol_cache: SymbolLibraryCache | None = None
+_symbol_cache_lock = threading.Lock()
+
+
+def get_symbol_cache() -> SymbolLibraryCache:
+    """
+    Returns the process-wide symbol cache, discovering the installed KiCad
+    libraries and making it kicad-sch-api's cache on first use.
+    """
+    global _symbol_cache
+    with _symbol_cache_lock:
+        if _symbol_cache is None:
+            _symbol_cache = SymbolLibraryCache()
+            _symbol_cache.discover_libraries()
+            set_symbol_cache(_symbol_cache)
+        return _symbol_cache
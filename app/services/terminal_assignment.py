@@ -0,0 +1,114 @@
+# app/services/terminal_assignment.py
+
+"""
+Terminal Auto-Assignment
+
+Chooses a crimp terminal for each end of every connection in a harness from
+the wire gauge and the series of the mating connector. Candidates come from
+the compatibility index, whose (series, gauge) buckets expand each terminal's
+`applicable_wire_gauge_min`..`applicable_wire_gauge_max` interval, so every
+lookup is a dictionary hit. The tightest-fitting terminal is chosen.
+
+The harness is read with one column query and the choices are written back
+with one bulk UPDATE by primary key, so the cost grows with the number of
+connections but not with round trips to the database.
+"""
+
+from typing import Any, Literal
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, aliased
+
+from app import models, schemas
+from app.exceptions import HarnessNotFoundException
+from app.services.compatibility import CompatibilityService, compatibility_service
+from app.services.harness_service import harness_service
+
+
+class TerminalAssignmentService:
+    def __init__(self, compatibility: CompatibilityService):
+        self.compatibility = compatibility
+
+    def auto_assign(
+        self, db: Session, harness_id: UUID, overwrite: bool = False
+    ) -> schemas.TerminalAssignmentReport:
+        """
+        Assigns compatible terminals to the connection ends of a harness.
+        Ends that already have a terminal are kept unless `overwrite` is set.
+        Ends without a compatible terminal are reported as unresolved and left
+        unchanged.
+        """
+        if db.get(models.Harness, harness_id) is None:
+            raise HarnessNotFoundException()
+
+        connection = models.Connection
+        pin_a, pin_b = aliased(models.Pin), aliased(models.Pin)
+        connector_a, connector_b = aliased(models.Connector), aliased(models.Connector)
+        rows = db.execute(
+            select(
+                connection.id,
+                models.Wire.gauge,
+                connector_a.part_number,
+                connection.terminal_part_number_a,
+                connector_b.part_number,
+                connection.terminal_part_number_b,
+            )
+            .join(models.Wire, models.Wire.id == connection.wire_id)
+            .join(pin_a, pin_a.id == connection.from_pin_id)
+            .join(connector_a, connector_a.id == pin_a.connector_id)
+            .join(pin_b, pin_b.id == connection.to_pin_id)
+            .join(connector_b, connector_b.id == pin_b.connector_id)
+            .where(connection.harness_id == harness_id)
+        )
+
+        index = self.compatibility.get_index(db)
+        report = schemas.TerminalAssignmentReport()
+        updates: list[dict[str, Any]] = []
+        for (
+            connection_id,
+            gauge,
+            connector_part_number_a,
+            terminal_part_number_a,
+            connector_part_number_b,
+            terminal_part_number_b,
+        ) in rows:
+            ends: tuple[tuple[Literal["a", "b"], str, str | None], ...] = (
+                ("a", connector_part_number_a, terminal_part_number_a),
+                ("b", connector_part_number_b, terminal_part_number_b),
+            )
+            values: dict[str, Any] = {}
+            for side, connector_part_number, current in ends:
+                if current and not overwrite:
+                    report.kept += 1
+                    continue
+                suggestions = index.suggest_terminals(connector_part_number, gauge)
+                terminal = suggestions[0] if suggestions else None
+                if terminal is None:
+                    report.unresolved += 1
+                else:
+                    report.assigned += 1
+                    if terminal != current:
+                        values[f"terminal_part_number_{side}"] = terminal
+                report.assignments.append(
+                    schemas.TerminalAssignment(
+                        connection_id=connection_id,
+                        side=side,
+                        terminal_part_number=terminal,
+                    )
+                )
+            if values:
+                updates.append({"id": connection_id, **values})
+
+        if updates:
+            db.execute(update(connection), updates)
+            harness_service.record_change(
+                db, harness_id, {"connection": {u["id"] for u in updates}}
+            )
+        db.commit()
+        return report
+
+
+terminal_assignment_service = TerminalAssignmentService(
+    compatibility=compatibility_service
+)
@@ -1,274 +1,1088 @@
 # app/services/validator.py
-from typing import List
 
-from sqlalchemy.orm import Session
+"""
+Validation Service
+
+Checks a harness against the design rules and the project settings. Rules are
+registered in a `RuleRegistry`, each declaring the entity types it visits
+(connectors, wires or connections). A validation walks the harness once and
+hands every entity to the rules for its type, so adding a rule does not add a
+pass over the harness.
+
+Rules that are plain column predicates are registered with a SQL form
+(`where`). They are evaluated in the database, one query per entity type
+selecting only the offending rows, so checking them does not load the
+harness; their `check` only turns each matching row into errors. The harness
+graph is loaded only when some active rule has no SQL form.
+
+Topology rules work on the nets of the harness (see `app.services.netlist`):
+wires ending on the pin they start from, pins with several wire ends, pins
+without wires and pins of one connector shorted together.
+
+Errors are reported grouped by rule, in registration order. Projects can turn
+rules off by name (`ProjectSettings.disabled_rules`), and the service keeps
+per-rule timing counters to help find slow rules.
+
+Validation is incremental. Every edit of a harness bumps its revision and
+records the entities it added, changed or deleted (`HarnessChange`), and the
+errors found are kept per entity in a `ValidationSnapshot` of the harness.
+While the active rules, the project settings and the catalog are unchanged,
+the next validation re-checks only the changed entities and their neighbors
+(the connections on a changed wire or connector, the connectors at the ends
+of a changed connection), plus, for rules reading whole nets, the connectors
+on the nets the edits touched. Their new errors replace theirs in the
+snapshot; those of the other entities are kept. Results are ordered by rule,
+then by entity type and logical id, so they do not depend on which entities
+were re-checked.
+
+The snapshot also keeps the full result. While the harness revision, the
+active rules, the project settings and the catalog version are those it was
+taken with, a validation returns that result without loading the harness.
+"""
+
+import copy
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, List, Literal, NamedTuple
+
+from sqlalchemy import ColumnElement, Select, delete, inspect, literal, or_, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 
 from app import models
-from app.schemas.validation import ValidationError
-from app.services.catalog import catalog_service
+from app.core.config import settings as app_settings
+from app.schemas.validation import (
+    HarnessValidationResult,
+    ValidationError,
+    ValidationRule,
+)
+from app.services.compatibility import (
+    CompatibilityIndex,
+    CompatibilityService,
+    TerminalInfo,
+    compatibility_service,
+)
+from app.services.harness_service import harness_service
+from app.services.netlist import HarnessTopology, netlist_service
+
+logger = logging.getLogger(__name__)
+
+# Part of the context key of snapshots; bump it when the stored form of the
+# results changes
+SNAPSHOT_VERSION = 3
+
+EntityType = Literal["connector", "wire", "connection"]
+
+_ENTITY_TYPES: tuple[EntityType, ...] = ("connector", "wire", "connection")
+
+# Past this many changed entities, re-checking them one by one saves little
+# over a full validation and makes for long IN lists
+_MAX_CHANGED_ENTITIES = 900
+
+
+class ValidationContext:
+    """
+    What the rules of one validation share: the harness, the project settings
+    and catalog data that is looked up once, on first use, for the entities
+    checked.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        harness: models.Harness,
+        settings: models.ProjectSettings,
+        compatibility: CompatibilityService,
+    ):
+        self.db = db
+        self.harness = harness
+        self.settings = settings
+        self.compatibility = compatibility
+        # The connections the rules visit; all those of the harness when None
+        self.connections: Sequence[models.Connection] | None = None
+
+    @cached_property
+    def compatibility_index(self) -> CompatibilityIndex:
+        return self.compatibility.get_index(self.db)
+
+    @cached_property
+    def terminals(self) -> dict[str, TerminalInfo]:
+        """The terminals referenced by the connections, resolved in one batch."""
+        connections = self.connections
+        if connections is None:
+            connections = self.harness.connections
+        return self.compatibility.get_terminals(
+            self.db,
+            self.compatibility_index,
+            {
+                part_number
+                for conn in connections
+                for part_number in (
+                    conn.terminal_part_number_a,
+                    conn.terminal_part_number_b,
+                )
+                if part_number
+            },
+        )
+
+    @cached_property
+    def topology(self) -> HarnessTopology:
+        """The nets and pin usage of the harness, for the topology rules."""
+        return netlist_service.get_topology(self.db, self.harness.id)
+
+
+RuleCheck = Callable[[Any, ValidationContext], Iterable[ValidationError]]
+# Builds a SQL predicate matching the offending rows from the columns of an
+# entity source: the model class for connectors and wires, a
+# `ConnectionSource` for connections
+RulePredicate = Callable[[Any, models.ProjectSettings], ColumnElement[bool]]
+
+
+class ConnectionSource(NamedTuple):
+    """The tables a connection rule's predicate may read, joined per row."""
+
+    connection: Any
+    wire: Any
+    from_connector: Any
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    entity_types: tuple[EntityType, ...]
+    description: str
+    check: RuleCheck
+    # Skips the rule entirely for projects whose settings make it moot
+    applies: Callable[[models.ProjectSettings], bool]
+    # Whether the rule only reads an entity and its neighbors, so an edit only
+    # needs it re-checked for the changed entities and their neighbors. Other
+    # rules read the nets of the harness, and are re-checked for every
+    # connector on a net an edit touched
+    incremental: bool = True
+    # The SQL form of the rule. When set, `check` is only called with the
+    # result rows the predicate matched
+    where: RulePredicate | None = None
+
+
+@dataclass
+class RuleStats:
+    runs: int = 0
+    calls: int = 0
+    # Errors taken from the last snapshot, for entities not re-checked
+    reused: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+def _always(settings: models.ProjectSettings) -> bool:
+    return True
+
+
+class RuleRegistry:
+    def __init__(self) -> None:
+        self._rules: dict[str, Rule] = {}
+
+    def register(
+        self,
+        name: str,
+        *entity_types: EntityType,
+        description: str,
+        applies: Callable[[models.ProjectSettings], bool] | None = None,
+        incremental: bool = True,
+        where: RulePredicate | None = None,
+    ) -> Callable[[RuleCheck], RuleCheck]:
+        """
+        Decorator registering a check function as a rule. With `where`, the
+        rule is evaluated in SQL and the check reports the matching rows.
+        """
+
+        def decorator(check: RuleCheck) -> RuleCheck:
+            if name in self._rules:
+                raise ValueError(f"Validation rule '{name}' is already registered.")
+            if not incremental and (
+                where is not None or entity_types != ("connector",)
+            ):
+                raise ValueError(
+                    f"Validation rule '{name}' reads whole nets, so it must be a "
+                    "Python rule on connectors."
+                )
+            self._rules[name] = Rule(
+                name,
+                entity_types,
+                description,
+                check,
+                applies or _always,
+                incremental,
+                where,
+            )
+            return check
+
+        return decorator
+
+    def __iter__(self) -> Iterator[Rule]:
+        return iter(self._rules.values())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rules
+
+
+rules = RuleRegistry()
+
+
+def _component_error(
+    component: Any,
+    message: str,
+    error_type: str,
+    severity: Literal["error", "warning"] = "error",
+) -> ValidationError:
+    return ValidationError(
+        component_id=str(component.id),
+        component_type=type(component).__name__,
+        message=message,
+        error_type=error_type,
+        severity=severity,
+    )
+
+
+def _row_error(row: Any, message: str, error_type: str) -> ValidationError:
+    return ValidationError(
+        component_id=str(row.id),
+        component_type=row.component_type,
+        message=message,
+        error_type=error_type,
+    )
+
+
+# Specs every connector and wire needs for the other rules to be meaningful
+_REQUIRED_SPECS = {
+    models.Connector: (
+        "voltage_rating",
+        "applicable_wire_max_diameter",
+        "is_rohs",
+        "is_ul",
+    ),
+    models.Wire: ("voltage_rating", "outer_diameter", "is_rohs", "is_ul"),
+}
+
+
+@rules.register(
+    "missing_specs",
+    "connector",
+    "wire",
+    description="Connectors and wires have all the specs the other rules use.",
+    where=lambda model, settings: or_(
+        *(getattr(model, spec).is_(None) for spec in _REQUIRED_SPECS[model])
+    ),
+)
+def check_missing_specs(
+    row: Any, context: ValidationContext
+) -> Iterator[ValidationError]:
+    yield _row_error(
+        row,
+        f"{row.component_type} {row.logical_id} ({row.part_number}) has missing "
+        "technical specifications.",
+        "DataQualityError",
+    )
+
+
+@rules.register(
+    "voltage_rating",
+    "connector",
+    "wire",
+    description="Connectors and wires are rated for the system voltage.",
+    applies=lambda settings: bool(settings.system_voltage),
+    where=lambda model, settings: model.voltage_rating < settings.system_voltage,
+)
+def check_voltage_rating(
+    row: Any, context: ValidationContext
+) -> Iterator[ValidationError]:
+    yield _row_error(
+        row,
+        f"{row.component_type} {row.logical_id} voltage rating "
+        f"({row.voltage_rating}V) is less than system voltage "
+        f"({context.settings.system_voltage}V).",
+        "ElectricalError",
+    )
+
+
+@rules.register(
+    "rohs_compliance",
+    "connector",
+    "wire",
+    description="Connectors and wires are RoHS compliant when required.",
+    applies=lambda settings: bool(settings.require_rohs),
+    where=lambda model, settings: model.is_rohs.is_(False),
+)
+def check_rohs_compliance(
+    row: Any, context: ValidationContext
+) -> Iterator[ValidationError]:
+    yield _row_error(
+        row,
+        f"Component {row.logical_id} ({row.part_number}) is not RoHS compliant.",
+        "ComplianceError",
+    )
+
+
+@rules.register(
+    "wire_diameter",
+    "connection",
+    description="Wires fit the connector they start from.",
+    where=lambda source, settings: (
+        source.wire.outer_diameter > source.from_connector.applicable_wire_max_diameter
+    ),
+)
+def check_wire_diameter(
+    row: Any, context: ValidationContext
+) -> Iterator[ValidationError]:
+    yield _row_error(
+        row,
+        f"Wire {row.wire_logical_id} diameter ({row.outer_diameter}mm) exceeds "
+        f"max diameter for connector {row.connector_logical_id} "
+        f"({row.applicable_wire_max_diameter}mm).",
+        "PhysicalError",
+    )
+
+
+@rules.register(
+    "wire_loopback",
+    "connection",
+    description="Wires do not start and end on the same pin.",
+    where=lambda source, settings: (
+        source.connection.from_pin_id == source.connection.to_pin_id
+    ),
+)
+def check_wire_loopback(
+    row: Any, context: ValidationContext
+) -> Iterator[ValidationError]:
+    yield _row_error(
+        row,
+        f"Wire {row.wire_logical_id} starts and ends on pin "
+        f"{row.connector_logical_id}-{row.pin_logical_id}.",
+        "TopologyError",
+    )
+
+
+# Pin usage only depends on the connections on the pins of a connector, so
+# shared and floating pins are re-checked along with the connector; shorts
+# depend on whole nets
+
+
+@rules.register(
+    "shared_pins",
+    "connector",
+    description="Each pin terminates at most one wire end.",
+)
+def check_shared_pins(
+    connector: models.Connector, context: ValidationContext
+) -> Iterator[ValidationError]:
+    usage = context.topology.usage
+    for pin in connector.pins:
+        if usage[pin.id] > 1:
+            yield _component_error(
+                pin,
+                f"Pin {connector.logical_id}-{pin.logical_id} terminates "
+                f"{usage[pin.id]} wire ends.",
+                "TopologyWarning",
+                severity="warning",
+            )
+
+
+@rules.register(
+    "floating_pins",
+    "connector",
+    description="Every pin of a connector is wired.",
+)
+def check_floating_pins(
+    connector: models.Connector, context: ValidationContext
+) -> Iterator[ValidationError]:
+    usage = context.topology.usage
+    for pin in connector.pins:
+        if not usage[pin.id]:
+            yield _component_error(
+                pin,
+                f"Pin {connector.logical_id}-{pin.logical_id} is not connected "
+                "to any wire.",
+                "TopologyWarning",
+                severity="warning",
+            )
+
+
+@rules.register(
+    "connector_shorts",
+    "connector",
+    description=(
+        "Pins of a connector share a net only through jumper wires between "
+        "its own pins."
+    ),
+    incremental=False,
+)
+def check_connector_shorts(
+    connector: models.Connector, context: ValidationContext
+) -> Iterator[ValidationError]:
+    reported: set[uuid.UUID] = set()
+    for pin in connector.pins:
+        if pin.id in reported:
+            continue
+        shorted = context.topology.shorted_with(connector.id, pin.id)
+        if not shorted:
+            continue
+        group = {pin.id, *shorted}
+        reported |= group
+        pins = sorted(p.logical_id for p in connector.pins if p.id in group)
+        yield _component_error(
+            connector,
+            f"Pins {', '.join(pins)} of connector {connector.logical_id} are "
+            "shorted together through the harness.",
+            "TopologyError",
+        )
+
+
+def _sql_source(entity_type: EntityType) -> tuple[Select, Any, Any]:
+    """
+    Returns, for an entity type, the query selecting the columns its SQL rules
+    report from, the source their predicates read and the harness column.
+    """
+    if entity_type == "connection":
+        from_pin = aliased(models.Pin)
+        from_connector = aliased(models.Connector)
+        connection, wire = models.Connection, models.Wire
+        query = (
+            select(
+                connection.id,
+                literal("Connection").label("component_type"),
+                wire.logical_id.label("wire_logical_id"),
+                wire.outer_diameter,
+                from_connector.logical_id.label("connector_logical_id"),
+                from_connector.applicable_wire_max_diameter,
+                from_pin.logical_id.label("pin_logical_id"),
+            )
+            .join(wire, wire.id == connection.wire_id)
+            .join(from_pin, from_pin.id == connection.from_pin_id)
+            .join(from_connector, from_connector.id == from_pin.connector_id)
+            .order_by(wire.logical_id)
+        )
+        return (
+            query,
+            ConnectionSource(connection, wire, from_connector),
+            connection.harness_id,
+        )
+
+    model = models.Connector if entity_type == "connector" else models.Wire
+    query = select(
+        model.id,
+        literal(model.__name__).label("component_type"),
+        model.logical_id,
+        model.part_number,
+        *(getattr(model, spec) for spec in _REQUIRED_SPECS[model]),
+    ).order_by(model.logical_id)
+    return query, model, model.harness_id
+
+
+@rules.register(
+    "terminal_compatibility",
+    "connection",
+    description=(
+        "Terminals are in the catalog and fit the wire gauge and the series "
+        "of their connector."
+    ),
+)
+def check_terminal_compatibility(
+    connection: models.Connection, context: ValidationContext
+) -> Iterator[ValidationError]:
+    wire_gauge = connection.wire.gauge
+    for terminal_part_number, pin in (
+        (connection.terminal_part_number_a, connection.from_pin),
+        (connection.terminal_part_number_b, connection.to_pin),
+    ):
+        if not terminal_part_number:
+            continue
+        terminal = context.terminals.get(terminal_part_number)
+        if terminal is None:
+            yield _component_error(
+                connection,
+                f"Terminal {terminal_part_number} not found in catalog.",
+                "DataQualityError",
+            )
+            continue
+
+        index = context.compatibility_index
+        connector_part_number = pin.connector.part_number
+        suggestions = index.suggest_terminals(connector_part_number, wire_gauge)
+        hint = (
+            f" Compatible terminals: {', '.join(suggestions)}." if suggestions else ""
+        )
+
+        if not terminal.accepts_gauge(wire_gauge):
+            yield _component_error(
+                connection,
+                f"Wire gauge AWG{wire_gauge} is not compatible with terminal "
+                f"{terminal_part_number} (supports "
+                f"AWG{terminal.gauge_min}-{terminal.gauge_max}).{hint}",
+                "CompatibilityError",
+            )
+
+        connector_series = index.connector_series(connector_part_number)
+        if not terminal.fits_series(connector_series):
+            yield _component_error(
+                connection,
+                f"Terminal {terminal_part_number} is not compatible with "
+                f"connector series {connector_series}.{hint}",
+                "CompatibilityError",
+            )
+
+
+def _digest(value: object) -> str:
+    return hashlib.blake2b(repr(value).encode(), digest_size=16).hexdigest()
+
+
+def _entity_label(entity_type: EntityType, entity: Any) -> str:
+    """The logical id results are ordered by: a connection's is its wire's."""
+    label: str = (
+        entity.wire.logical_id if entity_type == "connection" else entity.logical_id
+    )
+    return label
+
+
+class _Results:
+    """
+    The errors found per entity, in the form snapshots store them: entity id
+    -> {"type": ..., "label": ..., "errors": {rule name: [error, ...]}}, for
+    the entities with errors only.
+    """
+
+    def __init__(self, entities: dict[str, Any] | None = None) -> None:
+        # A copy, as the entries of re-checked entities are replaced
+        self.entities: dict[str, Any] = copy.deepcopy(entities or {})
+
+    def add(
+        self,
+        entity_type: EntityType,
+        entity_id: uuid.UUID,
+        label: str,
+        rule: Rule,
+        errors: Iterable[ValidationError],
+    ) -> None:
+        found = [error.model_dump() for error in errors]
+        if found:
+            entry = self.entities.setdefault(
+                str(entity_id), {"type": entity_type, "label": label, "errors": {}}
+            )
+            entry["errors"].setdefault(rule.name, []).extend(found)
+
+    def discard(self, rule: Rule, entity_ids: Iterable[uuid.UUID]) -> None:
+        """Drops the errors of a rule for entities about to be re-checked."""
+        for entity_id in entity_ids:
+            entry = self.entities.get(str(entity_id))
+            if entry is None:
+                continue
+            entry["errors"].pop(rule.name, None)
+            if not entry["errors"]:
+                del self.entities[str(entity_id)]
+
+    def count(self, rule: Rule) -> int:
+        return sum(
+            len(entry["errors"].get(rule.name, ())) for entry in self.entities.values()
+        )
+
+    def collect(self, active: list[Rule]) -> list[ValidationError]:
+        """Returns the errors grouped by rule, then ordered by entity."""
+        entries = sorted(
+            self.entities.items(),
+            key=lambda item: (
+                _ENTITY_TYPES.index(item[1]["type"]),
+                item[1]["label"],
+                item[0],
+            ),
+        )
+        return [
+            ValidationError(**error)
+            for rule in active
+            for _, entry in entries
+            for error in entry["errors"].get(rule.name, ())
+        ]
 
 
 class ValidationService:
+    def __init__(
+        self,
+        registry: RuleRegistry = rules,
+        compatibility: CompatibilityService = compatibility_service,
+    ):
+        self.registry = registry
+        self.compatibility = compatibility
+        self._stats: dict[str, RuleStats] = defaultdict(RuleStats)
+        self._stats_lock = threading.Lock()
+
     def validate_harness(
         self,
         db: Session,
         harness: models.Harness,
         settings: models.ProjectSettings,
     ) -> List[ValidationError]:
-        errors: List[ValidationError] = []
-
-        # Rule 1: Data Quality - Check for missing specifications
-        for connector in harness.connectors:
-            if any(
-                spec is None
-                for spec in [
-                    connector.voltage_rating,
-                    connector.applicable_wire_max_diameter,
-                    connector.is_rohs,
-                    connector.is_ul,
-                ]
-            ):
-                errors.append(
-                    ValidationError(
-                        component_id=str(connector.id),
-                        component_type="Connector",
-                        message=(
-                            f"Connector {connector.logical_id} "
-                            f"({connector.part_number}) has missing "
-                            "technical specifications."
+        active = self.active_rules(settings)
+        context_key = self._context_key(db, settings, active)
+        snapshot = db.get(models.ValidationSnapshot, harness.id)
+        changed = None
+        if snapshot is not None and snapshot.context_key == context_key:
+            if snapshot.errors is not None and snapshot.revision == harness.revision:
+                return [ValidationError(**error) for error in snapshot.errors]
+            changed = self._changes_since(db, harness, snapshot.revision)
+
+        stats = {rule.name: RuleStats(runs=1) for rule in active}
+        if changed is None:
+            results = self._check_all(db, harness, settings, active, stats)
+        else:
+            assert snapshot is not None
+            results = self._check_changed(
+                db,
+                harness,
+                settings,
+                active,
+                stats,
+                _Results(snapshot.entities),
+                changed,
+            )
+
+        errors = results.collect(active)
+        self._save_snapshot(db, harness, snapshot, context_key, results, errors)
+
+        with self._stats_lock:
+            for rule in active:
+                rule_stats, total = stats[rule.name], self._stats[rule.name]
+                total.runs += rule_stats.runs
+                total.calls += rule_stats.calls
+                total.reused += rule_stats.reused
+                total.errors += results.count(rule)
+                total.seconds += rule_stats.seconds
+
+        return errors
+
+    def _check_all(
+        self,
+        db: Session,
+        harness: models.Harness,
+        settings: models.ProjectSettings,
+        active: list[Rule],
+        stats: dict[str, RuleStats],
+    ) -> _Results:
+        """Checks every entity of the harness."""
+        python_rules = [rule for rule in active if rule.where is None]
+        if python_rules and "connections" in inspect(harness).unloaded:
+            # Load the whole graph in one query rather than lazily per entity
+            harness = harness_service.get_harness(db, harness.id)
+        context = ValidationContext(db, harness, settings, self.compatibility)
+        attributes = {
+            "connector": "connectors",
+            "wire": "wires",
+            "connection": "connections",
+        }
+
+        results = _Results()
+        self._run_sql_rules(context, active, results, stats)
+        self._run_python_rules(
+            context,
+            python_rules,
+            # Only read when a rule checks them, as reading loads them
+            lambda entity_type: getattr(harness, attributes[entity_type]),
+            results,
+            stats,
+        )
+        return results
+
+    def _check_changed(
+        self,
+        db: Session,
+        harness: models.Harness,
+        settings: models.ProjectSettings,
+        active: list[Rule],
+        stats: dict[str, RuleStats],
+        results: _Results,
+        changed: dict[EntityType, set[uuid.UUID]],
+    ) -> _Results:
+        """
+        Re-checks the changed entities and their neighbors, and for rules
+        reading whole nets the connectors on the nets they touch, in place of
+        their errors in the results of the last snapshot.
+        """
+        context = ValidationContext(db, harness, settings, self.compatibility)
+        nearby = self._with_neighbors(db, harness.id, changed)
+        on_nets: set[uuid.UUID] = set()
+        if nearby["connector"] and not all(rule.incremental for rule in active):
+            on_nets = context.topology.net_connectors(nearby["connector"])
+
+        scopes: dict[str, dict[EntityType, set[uuid.UUID]]] = {}
+        for rule in active:
+            scope = scopes[rule.name] = dict(nearby)
+            if not rule.incremental:
+                scope["connector"] = nearby["connector"] | on_nets
+            results.discard(
+                rule, (entity_id for t in rule.entity_types for entity_id in scope[t])
+            )
+            stats[rule.name].reused = results.count(rule)
+
+        python_rules = [rule for rule in active if rule.where is None]
+        entities = self._load_entities(
+            db,
+            {
+                entity_type: {
+                    entity_id
+                    for rule in python_rules
+                    if entity_type in rule.entity_types
+                    for entity_id in scopes[rule.name][entity_type]
+                }
+                for entity_type in _ENTITY_TYPES
+            },
+        )
+        context.connections = entities["connection"]
+
+        self._run_sql_rules(context, active, results, stats, nearby)
+        self._run_python_rules(
+            context, python_rules, entities.__getitem__, results, stats, scopes
+        )
+        return results
+
+    @staticmethod
+    def _changes_since(
+        db: Session, harness: models.Harness, revision: int
+    ) -> dict[EntityType, set[uuid.UUID]] | None:
+        """
+        Returns the ids of the entities changed since a revision of the
+        harness, or None when some edit was not recorded or they are too many
+        to re-check one by one.
+        """
+        change = models.HarnessChange
+        recorded = db.scalars(
+            select(change.entities).where(
+                change.harness_id == harness.id,
+                change.revision > revision,
+                change.revision <= harness.revision,
+            )
+        ).all()
+        if len(recorded) != harness.revision - revision:
+            return None
+        changed: dict[EntityType, set[uuid.UUID]] = {t: set() for t in _ENTITY_TYPES}
+        for entities in recorded:
+            for entity_type in _ENTITY_TYPES:
+                changed[entity_type].update(
+                    uuid.UUID(entity_id) for entity_id in entities.get(entity_type, ())
+                )
+        if sum(len(ids) for ids in changed.values()) > _MAX_CHANGED_ENTITIES:
+            return None
+        return changed
+
+    @staticmethod
+    def _with_neighbors(
+        db: Session, harness_id: uuid.UUID, changed: dict[EntityType, set[uuid.UUID]]
+    ) -> dict[EntityType, set[uuid.UUID]]:
+        """
+        Adds to the changed entities the neighbors whose results they affect:
+        the connections on a changed wire or on a pin of a changed connector,
+        and the connectors at the ends of a changed connection.
+        """
+        connection, pin = models.Connection, models.Pin
+        connectors = set(changed["connector"])
+        connections = set(changed["connection"])
+        if changed["wire"] or changed["connector"]:
+            changed_pins = select(pin.id).where(
+                pin.connector_id.in_(changed["connector"])
+            )
+            connections.update(
+                db.scalars(
+                    select(connection.id).where(
+                        connection.harness_id == harness_id,
+                        or_(
+                            connection.wire_id.in_(changed["wire"]),
+                            connection.from_pin_id.in_(changed_pins),
+                            connection.to_pin_id.in_(changed_pins),
                         ),
-                        error_type="DataQualityError",
                     )
                 )
-
-        for wire in harness.wires:
-            if any(
-                spec is None
-                for spec in [
-                    wire.voltage_rating,
-                    wire.outer_diameter,
-                    wire.is_rohs,
-                    wire.is_ul,
-                ]
-            ):
-                errors.append(
-                    ValidationError(
-                        component_id=str(wire.id),
-                        component_type="Wire",
-                        message=(
-                            f"Wire {wire.logical_id} ({wire.part_number}) has "
-                            "missing technical specifications."
+            )
+        if changed["connection"]:
+            # Deleted connections are gone; their edit recorded their ends
+            connectors.update(
+                db.scalars(
+                    select(pin.connector_id)
+                    .join(
+                        connection,
+                        or_(
+                            connection.from_pin_id == pin.id,
+                            connection.to_pin_id == pin.id,
                         ),
-                        error_type="DataQualityError",
                     )
+                    .where(connection.id.in_(changed["connection"]))
                 )
+            )
+        return {
+            "connector": connectors,
+            "wire": set(changed["wire"]),
+            "connection": connections,
+        }
 
-        # Rule 2: Electrical - Check voltage ratings
-        if settings.system_voltage:
-            for connector in harness.connectors:
-                if (
-                    connector.voltage_rating is not None
-                    and connector.voltage_rating < settings.system_voltage
-                ):
-                    errors.append(
-                        ValidationError(
-                            component_id=str(connector.id),
-                            component_type="Connector",
-                            message=(
-                                f"Connector {connector.logical_id} voltage rating "
-                                f"({connector.voltage_rating}V) is less than "
-                                f"system voltage ({settings.system_voltage}V)."
-                            ),
-                            error_type="ElectricalError",
-                        )
-                    )
-            for wire in harness.wires:
-                if (
-                    wire.voltage_rating is not None
-                    and wire.voltage_rating < settings.system_voltage
-                ):
-                    errors.append(
-                        ValidationError(
-                            component_id=str(wire.id),
-                            component_type="Wire",
-                            message=(
-                                f"Wire {wire.logical_id} voltage rating "
-                                f"({wire.voltage_rating}V) is less than system "
-                                f"voltage ({settings.system_voltage}V)."
-                            ),
-                            error_type="ElectricalError",
-                        )
-                    )
+    @staticmethod
+    def _load_entities(
+        db: Session, ids: dict[EntityType, set[uuid.UUID]]
+    ) -> dict[EntityType, Sequence[Any]]:
+        """Loads the given entities with the neighbors the rules read."""
+        connector, wire = models.Connector, models.Wire
+        connection, pin = models.Connection, models.Pin
+        queries: dict[EntityType, Select] = {
+            "connector": select(connector)
+            .where(connector.id.in_(ids["connector"]))
+            .options(selectinload(connector.pins)),
+            "wire": select(wire).where(wire.id.in_(ids["wire"])),
+            "connection": select(connection)
+            .where(connection.id.in_(ids["connection"]))
+            .options(
+                joinedload(connection.wire),
+                joinedload(connection.from_pin).joinedload(pin.connector),
+                joinedload(connection.to_pin).joinedload(pin.connector),
+            ),
+        }
+        return {
+            entity_type: db.scalars(query).all() if ids[entity_type] else []
+            for entity_type, query in queries.items()
+        }
 
-        # Rule 3: Compliance - Check RoHS and UL standards
-        if settings.require_rohs:
-            for component in harness.connectors + harness.wires:
-                if component.is_rohs is False:
-                    errors.append(
-                        ValidationError(
-                            component_id=str(component.id),
-                            component_type=type(component).__name__,
-                            message=(
-                                f"Component {component.logical_id} "
-                                f"({component.part_number}) is not RoHS "
-                                "compliant."
-                            ),
-                            error_type="ComplianceError",
-                        )
-                    )
+    @staticmethod
+    def _run_python_rules(
+        context: ValidationContext,
+        python_rules: list[Rule],
+        entities_of: Callable[[EntityType], Iterable[Any]],
+        results: _Results,
+        stats: dict[str, RuleStats],
+        scopes: dict[str, dict[EntityType, set[uuid.UUID]]] | None = None,
+    ) -> None:
+        """
+        Hands each entity to the rules for its type, or with `scopes` to the
+        rules whose scope includes it.
+        """
+        for entity_type in _ENTITY_TYPES:
+            entity_rules = [r for r in python_rules if entity_type in r.entity_types]
+            if not entity_rules:
+                continue
+            for entity in entities_of(entity_type):
+                label = _entity_label(entity_type, entity)
+                for rule in entity_rules:
+                    if scopes is not None and (
+                        entity.id not in scopes[rule.name][entity_type]
+                    ):
+                        continue
+                    rule_stats = stats[rule.name]
+                    start = time.perf_counter()
+                    errors = list(rule.check(entity, context))
+                    rule_stats.seconds += time.perf_counter() - start
+                    rule_stats.calls += 1
+                    results.add(entity_type, entity.id, label, rule, errors)
 
-        # Rule 4: Physical - Check wire diameter vs. connector capacity
-        for connection in harness.connections:
-            wire = connection.wire
-            from_connector = connection.from_pin.connector
+    @staticmethod
+    def _run_sql_rules(
+        context: ValidationContext,
+        active: list[Rule],
+        results: _Results,
+        stats: dict[str, RuleStats],
+        scope: dict[EntityType, set[uuid.UUID]] | None = None,
+    ) -> None:
+        """
+        Evaluates the rules with a SQL form, one query per entity type that
+        selects the rows matching any of their predicates, with one flag per
+        rule, among the entities in `scope` if given. The query time is
+        shared evenly by its rules.
+        """
+        sql_rules = [rule for rule in active if rule.where is not None]
+        for entity_type in _ENTITY_TYPES:
+            entity_rules = [r for r in sql_rules if entity_type in r.entity_types]
+            if not entity_rules or (scope is not None and not scope[entity_type]):
+                continue
+            query, source, harness_column = _sql_source(entity_type)
+            predicates = [
+                rule.where(source, context.settings)
+                for rule in entity_rules
+                if rule.where is not None
+            ]
+            query = query.add_columns(
+                *(p.label(f"rule_{n}") for n, p in enumerate(predicates))
+            ).where(harness_column == context.harness.id, or_(*predicates))
+            if scope is not None:
+                # The entity id is the first column of every source
+                query = query.where(query.selected_columns[0].in_(scope[entity_type]))
 
-            if (
-                wire.outer_diameter is not None
-                and from_connector.applicable_wire_max_diameter is not None
-                and wire.outer_diameter > from_connector.applicable_wire_max_diameter
-            ):
-                errors.append(
-                    ValidationError(
-                        component_id=str(connection.id),
-                        component_type="Connection",
-                        message=(
-                            f"Wire {wire.logical_id} diameter "
-                            f"({wire.outer_diameter}mm) exceeds max "
-                            f"diameter for connector "
-                            f"{from_connector.logical_id} "
-                            f"({from_connector.applicable_wire_max_diameter}mm)."
-                        ),
-                        error_type="PhysicalError",
-                    )
+            start = time.perf_counter()
+            rows = context.db.execute(query).all()
+            share = (time.perf_counter() - start) / len(entity_rules)
+            for rule in entity_rules:
+                stats[rule.name].seconds += share
+
+            for row in rows:
+                flags = row[-len(entity_rules) :]
+                label = (
+                    row.wire_logical_id
+                    if entity_type == "connection"
+                    else row.logical_id
                 )
+                for rule, flagged in zip(entity_rules, flags):
+                    if not flagged:
+                        continue
+                    start = time.perf_counter()
+                    errors = list(rule.check(row, context))
+                    rule_stats = stats[rule.name]
+                    rule_stats.seconds += time.perf_counter() - start
+                    rule_stats.calls += 1
+                    results.add(entity_type, row.id, label, rule, errors)
 
-        # Rule 5: Terminal Compatibility
-        for conn in harness.connections:
-            wire_gauge = conn.wire.gauge
+    def _context_key(
+        self, db: Session, settings: models.ProjectSettings, active: list[Rule]
+    ) -> str:
+        """Digest of everything besides the harness that rule results depend on."""
+        return _digest(
+            (
+                SNAPSHOT_VERSION,
+                [rule.name for rule in active],
+                settings.system_voltage,
+                bool(settings.require_rohs),
+                bool(settings.require_ul),
+                self.compatibility.catalog.get_version(db),
+            )
+        )
 
-            # Check terminal on side A
-            if conn.terminal_part_number_a:
-                terminal_a_spec = catalog_service.get_specification(
-                    conn.terminal_part_number_a
+    @staticmethod
+    def _save_snapshot(
+        db: Session,
+        harness: models.Harness,
+        snapshot: models.ValidationSnapshot | None,
+        context_key: str,
+        results: _Results,
+        errors: list[ValidationError],
+    ) -> None:
+        """
+        Saves the snapshot in a short-lived session of its own, leaving the
+        caller's session and its pending changes alone, and drops the change
+        records it covers.
+        """
+        with Session(db.get_bind()) as snapshot_db:
+            saved = snapshot_db.get(models.ValidationSnapshot, harness.id)
+            if saved is None:
+                saved = models.ValidationSnapshot(harness_id=harness.id)
+                snapshot_db.add(saved)
+            saved.revision = harness.revision
+            saved.context_key = context_key
+            saved.entities = results.entities
+            saved.errors = [error.model_dump() for error in errors]
+            change = models.HarnessChange
+            snapshot_db.execute(
+                delete(change).where(
+                    change.harness_id == harness.id,
+                    change.revision <= harness.revision,
                 )
-                if not terminal_a_spec:
-                    errors.append(
-                        ValidationError(
-                            component_id=str(conn.id),
-                            component_type="Connection",
-                            message=f"Terminal {conn.terminal_part_number_a} "
-                            "not found in catalog.",
-                            error_type="DataQualityError",
-                        )
-                    )
-                else:
-                    # 1. Wire gauge check
-                    min_gauge = terminal_a_spec.get("applicable_wire_gauge_min")
-                    max_gauge = terminal_a_spec.get("applicable_wire_gauge_max")
-                    if not (
-                        min_gauge is not None
-                        and max_gauge is not None
-                        and min_gauge <= wire_gauge <= max_gauge
-                    ):
-                        errors.append(
-                            ValidationError(
-                                component_id=str(conn.id),
-                                component_type="Connection",
-                                message=(
-                                    f"Wire gauge AWG{wire_gauge} is not "
-                                    f"compatible with terminal "
-                                    f"{conn.terminal_part_number_a} (supports "
-                                    f"AWG{min_gauge}-{max_gauge})."
-                                ),
-                                error_type="CompatibilityError",
-                            )
-                        )
+            )
+            try:
+                snapshot_db.commit()
+            except (IntegrityError, OperationalError):
+                # Saved first by a concurrent validation, or the harness is
+                # locked by an uncommitted write; the next run saves it
+                snapshot_db.rollback()
+        if snapshot is not None:
+            # Reloaded from the saved row on next access
+            db.expire(snapshot)
 
-                    # 2. Connector series check
-                    connector_a_series = conn.from_pin.connector.part_number.split("-")[
-                        0
-                    ]
-                    compatible_series = terminal_a_spec.get(
-                        "compatible_connector_series"
-                    )
-                    if (
-                        compatible_series
-                        and connector_a_series not in compatible_series
-                    ):
-                        errors.append(
-                            ValidationError(
-                                component_id=str(conn.id),
-                                component_type="Connection",
-                                message=(
-                                    f"Terminal {conn.terminal_part_number_a} "
-                                    f"is not compatible with connector series "
-                                    f"{connector_a_series}."
-                                ),
-                                error_type="CompatibilityError",
-                            )
-                        )
+    def validate_harnesses(
+        self,
+        session_factory: Callable[[], Session],
+        harness_ids: Sequence[uuid.UUID],
+        settings: models.ProjectSettings,
+        max_workers: int | None = None,
+    ) -> Iterator[HarnessValidationResult]:
+        """
+        Validates harnesses concurrently in a thread pool, each in its own
+        session, and yields each result as soon as it is ready. The settings
+        are read once, up front, so the caller's session may be closed while
+        the results are consumed.
+        """
+        # A detached copy the worker threads can share
+        shared_settings = models.ProjectSettings(
+            system_voltage=settings.system_voltage,
+            require_rohs=settings.require_rohs,
+            require_ul=settings.require_ul,
+            disabled_rules=list(settings.disabled_rules or ()),
+        )
+        workers = max_workers or app_settings.VALIDATION_MAX_WORKERS
+        return self._stream_results(
+            session_factory, list(harness_ids), shared_settings, workers
+        )
 
-            # Check terminal on side B
-            if conn.terminal_part_number_b:
-                terminal_b_spec = catalog_service.get_specification(
-                    conn.terminal_part_number_b
-                )
-                if not terminal_b_spec:
-                    errors.append(
-                        ValidationError(
-                            component_id=str(conn.id),
-                            component_type="Connection",
-                            message=f"Terminal {conn.terminal_part_number_b} "
-                            "not found in catalog.",
-                            error_type="DataQualityError",
-                        )
+    def _stream_results(
+        self,
+        session_factory: Callable[[], Session],
+        harness_ids: list[uuid.UUID],
+        settings: models.ProjectSettings,
+        workers: int,
+    ) -> Iterator[HarnessValidationResult]:
+        def validate_one(harness_id: uuid.UUID) -> HarnessValidationResult:
+            with session_factory() as db:
+                harness = db.get(models.Harness, harness_id)
+                if harness is None:
+                    return HarnessValidationResult(
+                        harness_id=harness_id, failure="Harness not found"
                     )
-                else:
-                    # 1. Wire gauge check
-                    min_gauge = terminal_b_spec.get("applicable_wire_gauge_min")
-                    max_gauge = terminal_b_spec.get("applicable_wire_gauge_max")
-                    if not (
-                        min_gauge is not None
-                        and max_gauge is not None
-                        and min_gauge <= wire_gauge <= max_gauge
-                    ):
-                        errors.append(
-                            ValidationError(
-                                component_id=str(conn.id),
-                                component_type="Connection",
-                                message=(
-                                    f"Wire gauge AWG{wire_gauge} is not "
-                                    f"compatible with terminal "
-                                    f"{conn.terminal_part_number_b} (supports "
-                                    f"AWG{min_gauge}-{max_gauge})."
-                                ),
-                                error_type="CompatibilityError",
-                            )
-                        )
+                name = harness.name
+                errors = self.validate_harness(db, harness, settings)
+                return HarnessValidationResult(
+                    harness_id=harness_id, name=name, errors=errors
+                )
 
-                    # 2. Connector series check
-                    connector_b_series = conn.to_pin.connector.part_number.split("-")[0]
-                    compatible_series = terminal_b_spec.get(
-                        "compatible_connector_series"
-                    )
-                    if (
-                        compatible_series
-                        and connector_b_series not in compatible_series
-                    ):
-                        errors.append(
-                            ValidationError(
-                                component_id=str(conn.id),
-                                component_type="Connection",
-                                message=(
-                                    f"Terminal {conn.terminal_part_number_b} "
-                                    f"is not compatible with connector series "
-                                    f"{connector_b_series}."
-                                ),
-                                error_type="CompatibilityError",
-                            )
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(harness_ids)))
+        )
+        pending: dict[Future[HarnessValidationResult], uuid.UUID] = {
+            executor.submit(validate_one, harness_id): harness_id
+            for harness_id in harness_ids
+        }
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    harness_id = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        logger.exception("Validation of harness %s failed", harness_id)
+                        yield HarnessValidationResult(
+                            harness_id=harness_id, failure=str(e)
                         )
+        finally:
+            # Stops queued validations if the consumer goes away early
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        return errors
+    def active_rules(self, settings: models.ProjectSettings) -> list[Rule]:
+        """Returns the rules that run for a project, in registration order."""
+        disabled = set(settings.disabled_rules or ())
+        return [
+            rule
+            for rule in self.registry
+            if rule.name not in disabled and rule.applies(settings)
+        ]
+
+    def describe_rules(self) -> list[ValidationRule]:
+        """Lists the registered rules with their cumulative timing counters."""
+        with self._stats_lock:
+            stats = {name: RuleStats(**vars(s)) for name, s in self._stats.items()}
+        return [
+            ValidationRule(
+                name=rule.name,
+                entity_types=list(rule.entity_types),
+                description=rule.description,
+                **vars(stats.get(rule.name, RuleStats())),
+            )
+            for rule in self.registry
+        ]
 
 
 validation_service = ValidationService()
@@ -1,27 +1,44 @@
 import React, { useEffect, useState } from 'react';
-import { getComponents, type LibraryComponent } from '../services/api';
+import { searchComponents, type LibraryComponent } from '../services/api';
 import useHarnessStore from '../stores/useHarnessStore';
 import { API_BASE_URL } from '../services/api';
 import Button from './ui/Button'; // Import the new Button component
+import Input from './ui/Input';
 
 import WizardModal from './WizardModal';
 
+// Delay before a search request is sent, so typing does not flood the API
+const SEARCH_DEBOUNCE_MS = 250;
+
 const Sidebar: React.FC = () => {
   const [components, setComponents] = useState<LibraryComponent[]>([]);
+  const [total, setTotal] = useState(0);
+  const [query, setQuery] = useState('');
   const [isWizardOpen, setIsWizardOpen] = useState(false);
   const { harnessId } = useHarnessStore();
 
   useEffect(() => {
-    const fetchComponents = async () => {
+    let cancelled = false;
+    const timer = setTimeout(async () => {
       try {
-        const componentList = await getComponents();
-        setComponents(componentList);
+        const result = await searchComponents({
+          q: query.trim() || undefined,
+          type: 'connector',
+        });
+        // Ignore responses to queries that have since been replaced
+        if (!cancelled) {
+          setComponents(result.items);
+          setTotal(result.total);
+        }
       } catch (error) {
         console.error('Failed to fetch components:', error);
       }
+    }, query ? SEARCH_DEBOUNCE_MS : 0);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
     };
-    fetchComponents();
-  }, []);
+  }, [query]);
 
   const onDragStart = (event: React.DragEvent, component: LibraryComponent) => {
     event.dataTransfer.setData('application/reactflow-type', 'customConnector');
@@ -43,20 +60,33 @@ const Sidebar: React.FC = () => {
           </Button>
         </div>
 
-        <div className="flex-grow">
-          {components
-            .filter((c) => c.type === 'connector')
-            .map((component) => (
-              <div
-                key={component.id}
-                className="cursor-grab bg-white text-black font-pixel border-2 border-pixel-border p-3 shadow-pixel-sm hover:shadow-pixel hover:translate-x-[-2px] hover:translate-y-[-2px] transition-all mb-3"
-                onDragStart={(event) => onDragStart(event, component)}
-                draggable
-                data-testid={`component-${component.name}`}
-              >
-                {component.name}
-              </div>
-            ))}
+        <div className="mb-4">
+          <Input
+            type="search"
+            placeholder="Search parts..."
+            value={query}
+            onChange={(e) => setQuery(e.target.value)}
+            data-testid="component-search"
+          />
+        </div>
+
+        <div className="flex-grow overflow-y-auto">
+          {components.map((component) => (
+            <div
+              key={component.id}
+              className="cursor-grab bg-white text-black font-pixel border-2 border-pixel-border p-3 shadow-pixel-sm hover:shadow-pixel hover:translate-x-[-2px] hover:translate-y-[-2px] transition-all mb-3"
+              onDragStart={(event) => onDragStart(event, component)}
+              draggable
+              data-testid={`component-${component.name}`}
+            >
+              {component.name}
+            </div>
+          ))}
+          {total > components.length && (
+            <p className="text-sm font-pixel text-gray-400">
+              Showing {components.length} of {total}. Refine the search to see more.
+            </p>
+          )}
         </div>
         <div className="flex flex-col space-y-3">
           <h3 className="text-xl font-pixel font-bold mb-2 text-white uppercase tracking-wider">Exports</h3>
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { v4 as uuidv4 } from 'uuid';
 import useHarnessStore from '../stores/useHarnessStore';
-import { getComponents, type LibraryComponent } from '../services/api';
+import { searchComponents, type LibraryComponent } from '../services/api';
 import Button from './ui/Button';
 import Input from './ui/Input';
 
@@ -22,8 +22,8 @@ const WizardModal: React.FC<WizardModalProps> = ({ isOpen, onClose }) => {
     useEffect(() => {
         const fetchComponents = async () => {
             try {
-                const components = await getComponents();
-                setAvailableConnectors(components.filter(c => c.type === 'connector'));
+                const result = await searchComponents({ type: 'connector', page_size: 200 });
+                setAvailableConnectors(result.items);
             } catch (error) {
                 console.error('Failed to fetch components', error);
             }
@@ -25,33 +25,49 @@ export const updateHarness = async (
 
 // --- Component Library API ---
 
-
-
 interface LibraryComponentData {
-
-  name: string;
-
+  manufacturer: string | null;
   part_number: string;
-
   pins: { id: string }[];
-
+  gauge: number | null;
 }
 
-
-
 export interface LibraryComponent {
-
   id: string;
-
-  type: 'connector' | 'wire';
-
+  type: 'connector' | 'wire' | 'terminal' | null;
   name: string;
-
   data: LibraryComponentData;
+}
+
+export interface ComponentSearchParams {
+  q?: string;
+  type?: 'connector' | 'wire' | 'terminal';
+  manufacturer?: string;
+  pin_count?: number;
+  gauge?: number;
+  page?: number;
+  page_size?: number;
+}
 
+export interface ComponentSearchResult {
+  items: LibraryComponent[];
+  total: number;
+  page: number;
+  page_size: number;
+  facets: {
+    component_type: Record<string, number>;
+    manufacturer: Record<string, number>;
+    pin_count: Record<string, number>;
+    gauge: Record<string, number>;
+  };
 }
 
-export const getComponents = async (): Promise<LibraryComponent[]> => {
-  const response = await axios.get<LibraryComponent[]>(`${API_BASE_URL}/components/`);
+export const searchComponents = async (
+  params: ComponentSearchParams = {}
+): Promise<ComponentSearchResult> => {
+  const response = await axios.get<ComponentSearchResult>(
+    `${API_BASE_URL}/components/`,
+    { params }
+  );
   return response.data;
 };
@@ -0,0 +1,111 @@
+"""
+Concurrency benchmark of the database profiles.
+
+Runs threads mixing short write transactions with reads against a fresh
+SQLite database, once with the engine options used before the profiles
+(rollback journal, full sync) and once with the engine of `app.db.profiles`,
+and prints the throughput and the transactions that failed on a locked
+database:
+
+    python scripts/db_benchmark.py --threads 8 --transactions 200
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import (
+    Column,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.profiles import create_db_engine  # noqa: E402
+
+metadata = MetaData()
+events = Table(
+    "benchmark_events",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("worker", Integer, nullable=False),
+    Column("payload", String, nullable=False),
+)
+
+
+def run(engine: Engine, threads: int, transactions: int) -> tuple[float, int, int]:
+    """Returns the elapsed seconds, committed and failed transactions."""
+    metadata.create_all(engine)
+    committed = failed = 0
+    lock = threading.Lock()
+
+    def worker(n: int) -> None:
+        nonlocal committed, failed
+        for i in range(transactions):
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        insert(events).values(worker=n, payload="x" * 200)
+                    )
+                    connection.execute(
+                        select(func.count())
+                        .select_from(events)
+                        .where(events.c.worker == n)
+                    ).scalar()
+                # A read outside the write transaction, as API reads are
+                with engine.connect() as connection:
+                    connection.execute(select(func.count()).select_from(events))
+                with lock:
+                    committed += 1
+            except OperationalError:
+                with lock:
+                    failed += 1
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed, committed, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--transactions", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engines = {
+            "default": create_engine(
+                f"sqlite:///{directory}/default.db",
+                connect_args={"check_same_thread": False},
+            ),
+            "profile": create_db_engine(f"sqlite:///{directory}/profile.db"),
+        }
+        print(f"{args.threads} threads x {args.transactions} transactions")
+        for name, engine in engines.items():
+            elapsed, committed, failed = run(engine, args.threads, args.transactions)
+            print(
+                f"{name:>8}: {elapsed:6.2f}s  {committed / elapsed:8.0f} tx/s  "
+                f"{committed} committed  {failed} failed (locked)"
+            )
+
+
+if __name__ == "__main__":
+    main()
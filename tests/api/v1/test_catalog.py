@@ -0,0 +1,33 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.services.catalog import catalog_service
+
+
+def test_ingest_catalog_feed(client: TestClient, db_session: Session):
+    """
+    Test uploading a catalog feed with one valid and one invalid row.
+    """
+    feed = b"part_number,voltage_rating,pin_count\nNEW-2P,48,2\nBAD-2P,48,zero\n"
+    response = client.post(
+        "/api/v1/catalog/ingest",
+        files={"feed": ("parts.csv", feed, "text/csv")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["upserted"], report["rejected"]) == (1, 1)
+    assert report["errors"][0]["line"] == 3
+
+    spec = catalog_service.get_specification(db_session, "NEW-2P")
+    assert spec is not None and spec["voltage_rating"] == 48.0
+
+
+def test_ingest_catalog_rejects_unknown_format(client: TestClient):
+    """
+    Test that feeds with an unsupported extension are rejected.
+    """
+    response = client.post(
+        "/api/v1/catalog/ingest",
+        files={"feed": ("parts.xlsx", b"", "application/octet-stream")},
+    )
+    assert response.status_code == 400
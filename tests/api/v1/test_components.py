@@ -0,0 +1,44 @@
+import pytest
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.usefixtures("catalog")
+
+
+def test_search_components(client: TestClient):
+    """
+    Test searching the component library with a query and a type filter.
+    """
+    response = client.get("/api/v1/components/?q=phr&type=connector")
+    assert response.status_code == 200
+    result = response.json()
+    assert result["total"] == 1
+    component = result["items"][0]
+    assert component["type"] == "connector"
+    assert component["name"] == "JST PH-3P"
+    assert component["data"]["pins"] == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    assert result["facets"]["manufacturer"] == {"JST": 1}
+
+
+def test_search_components_revalidates_with_etag(client: TestClient):
+    """
+    Test that an unchanged result is revalidated with 304 Not Modified.
+    """
+    response = client.get("/api/v1/components/?page_size=5")
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 5
+    assert "max-age" in response.headers["Cache-Control"]
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/api/v1/components/?page_size=5", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_search_components_rejects_bad_page_size(client: TestClient):
+    """
+    Test that page sizes beyond the limit are rejected.
+    """
+    response = client.get("/api/v1/components/?page_size=1000")
+    assert response.status_code == 422
@@ -1,6 +1,14 @@
+import copy
+import uuid
+from typing import Any
+from uuid import UUID
+
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app import models
+
 SAMPLE_HARNESS = {
     "name": "Test Harness",
     "connectors": [
@@ -99,6 +107,28 @@ def test_create_harness(client: TestClient, db_session: Session) -> None:
     assert fromto["items"][1]["from_location"] == "CONN1-2"
     assert fromto["items"][1]["to_location"] == "CONN2-B"
 
+    # Test Nets
+    response = client.get(f"/api/v1/harnesses/{harness_id}/nets")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "CONN1-1", "pins": ["CONN1-1", "CONN2-A"], "wires": ["W1"]},
+        {"name": "CONN1-2", "pins": ["CONN1-2", "CONN2-B"], "wires": ["W2"]},
+    ]
+    response = client.get(f"/api/v1/harnesses/{uuid.uuid4()}/nets")
+    assert response.status_code == 404
+
+    # Test Continuity Test Program
+    response = client.get(f"/api/v1/harnesses/{harness_id}/continuity-test")
+    assert response.status_code == 200
+    assert "text/csv" in response.headers["content-type"]
+    lines = response.text.splitlines()
+    assert lines[0] == "test,pin_a,pin_b,net_a,net_b"
+    assert lines[1:3] == [
+        "CONTINUITY,CONN1-1,CONN2-A,CONN1-1,CONN1-1",
+        "CONTINUITY,CONN1-2,CONN2-B,CONN1-2,CONN1-2",
+    ]
+    assert len(lines) == 1 + 2 + 4
+
     # Test Strip List
     response = client.get(f"/api/v1/harnesses/{harness_id}/strip-list")
     assert response.status_code == 200
@@ -113,3 +143,67 @@ def test_create_harness(client: TestClient, db_session: Session) -> None:
     response = client.get(f"/api/v1/harnesses/{harness_id}/formboard-pdf")
     assert response.status_code == 200
     assert "application/pdf" in response.headers["content-type"]
+
+
+@pytest.mark.usefixtures("catalog")
+def test_auto_assign_terminals(client: TestClient, db_session: Session) -> None:
+    harness: dict[str, Any] = copy.deepcopy(SAMPLE_HARNESS)
+    harness["connectors"][0]["part_number"] = "PHR-3"
+    harness["connectors"][1]["part_number"] = "Molex-KK-254"
+    for wire in harness["wires"]:
+        wire["gauge"] = 24.0
+    response = client.post("/api/v1/harnesses/", json=harness)
+    harness_id = response.json()["id"]
+
+    response = client.post(f"/api/v1/harnesses/{harness_id}/auto-assign-terminals")
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["assigned"], report["kept"], report["unresolved"]) == (2, 2, 0)
+
+    connections = client.get(f"/api/v1/harnesses/{harness_id}").json()["connections"]
+    terminals = {
+        c["wire_id"]: (c["terminal_part_number_a"], c["terminal_part_number_b"])
+        for c in connections
+    }
+    assert terminals == {
+        "W1": ("SPH-002T-P0.5S", "171662-0153"),
+        "W2": ("TERM-Z", "TERM-Y"),
+    }
+
+    response = client.post(
+        f"/api/v1/harnesses/{uuid.uuid4()}/auto-assign-terminals?overwrite=true"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("catalog")
+def test_create_and_update_enrich_from_catalog(
+    client: TestClient, db_session: Session
+) -> None:
+    harness: dict[str, Any] = copy.deepcopy(SAMPLE_HARNESS)
+    harness["connectors"][0]["part_number"] = "PHR-3"
+    harness["wires"][0]["part_number"] = "UL1007-26-RD"
+    response = client.post("/api/v1/harnesses/", json=harness)
+    harness_id = UUID(response.json()["id"])
+
+    def components() -> dict[str, Any]:
+        db_session.expire_all()
+        return {
+            c.logical_id: c
+            for c in db_session.query(models.Connector).filter_by(harness_id=harness_id)
+        } | {
+            w.logical_id: w
+            for w in db_session.query(models.Wire).filter_by(harness_id=harness_id)
+        }
+
+    enriched = components()
+    assert (enriched["CONN1"].voltage_rating, enriched["CONN1"].is_ul) == (100.0, True)
+    assert enriched["CONN1"].applicable_wire_max_diameter == 1.5
+    assert (enriched["W1"].outer_diameter, enriched["W1"].is_rohs) == (1.2, True)
+    # Parts unknown to the catalog keep their specs empty
+    assert enriched["CONN2"].voltage_rating is None
+
+    harness["connectors"][1]["part_number"] = "DF13-3S-1.25C"
+    response = client.put(f"/api/v1/harnesses/{harness_id}", json=harness)
+    assert response.status_code == 200
+    assert components()["CONN2"].voltage_rating == 150.0
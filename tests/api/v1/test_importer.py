@@ -0,0 +1,59 @@
+import io
+import zipfile
+
+import ezdxf
+import pytest
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.usefixtures("catalog")
+
+
+def _dxf_bytes(ref_des: str, part_number: str) -> bytes:
+    doc = ezdxf.new()
+    block = doc.blocks.new(name="CONNECTOR")
+    block.add_attdef("REF_DES", (0, 0))
+    block.add_attdef("PART_NUMBER", (0, 1))
+    block_ref = doc.modelspace().add_blockref("CONNECTOR", (0, 0))
+    block_ref.add_auto_attribs({"REF_DES": ref_des, "PART_NUMBER": part_number})
+    stream = io.StringIO()
+    doc.write(stream)
+    return stream.getvalue().encode("utf-8")
+
+
+def test_import_dxf_batch(client: TestClient):
+    """
+    Test importing a ZIP archive of DXF files into a project.
+    """
+    response = client.post("/api/v1/projects/", json={"name": "Batch Project"})
+    project_id = response.json()["id"]
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("one.dxf", _dxf_bytes("J1", "PHR-3"))
+        zf.writestr("two.dxf", _dxf_bytes("J2", "PHR-3"))
+    buffer.seek(0)
+
+    response = client.post(
+        f"/api/v1/harnesses/import-dxf-batch?project_id={project_id}",
+        files={"archive": ("drawings.zip", buffer, "application/zip")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 0
+
+    harness_id = report["files"][0]["harness_id"]
+    response = client.get(f"/api/v1/harnesses/{harness_id}/bom")
+    assert response.status_code == 200
+    assert response.json()["connectors"][0]["part_number"] == "PHR-3"
+
+
+def test_import_dxf_batch_rejects_non_zip(client: TestClient):
+    """
+    Test that uploads without a .zip extension are rejected.
+    """
+    response = client.post(
+        "/api/v1/harnesses/import-dxf-batch?project_id=1",
+        files={"archive": ("drawing.dxf", b"0\nEOF\n", "application/dxf")},
+    )
+    assert response.status_code == 400
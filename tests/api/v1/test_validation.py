@@ -0,0 +1,169 @@
+import copy
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+HARNESS = {
+    "name": "Validated Harness",
+    "connectors": [
+        {
+            "id": connector_id,
+            "manufacturer": "JST",
+            "part_number": "PHR-3",
+            "pins": [{"id": "1"}],
+        }
+        for connector_id in ("J1", "J2")
+    ],
+    "wires": [
+        {
+            "id": "W1",
+            "manufacturer": "Generic",
+            "part_number": "UNKNOWN-WIRE",
+            "color": "RD",
+            "gauge": 26.0,
+            "length": 100.0,
+        }
+    ],
+    "connections": [
+        {
+            "wire_id": "W1",
+            "from_connector_id": "J1",
+            "from_pin_id": "1",
+            "to_connector_id": "J2",
+            "to_pin_id": "1",
+        }
+    ],
+}
+
+
+def test_list_validation_rules(client: TestClient) -> None:
+    response = client.get("/api/v1/validation/rules")
+    assert response.status_code == 200
+    rules = {rule["name"]: rule for rule in response.json()}
+    assert {
+        "missing_specs",
+        "voltage_rating",
+        "rohs_compliance",
+        "wire_diameter",
+        "terminal_compatibility",
+    } <= set(rules)
+    assert rules["wire_diameter"]["entity_types"] == ["connection"]
+
+
+def test_project_settings_disable_rules(client: TestClient) -> None:
+    project = client.post("/api/v1/projects/", json={"name": "Rules"}).json()
+    url = f"/api/v1/projects/{project['id']}/settings"
+
+    response = client.post(url, json={"disabled_rules": ["missing_specs"]})
+    assert response.status_code == 200
+    assert response.json()["disabled_rules"] == ["missing_specs"]
+
+    response = client.post(url, json={"disabled_rules": []})
+    assert response.json()["disabled_rules"] == []
+
+    # Opt-in rules are off unless the settings list their own
+    response = client.post(url, json={})
+    assert response.json()["disabled_rules"] == ["floating_pins"]
+
+    response = client.post(url, json={"disabled_rules": ["no_such_rule"]})
+    assert response.status_code == 400
+    assert "no_such_rule" in response.json()["detail"]
+
+
+@pytest.mark.usefixtures("catalog")
+def test_validation_results_are_reused_until_harness_changes(
+    client: TestClient,
+) -> None:
+    harness_in: dict[str, Any] = copy.deepcopy(HARNESS)
+    harness_id = client.post("/api/v1/harnesses/", json=harness_in).json()["id"]
+    project = client.post("/api/v1/projects/", json={"name": "Cached"}).json()
+    client.post(
+        f"/api/v1/projects/{project['id']}/save",
+        json={"harness_id": harness_id, "design_data": {"nodes": [], "edges": []}},
+    )
+    client.post(f"/api/v1/projects/{project['id']}/settings", json={})
+
+    def rule_calls() -> int:
+        rules = client.get("/api/v1/validation/rules").json()
+        return sum(rule["calls"] + rule["reused"] for rule in rules)
+
+    first = client.get(f"/api/v1/harnesses/{harness_id}/validate").json()
+    assert {e["error_type"] for e in first} == {"DataQualityError"}
+    calls = rule_calls()
+
+    # Repeat validation and the export cost no rule evaluation
+    assert client.get(f"/api/v1/harnesses/{harness_id}/validate").json() == first
+    response = client.get(f"/api/v1/harnesses/{harness_id}/procurement/export-csv")
+    assert response.status_code == 400
+    assert response.json()["detail"]["errors"] == first
+    assert rule_calls() == calls
+
+    # Editing the harness invalidates the result
+    harness_in["wires"][0]["part_number"] = "UL1007-26-RD"
+    client.put(f"/api/v1/harnesses/{harness_id}", json=harness_in)
+    second = client.get(f"/api/v1/harnesses/{harness_id}/validate").json()
+    assert second == []
+    assert rule_calls() > calls
+
+
+@pytest.mark.usefixtures("catalog")
+def test_warnings_do_not_block_procurement_export(client: TestClient) -> None:
+    harness_in: dict[str, Any] = copy.deepcopy(HARNESS)
+    harness_in["wires"][0]["part_number"] = "UL1007-26-RD"
+    # Only pin 1 of each connector is wired
+    for connector in harness_in["connectors"]:
+        connector["pins"] = [{"id": pin_id} for pin_id in ("1", "2", "3")]
+    harness_id = client.post("/api/v1/harnesses/", json=harness_in).json()["id"]
+    project = client.post("/api/v1/projects/", json={"name": "Unwired"}).json()
+    client.post(
+        f"/api/v1/projects/{project['id']}/save",
+        json={"harness_id": harness_id, "design_data": {"nodes": [], "edges": []}},
+    )
+    settings_url = f"/api/v1/projects/{project['id']}/settings"
+    client.post(settings_url, json={})
+    assert client.get(f"/api/v1/harnesses/{harness_id}/validate").json() == []
+
+    # Unwired pins are only reported when floating_pins is turned on
+    client.post(settings_url, json={"disabled_rules": []})
+
+    results = client.get(f"/api/v1/harnesses/{harness_id}/validate").json()
+    assert sorted(e["message"] for e in results) == [
+        f"Pin {connector}-{pin} is not connected to any wire."
+        for connector in ("J1", "J2")
+        for pin in ("2", "3")
+    ]
+    assert {e["severity"] for e in results} == {"warning"}
+
+    response = client.get(f"/api/v1/harnesses/{harness_id}/procurement/export-csv")
+    assert response.status_code == 200
+    assert "UL1007-26-RD" in response.text
+
+
+@pytest.mark.usefixtures("catalog")
+def test_validate_project_streams_ndjson(client: TestClient) -> None:
+    project = client.post("/api/v1/projects/", json={"name": "Streamed"}).json()
+    url = f"/api/v1/projects/{project['id']}/validate"
+    assert client.get("/api/v1/projects/999999/validate").status_code == 404
+    assert client.get(url).status_code == 400
+
+    client.post(f"/api/v1/projects/{project['id']}/settings", json={})
+    harness_ids = []
+    for part_number in ("UNKNOWN-WIRE", "UL1007-26-RD"):
+        harness_in: dict[str, Any] = copy.deepcopy(HARNESS)
+        harness_in["wires"][0]["part_number"] = part_number
+        harness_id = client.post("/api/v1/harnesses/", json=harness_in).json()["id"]
+        client.post(
+            f"/api/v1/projects/{project['id']}/save",
+            json={"harness_id": harness_id, "design_data": {"nodes": [], "edges": []}},
+        )
+        harness_ids.append(harness_id)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = {r["harness_id"]: r for r in map(json.loads, response.text.splitlines())}
+    assert set(results) == set(harness_ids)
+    assert [len(results[h]["errors"]) for h in harness_ids] == [1, 0]
+    assert all(r["failure"] is None for r in results.values())
@@ -1,20 +1,123 @@
 import os
+import stat
+import sys
 import tempfile
 from collections.abc import Generator
 from unittest.mock import MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
+from kicad_sch_api.library import cache as ksa_cache
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.api.deps import get_db
 from app.db.base import Base
 from app.main import app
+from app.services import symbol_library
+from app.services.catalog import ComponentSpec, PinData, catalog_service
 from app.services.kicad_engine_service import KiCadEngineService
+from app.services.symbol_library import SymbolLibraryCache
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
+
+def _pin_row(pin_count: int, pitch: float) -> PinData:
+    return {
+        "pin_count": pin_count,
+        "pin_positions": [{"x": i * pitch, "y": 0.0} for i in range(pin_count)],
+    }
+
+
+# Catalog contents seeded by the `catalog` fixture, matching the migration seed
+SAMPLE_CATALOG: dict[str, ComponentSpec] = {
+    # Connectors
+    "DF13-3S-1.25C": {
+        "component_type": "connector",
+        "manufacturer": "Hirose",
+        "name": "Hirose DF13-3S",
+        "voltage_rating": 150.0,
+        "applicable_wire_max_diameter": 0.9,
+        "is_rohs": True,
+        "is_ul": True,
+        "pins": _pin_row(3, 1.25),
+    },
+    "PHR-3": {
+        "component_type": "connector",
+        "manufacturer": "JST",
+        "name": "JST PH-3P",
+        "voltage_rating": 100.0,
+        "applicable_wire_max_diameter": 1.5,
+        "is_rohs": True,
+        "is_ul": True,
+        "pins": _pin_row(3, 2.0),
+    },
+    "OLD-CONN-01": {
+        "component_type": "connector",
+        "voltage_rating": 50.0,
+        "applicable_wire_max_diameter": 2.0,
+        "is_rohs": False,
+        "is_ul": True,
+        "pins": _pin_row(4, 2.54),
+    },
+    # Wires
+    "UL1007-26-RD": {
+        "component_type": "wire",
+        "manufacturer": "Generic",
+        "name": "26 AWG Red",
+        "gauge": 26.0,
+        "voltage_rating": 300.0,
+        "outer_diameter": 1.2,
+        "is_rohs": True,
+        "is_ul": True,
+    },
+    "UL1007-22-BK": {
+        "component_type": "wire",
+        "manufacturer": "Generic",
+        "name": "22 AWG Black",
+        "gauge": 22.0,
+        "voltage_rating": 300.0,
+        "outer_diameter": 1.6,
+        "is_rohs": True,
+        "is_ul": True,
+    },
+    "THICK-WIRE-01": {
+        "component_type": "wire",
+        "voltage_rating": 600.0,
+        "outer_diameter": 3.0,
+        "is_rohs": True,
+        "is_ul": True,
+    },
+    # Terminals
+    "DF13-2630SCF": {
+        "component_type": "terminal",
+        "manufacturer": "Hirose",
+        "name": "Hirose DF13 Crimp Terminal",
+        "applicable_wire_gauge_min": 26,
+        "applicable_wire_gauge_max": 30,
+        "compatible_connector_series": ["DF13"],
+        "is_rohs": True,
+    },
+    "SPH-002T-P0.5S": {
+        "component_type": "terminal",
+        "manufacturer": "JST",
+        "name": "JST PH Crimp Terminal",
+        "applicable_wire_gauge_min": 24,
+        "applicable_wire_gauge_max": 28,
+        "compatible_connector_series": ["PHR"],
+        "is_rohs": True,
+    },
+    "171662-0153": {
+        "component_type": "terminal",
+        "manufacturer": "Molex",
+        "name": "Molex KK Crimp Terminal",
+        "applicable_wire_gauge_min": 22,
+        "applicable_wire_gauge_max": 26,
+        "compatible_connector_series": ["Molex-KK"],
+        "is_rohs": True,
+    },
+}
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
@@ -32,6 +135,13 @@ def db_session() -> Generator:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def catalog(db_session: Session) -> dict[str, ComponentSpec]:
+    """Seeds the component catalog with SAMPLE_CATALOG."""
+    catalog_service.upsert_specifications(db_session, SAMPLE_CATALOG)
+    return SAMPLE_CATALOG
+
+
 @pytest.fixture(scope="function")
 def client(db_session: Generator) -> Generator:
     def override_get_db():
@@ -47,6 +157,69 @@ def client(db_session: Generator) -> Generator:
     app.dependency_overrides = {}
 
 
+# Stands in for kicad-cli: writes the files the export commands would, and
+# has `sleep SECONDS` and `fail` commands to exercise the runner
+STUB_KICAD_CLI = r"""
+import pathlib
+import sys
+import time
+
+args = sys.argv[1:]
+if args[0] == "sleep":
+    time.sleep(float(args[1]))
+elif args[0] == "fail":
+    sys.exit("stub kicad-cli failure")
+elif args[:3] == ["sch", "export", "dxf"]:
+    output = pathlib.Path(args[args.index("--output") + 1])
+    output.write_text("0\nSECTION\n0\nENDSEC\n0\nEOF\n")
+elif args[:3] == ["sch", "export", "bom"]:
+    output_dir = pathlib.Path(args[args.index("--output-dir") + 1])
+    name = pathlib.Path(args[-1]).stem + ".csv"
+    (output_dir / name).write_text("Reference,Value\n")
+"""
+
+
+@pytest.fixture
+def stub_kicad_cli(tmp_path) -> str:
+    """Path to an executable stub of kicad-cli."""
+    path = tmp_path / "kicad-cli"
+    path.write_text(f"#!{sys.executable}\n{STUB_KICAD_CLI}")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def _conn_symbol(pins: int) -> str:
+    name = f"Conn_01x{pins:02d}"
+    font = "(effects (font (size 1.27 1.27)))"
+    body = " ".join(
+        f"(pin passive line (at -5.08 {-2.54 * n:.2f} 0) (length 3.81) "
+        f'(name "Pin_{n + 1}" {font}) (number "{n + 1}" {font}))'
+        for n in range(pins)
+    )
+    return (
+        f'(symbol "{name}" (in_bom yes) (on_board yes) '
+        f'(property "Reference" "J" (at 0 2.54 0) {font}) '
+        f'(property "Value" "{name}" (at 0 -5.08 0) {font}) '
+        f'(symbol "{name}_1_1" {body}))'
+    )
+
+
+@pytest.fixture
+def symbol_cache(tmp_path, monkeypatch) -> SymbolLibraryCache:
+    """
+    The symbol cache of kicad-sch-api, with a Connector_Generic library of
+    1 to 4 pin connectors in place of the installed KiCad libraries.
+    """
+    library = tmp_path / "Connector_Generic.kicad_sym"
+    symbols = " ".join(_conn_symbol(pins) for pins in range(1, 5))
+    library.write_text(f"(kicad_symbol_lib (version 20231120) {symbols})")
+    cache = SymbolLibraryCache()
+    cache.add_library_path(library)
+    monkeypatch.setattr(symbol_library, "_symbol_cache", cache)
+    monkeypatch.setattr(ksa_cache, "_global_cache", cache)
+    return cache
+
+
 @pytest.fixture
 def mock_kicad_engine() -> Generator[MagicMock, None, None]:
     """Fixture to mock the KiCadEngineService and handle temporary files."""
@@ -0,0 +1,42 @@
+from sqlalchemy import Connection, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import Settings
+from app.db.profiles import create_db_engine, engine_options
+
+
+def _pragma(connection: Connection, name: str) -> object:
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_connections_use_wal(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    with engine.connect() as connection:
+        assert _pragma(connection, "journal_mode") == "wal"
+        # NORMAL
+        assert _pragma(connection, "synchronous") == 1
+        assert _pragma(connection, "busy_timeout") == 5000
+    engine.dispose()
+
+
+def test_in_memory_sqlite_keeps_defaults():
+    engine = create_db_engine("sqlite://", Settings(SQLITE_BUSY_TIMEOUT=1.0))
+
+    with engine.connect() as connection:
+        assert _pragma(connection, "journal_mode") == "memory"
+        # The driver's default, not the configured timeout
+        assert _pragma(connection, "busy_timeout") == 5000
+
+
+def test_postgresql_pool_options():
+    config = Settings(DB_POOL_SIZE=20, DB_STATEMENT_TIMEOUT=2.5)
+
+    options = engine_options(make_url("postgresql+psycopg://app@db/harness"), config)
+
+    assert options["pool_size"] == 20
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=2500"}
+    assert "connect_args" not in engine_options(
+        make_url("postgresql://app@db/harness"), Settings(DB_STATEMENT_TIMEOUT=0)
+    )
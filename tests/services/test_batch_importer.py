@@ -0,0 +1,172 @@
+import io
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import ezdxf
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.exceptions import ProjectNotFoundException
+from app.services.batch_importer import BatchImportService, collect_jobs
+from app.services.importer import hash_stream, importer_service
+
+pytestmark = pytest.mark.usefixtures("catalog")
+
+
+def _dxf_text(ref_des: str, part_number: str) -> str:
+    doc = ezdxf.new()
+    block = doc.blocks.new(name="CONNECTOR")
+    block.add_attdef("REF_DES", (0, 0))
+    block.add_attdef("PART_NUMBER", (0, 1))
+    block_ref = doc.modelspace().add_blockref("CONNECTOR", (0, 0))
+    block_ref.add_auto_attribs({"REF_DES": ref_des, "PART_NUMBER": part_number})
+    stream = io.StringIO()
+    doc.write(stream)
+    return stream.getvalue()
+
+
+@pytest.fixture
+def project(db_session: Session) -> models.Project:
+    project = models.Project(name="Archive Project")
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> Path:
+    archive_path = tmp_path / "drawings.zip"
+    with zipfile.ZipFile(archive_path, "w") as zf:
+        zf.writestr("a/harness-1.dxf", _dxf_text("J1", "PHR-3"))
+        zf.writestr("a/harness-2.DXF", _dxf_text("J2", "DF13-3S-1.25C"))
+        zf.writestr("harness-3.dxf", _dxf_text("J3", "PHR-3"))
+        zf.writestr("broken.dxf", "this is not a DXF file")
+        zf.writestr("notes.txt", "ignored")
+    return archive_path
+
+
+def test_collect_jobs_from_directory(tmp_path: Path):
+    """
+    Test that DXF files are collected recursively from a directory.
+    """
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "one.dxf").write_text(_dxf_text("J1", "PHR-3"))
+    (tmp_path / "two.DXF").write_text(_dxf_text("J2", "PHR-3"))
+    (tmp_path / "readme.md").write_text("ignored")
+
+    jobs = collect_jobs(tmp_path)
+
+    assert sorted(job.filename for job in jobs) == ["sub/one.dxf", "two.DXF"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_import_archive_reports_each_file(
+    db_session: Session, project: models.Project, archive: Path, max_workers: int
+):
+    """
+    Test that a ZIP archive is imported in batches with a per-file report, both
+    in-process and across worker processes.
+    """
+    service = BatchImportService(
+        importer=importer_service, max_workers=max_workers, batch_size=2
+    )
+
+    report = service.import_path(db=db_session, source=archive, project_id=project.id)
+
+    assert report.imported == 3
+    assert report.failed == 1
+    by_name = {result.filename: result for result in report.files}
+    assert by_name["broken.dxf"].status == "failed"
+    assert by_name["broken.dxf"].error
+
+    harness = (
+        db_session.query(models.Harness)
+        .filter(models.Harness.id == by_name["a/harness-2.DXF"].harness_id)
+        .one()
+    )
+    assert harness.name == "harness-2"
+    assert [c.part_number for c in harness.connectors] == ["DF13-3S-1.25C"]
+    assert (
+        db_session.query(models.HarnessDesign)
+        .filter(models.HarnessDesign.project_id == project.id)
+        .count()
+        == 3
+    )
+
+
+def test_import_archive_requires_project(db_session: Session, archive: Path):
+    """
+    Test that importing into a missing project is rejected before parsing.
+    """
+    service = BatchImportService(importer=importer_service, max_workers=1)
+    with pytest.raises(ProjectNotFoundException):
+        service.import_path(db=db_session, source=archive, project_id=999)
+
+
+def test_import_archive_skips_known_and_repeated_files(
+    db_session: Session, project: models.Project, tmp_path: Path
+):
+    """
+    Test that files already imported into the project, and files repeated within
+    the archive, are reported as duplicates instead of creating new harnesses.
+    """
+    content = _dxf_text("J1", "PHR-3")
+    first = tmp_path / "first.zip"
+    with zipfile.ZipFile(first, "w") as zf:
+        zf.writestr("original.dxf", content)
+        zf.writestr("copy.dxf", content)
+    second = tmp_path / "second.zip"
+    with zipfile.ZipFile(second, "w") as zf:
+        zf.writestr("reupload.dxf", content)
+        zf.writestr("new.dxf", _dxf_text("J2", "PHR-3"))
+
+    service = BatchImportService(importer=importer_service, max_workers=1)
+    first_report = service.import_path(
+        db=db_session, source=first, project_id=project.id
+    )
+    with patch.object(
+        importer_service, "parse_dxf", wraps=importer_service.parse_dxf
+    ) as parse:
+        second_report = service.import_path(
+            db=db_session, source=second, project_id=project.id
+        )
+
+    original = first_report.files[0]
+    assert (first_report.imported, first_report.duplicates) == (1, 1)
+    assert first_report.files[1].harness_id == original.harness_id
+    assert (second_report.imported, second_report.duplicates) == (1, 1)
+    by_name = {result.filename: result for result in second_report.files}
+    assert by_name["reupload.dxf"].status == "duplicate"
+    assert by_name["reupload.dxf"].harness_id == original.harness_id
+    # Only the new file was parsed
+    assert parse.call_count == 1
+    assert db_session.query(models.Harness).count() == 2
+
+
+def test_concurrent_in_process_parses_are_isolated(tmp_path: Path):
+    """
+    Test that in-process parses of concurrent imports keep their own known
+    hashes and open archives.
+    """
+    contents = [_dxf_text("J1", "PHR-3"), _dxf_text("J2", "PHR-3")]
+    archive_path = tmp_path / "shared.zip"
+    with zipfile.ZipFile(archive_path, "w") as zf:
+        zf.writestr("one.dxf", contents[0])
+        zf.writestr("two.dxf", contents[1])
+    jobs = collect_jobs(archive_path)
+    service = BatchImportService(importer=importer_service, max_workers=1)
+    known = frozenset(hash_stream(io.BytesIO(c.encode())) for c in contents)
+
+    first = service._parse_all(jobs, known)
+    assert next(first).parsed is None
+    # A second import, into a project without these files, runs in between
+    second = list(service._parse_all(jobs, frozenset()))
+    assert [outcome.parsed is not None for outcome in second] == [True, True]
+
+    # The first import still skips its known files and reads its archive
+    outcome = next(first)
+    assert outcome.error is None
+    assert outcome.parsed is None
+    assert outcome.source_hash in known
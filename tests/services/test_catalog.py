@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import catalog as catalog_module
+from app.services.catalog import ComponentSpec, catalog_service
+
+
+@pytest.mark.usefixtures("catalog")
+def test_get_specifications_returns_known_parts(db_session: Session):
+    """
+    Test that a batch lookup returns the specs of known parts only.
+    """
+    specs = catalog_service.get_specifications(
+        db_session, ["PHR-3", "SPH-002T-P0.5S", "UNKNOWN-PART"]
+    )
+
+    assert set(specs) == {"PHR-3", "SPH-002T-P0.5S"}
+    assert specs["PHR-3"]["voltage_rating"] == 100.0
+    pins = specs["PHR-3"]["pins"]
+    assert pins is not None and pins["pin_count"] == 3
+    assert specs["SPH-002T-P0.5S"]["compatible_connector_series"] == ["PHR"]
+    # Fields without a value are omitted rather than returned as None
+    assert "outer_diameter" not in specs["PHR-3"]
+    assert catalog_service.get_specification(db_session, "UNKNOWN-PART") is None
+
+
+@pytest.mark.usefixtures("catalog")
+def test_get_specifications_chunks_large_lookups(db_session: Session):
+    """
+    Test that lookups larger than the chunk size are split across queries.
+    """
+    part_numbers = ["PHR-3", "OLD-CONN-01"] + [f"MISSING-{i}" for i in range(5)]
+
+    with patch.object(catalog_module, "_LOOKUP_CHUNK_SIZE", 2):
+        specs = catalog_service.get_specifications(db_session, part_numbers)
+
+    assert set(specs) == {"PHR-3", "OLD-CONN-01"}
+
+
+def test_upsert_specifications_replaces_existing_parts(db_session: Session):
+    """
+    Test that upserting a known part number replaces its specs and series.
+    """
+    terminal: ComponentSpec = {
+        "applicable_wire_gauge_min": 24,
+        "applicable_wire_gauge_max": 28,
+        "compatible_connector_series": ["PHR", "XH"],
+    }
+    catalog_service.upsert_specifications(db_session, {"SPH-002T-P0.5S": terminal})
+    catalog_service.upsert_specifications(
+        db_session,
+        {
+            "SPH-002T-P0.5S": {**terminal, "compatible_connector_series": ["XH"]},
+            "UL1007-26-RD": {"outer_diameter": 1.2},
+        },
+    )
+
+    specs = catalog_service.get_specifications(
+        db_session, ["SPH-002T-P0.5S", "UL1007-26-RD"]
+    )
+    assert specs["SPH-002T-P0.5S"]["compatible_connector_series"] == ["XH"]
+    assert specs["UL1007-26-RD"] == {"outer_diameter": 1.2}
+    assert db_session.query(models.CatalogPart).count() == 2
+    assert db_session.query(models.CatalogTerminalSeries).count() == 1
+
+
+@pytest.mark.usefixtures("catalog")
+def test_get_cached_specifications_until_catalog_changes(db_session: Session):
+    """
+    Test that cached lookups only read parts not seen since the catalog last
+    changed, and never cache parts the catalog lacks.
+    """
+    catalog = catalog_module.CatalogService(cache_size=10)
+
+    with patch.object(
+        catalog, "_read_specifications", wraps=catalog._read_specifications
+    ) as read:
+        specs = catalog.get_cached_specifications(db_session, ["PHR-3", "NOPE"])
+        assert set(specs) == {"PHR-3"}
+        specs = catalog.get_cached_specifications(db_session, ["PHR-3", "NOPE"])
+        assert set(specs) == {"PHR-3"}
+        assert [call.args[1] for call in read.call_args_list] == [
+            ["NOPE", "PHR-3"],
+            ["NOPE"],
+        ]
+
+        catalog.upsert_specifications(db_session, {"PHR-3": {"voltage_rating": 50.0}})
+        specs = catalog.get_cached_specifications(db_session, ["PHR-3"])
+        assert specs["PHR-3"] == {"voltage_rating": 50.0}
+        assert read.call_args.args[1] == ["PHR-3"]
+
+
+def test_catalog_version_is_bumped_by_each_write(db_session: Session):
+    before = int(catalog_service.get_version(db_session))
+
+    catalog_service.upsert_specifications(db_session, {"NEW-1": {"is_rohs": True}})
+    catalog_service.upsert_specifications(db_session, {"NEW-2": {"is_rohs": True}})
+
+    assert int(catalog_service.get_version(db_session)) == before + 2
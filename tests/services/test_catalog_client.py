@@ -0,0 +1,226 @@
+import json
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+
+from app.exceptions import CatalogUnavailableException
+from app.services.catalog import CatalogService, ComponentSpec
+from app.services.catalog_client import CachedCatalogClient, HttpCatalogClient
+
+REMOTE_CATALOG: dict[str, ComponentSpec] = {
+    "MX-100": {"voltage_rating": 250.0, "is_rohs": True},
+    "MX-200": {"voltage_rating": 125.0, "is_rohs": False},
+    "MX-300": {"outer_diameter": 2.2},
+}
+
+
+class StubCatalogServer(ThreadingHTTPServer):
+    """Local stand-in for the external catalog API, recording its requests."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.requests: list[list[str]] = []
+        self.client_addresses: set[tuple[str, int]] = set()
+        self.status = 200
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/api"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse is visible
+    server: StubCatalogServer
+
+    def do_POST(self) -> None:
+        assert self.path == "/api/specifications"
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body["part_numbers"])
+        self.server.client_addresses.add(self.client_address)
+        payload = json.dumps(
+            {
+                "specifications": {
+                    pn: REMOTE_CATALOG[pn]
+                    for pn in body["part_numbers"]
+                    if pn in REMOTE_CATALOG
+                }
+            }
+        ).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server() -> Generator[StubCatalogServer, None, None]:
+    server = StubCatalogServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_client(
+    stub_server: StubCatalogServer,
+) -> Generator[HttpCatalogClient, None, None]:
+    client = HttpCatalogClient(stub_server.url, batch_size=2)
+    yield client
+    client.close()
+
+
+def test_http_client_batches_over_one_connection(
+    stub_server: StubCatalogServer, http_client: HttpCatalogClient
+):
+    """
+    Test that lookups are split into batches sent over a pooled connection.
+    """
+    specs = http_client.fetch_specifications(["MX-100", "MX-200", "MX-300", "NOPE"])
+
+    assert specs == REMOTE_CATALOG
+    assert stub_server.requests == [["MX-100", "MX-200"], ["MX-300", "NOPE"]]
+    assert len(stub_server.client_addresses) == 1
+
+
+def test_http_client_wraps_server_errors(
+    stub_server: StubCatalogServer, http_client: HttpCatalogClient
+):
+    """
+    Test that API failures surface as CatalogUnavailableException.
+    """
+    stub_server.status = 503
+
+    with pytest.raises(CatalogUnavailableException):
+        http_client.fetch_specifications(["MX-100"])
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [[], {"specifications": ["MX-100"]}, {"specifications": {"MX-100": 1}}],
+)
+def test_http_client_rejects_malformed_payloads(payload: Any):
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+    client = HttpCatalogClient("http://catalog", transport=transport)
+
+    with pytest.raises(CatalogUnavailableException):
+        client.fetch_specifications(["MX-100"])
+    client.close()
+
+
+def test_cached_client_caches_hits_and_misses(
+    stub_server: StubCatalogServer, http_client: HttpCatalogClient
+):
+    """
+    Test that found and unknown parts are served from the cache until their
+    respective TTLs expire.
+    """
+    now = [0.0]
+    cached = CachedCatalogClient(
+        http_client, ttl=100.0, negative_ttl=10.0, clock=lambda: now[0]
+    )
+
+    assert cached.fetch_specifications(["MX-100", "NOPE"]) == {
+        "MX-100": REMOTE_CATALOG["MX-100"]
+    }
+    assert cached.fetch_specifications(["MX-100", "NOPE"]) == {
+        "MX-100": REMOTE_CATALOG["MX-100"]
+    }
+    assert stub_server.requests == [["MX-100", "NOPE"]]
+
+    # Only the negative entry has expired
+    now[0] = 11.0
+    cached.fetch_specifications(["MX-100", "NOPE"])
+    assert stub_server.requests == [["MX-100", "NOPE"], ["NOPE"]]
+
+
+def test_cached_client_evicts_least_recently_used(
+    stub_server: StubCatalogServer, http_client: HttpCatalogClient
+):
+    """
+    Test that the cache holds at most `max_size` parts, evicting the least
+    recently used one.
+    """
+    cached = CachedCatalogClient(http_client, max_size=2)
+
+    cached.fetch_specifications(["MX-100"])
+    cached.fetch_specifications(["MX-200"])
+    cached.fetch_specifications(["MX-100"])  # MX-200 is now least recently used
+    cached.fetch_specifications(["MX-300"])
+    stub_server.requests.clear()
+
+    cached.fetch_specifications(["MX-100", "MX-200", "MX-300"])
+    assert stub_server.requests == [["MX-200"]]
+
+
+class _SlowClient:
+    """Client blocking until released, counting the lookups it receives."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def fetch_specifications(self, part_numbers):
+        self.calls.append(list(part_numbers))
+        self.started.set()
+        self.release.wait(timeout=5)
+        return {pn: REMOTE_CATALOG[pn] for pn in part_numbers if pn in REMOTE_CATALOG}
+
+
+def test_cached_client_coalesces_concurrent_lookups():
+    """
+    Test that concurrent lookups of the same part share a single fetch.
+    """
+    slow = _SlowClient()
+    cached = CachedCatalogClient(slow)
+    results: list[dict[str, ComponentSpec]] = []
+
+    def lookup(part_numbers: list[str]) -> None:
+        results.append(cached.fetch_specifications(part_numbers))
+
+    first = threading.Thread(target=lookup, args=(["MX-100"],))
+    first.start()
+    assert slow.started.wait(timeout=5)
+    second = threading.Thread(target=lookup, args=(["MX-100", "MX-200"],))
+    second.start()
+    time.sleep(0.05)  # Let the second lookup register behind the first
+    slow.release.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+
+    assert slow.calls == [["MX-100"], ["MX-200"]]
+    assert sorted(len(r) for r in results) == [1, 2]
+
+
+@pytest.mark.usefixtures("catalog")
+def test_catalog_service_falls_back_to_external_catalog(
+    db_session: Session,
+    stub_server: StubCatalogServer,
+    http_client: HttpCatalogClient,
+):
+    """
+    Test that only parts missing from the catalog tables reach the external
+    catalog, and that an unavailable API leaves them unresolved.
+    """
+    service = CatalogService(external=CachedCatalogClient(http_client))
+
+    specs = service.get_specifications(db_session, ["PHR-3", "MX-100", "NOPE"])
+    assert set(specs) == {"PHR-3", "MX-100"}
+    assert stub_server.requests == [["MX-100", "NOPE"]]
+
+    stub_server.status = 500
+    specs = service.get_specifications(db_session, ["PHR-3", "MX-200"])
+    assert set(specs) == {"PHR-3"}
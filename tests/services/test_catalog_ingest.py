@@ -0,0 +1,101 @@
+import io
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.services.catalog import CatalogService, catalog_service
+from app.services.catalog_ingest import CatalogIngestService, detect_format
+
+CSV_HEADER = (
+    "part_number,voltage_rating,is_rohs,pin_count,pin_positions,"
+    "applicable_wire_gauge_min,applicable_wire_gauge_max,compatible_connector_series"
+)
+CSV_FEED = (
+    CSV_HEADER
+    + """
+XH-2P,250,true,2,"[{""x"": 0, ""y"": 0}, {""x"": 2.5, ""y"": 0}]",,,
+SXH-001T,,yes,,,22,28,XH;XHP
+BAD-VOLT,-5,true,,,,,
+BAD-GAUGE,,,,,30,22,
+,100,true,,,,,
+"""
+)
+
+
+def test_detect_format():
+    """
+    Test that the feed format follows the file extension.
+    """
+    assert detect_format("parts.CSV") == "csv"
+    assert detect_format("dump/parts.ndjson") == "jsonl"
+    with pytest.raises(ValueError):
+        detect_format("parts.xlsx")
+
+
+def test_ingest_csv_upserts_valid_rows_and_rejects_bad_ones(db_session: Session):
+    """
+    Test that valid CSV rows are upserted and invalid ones reported by line.
+    """
+    service = CatalogIngestService(catalog=CatalogService())
+
+    report = service.ingest(db_session, io.BytesIO(CSV_FEED.encode()), "csv")
+
+    assert (report.rows, report.upserted, report.rejected) == (5, 2, 3)
+    assert [(e.line, e.part_number) for e in report.errors] == [
+        (4, "BAD-VOLT"),
+        (5, "BAD-GAUGE"),
+        (6, None),
+    ]
+    specs = catalog_service.get_specifications(db_session, ["XH-2P", "SXH-001T"])
+    assert specs["XH-2P"] == {
+        "voltage_rating": 250.0,
+        "is_rohs": True,
+        "pins": {
+            "pin_count": 2,
+            "pin_positions": [{"x": 0.0, "y": 0.0}, {"x": 2.5, "y": 0.0}],
+        },
+    }
+    assert specs["SXH-001T"]["compatible_connector_series"] == ["XH", "XHP"]
+
+
+def test_ingest_jsonl_in_batches_with_progress(db_session: Session):
+    """
+    Test that JSON Lines feeds are committed batch by batch with progress
+    reports, and that a part repeated in the feed keeps its last row.
+    """
+    lines = [
+        json.dumps({"part_number": f"P-{i}", "outer_diameter": 1.0 + i})
+        for i in range(5)
+    ]
+    lines += ["not json", json.dumps({"part_number": "P-0", "outer_diameter": 9.0})]
+    feed = io.BytesIO("\n".join(lines).encode())
+    progress: list[int] = []
+    service = CatalogIngestService(
+        catalog=CatalogService(), batch_size=2, max_reported_errors=0
+    )
+
+    report = service.ingest(
+        db_session, feed, "jsonl", progress=lambda r: progress.append(r.upserted)
+    )
+
+    assert progress == [2, 4, 6]
+    assert report.rejected == 1
+    assert report.errors == []  # Counted but not listed past the limit
+    specs = catalog_service.get_specifications(db_session, ["P-0", "P-4"])
+    assert specs["P-0"] == {"outer_diameter": 9.0}
+    assert specs["P-4"] == {"outer_diameter": 5.0}
+
+
+def test_catalog_row_parses_csv_fields():
+    """
+    Test that CSV strings are converted to typed catalog fields.
+    """
+    row = schemas.CatalogRow.model_validate(
+        {"part_number": " DF13 ", "is_ul": "0", "compatible_connector_series": ""}
+    )
+
+    assert row.part_number == "DF13"
+    assert row.is_ul is False
+    assert row.compatible_connector_series is None
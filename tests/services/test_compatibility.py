@@ -0,0 +1,142 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.catalog import CatalogService, catalog_service
+from app.services.compatibility import (
+    CompatibilityIndex,
+    CompatibilityService,
+    TerminalInfo,
+)
+from app.services.validator import ValidationService
+
+pytestmark = pytest.mark.usefixtures("catalog")
+
+
+def test_index_maps_series_and_gauges_to_terminals(db_session: Session):
+    """
+    Test that the index answers compatibility lookups from the catalog.
+    """
+    index = CompatibilityService(CatalogService()).get_index(db_session)
+
+    terminal = index.terminal("SPH-002T-P0.5S")
+    assert terminal == TerminalInfo("SPH-002T-P0.5S", 24, 28, frozenset({"PHR"}))
+    assert terminal.accepts_gauge(26) and not terminal.accepts_gauge(22)
+    assert index.terminal("PHR-3") is None  # Connectors are not indexed
+
+    assert index.terminals_for_series("DF13") == ("DF13-2630SCF",)
+    assert index.suggest_terminals("PHR-3", 26) == ("SPH-002T-P0.5S",)
+    assert index.suggest_terminals("PHR-3", 22) == ()
+    assert index.suggest_terminals("PHR-3", 26.5) == ()
+
+
+def test_connector_series_prefers_catalog_series(db_session: Session):
+    """
+    Test that connector series are matched against the catalog series before
+    falling back to the part number prefix.
+    """
+    index = CompatibilityService(CatalogService()).get_index(db_session)
+
+    assert index.connector_series("Molex-KK-254") == "Molex-KK"
+    assert index.connector_series("DF13-3S-1.25C") == "DF13"
+    assert index.connector_series("XH-2P") == "XH"
+    # A catalog series only matches up to a hyphen or the end
+    assert index.connector_series("DF13") == "DF13"
+    assert index.connector_series("DF13B-3S") == "DF13B"
+    assert index.connector_series("Molex-KKX-2") == "Molex"
+
+
+def test_connector_series_prefix_ends_at_a_hyphen():
+    index = CompatibilityIndex("1", [TerminalInfo("T-1", 26, 28, frozenset({"ABC1"}))])
+
+    assert index.connector_series("ABC1-3") == "ABC1"
+    assert index.connector_series("ABC1") == "ABC1"
+    # A near miss falls back to the text before the hyphen
+    assert index.connector_series("ABC12-3") == "ABC12"
+
+
+def test_index_rebuilds_when_catalog_changes(db_session: Session):
+    """
+    Test that the index is reused until the catalog changes.
+    """
+    service = CompatibilityService(CatalogService())
+    index = service.get_index(db_session)
+    assert service.get_index(db_session) is index
+
+    catalog_service.upsert_specifications(
+        db_session,
+        {
+            "SPH-001T-P0.5L": {
+                "applicable_wire_gauge_min": 22,
+                "applicable_wire_gauge_max": 26,
+                "compatible_connector_series": ["PHR"],
+            }
+        },
+    )
+    rebuilt = service.get_index(db_session)
+    assert rebuilt is not index
+    assert rebuilt.suggest_terminals("PHR-3", 26) == (
+        "SPH-001T-P0.5L",
+        "SPH-002T-P0.5S",
+    )
+
+
+def test_get_terminals_falls_back_to_catalog_lookup(db_session: Session):
+    """
+    Test that only part numbers missing from the index hit the catalog.
+    """
+    catalog = CatalogService()
+    service = CompatibilityService(catalog)
+    index = service.get_index(db_session)
+
+    with patch.object(
+        catalog, "get_specifications", wraps=catalog.get_specifications
+    ) as lookup:
+        terminals = service.get_terminals(
+            db_session, index, ["DF13-2630SCF", "PHR-3", "UNKNOWN"]
+        )
+
+    lookup.assert_called_once_with(db_session, {"PHR-3", "UNKNOWN"})
+    assert set(terminals) == {"DF13-2630SCF", "PHR-3"}
+    assert terminals["PHR-3"].gauge_min is None
+
+
+def test_validation_suggests_compatible_terminals(db_session: Session):
+    """
+    Test that compatibility errors list the terminals that would fit.
+    """
+    harness = models.Harness(name="Suggestion Harness")
+    connector = models.Connector(
+        logical_id="C1", manufacturer="JST", part_number="PHR-3", harness=harness
+    )
+    wire = models.Wire(
+        logical_id="W1",
+        manufacturer="Test",
+        part_number="UL1007-26-RD",
+        color="RD",
+        gauge=26,
+        length=100,
+        harness=harness,
+    )
+    pin1 = models.Pin(logical_id="1", connector=connector)
+    pin2 = models.Pin(logical_id="2", connector=connector)
+    connection = models.Connection(
+        harness=harness,
+        wire=wire,
+        from_pin=pin1,
+        to_pin=pin2,
+        terminal_part_number_b="DF13-2630SCF",
+    )
+    db_session.add_all([harness, connector, wire, pin1, pin2, connection])
+    db_session.commit()
+
+    errors = ValidationService().validate_harness(
+        db_session, harness, models.ProjectSettings()
+    )
+
+    series_errors = [e for e in errors if e.error_type == "CompatibilityError"]
+    assert len(series_errors) == 1
+    assert "not compatible with connector series PHR" in series_errors[0].message
+    assert "Compatible terminals: SPH-002T-P0.5S." in series_errors[0].message
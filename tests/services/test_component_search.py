@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.services.catalog import catalog_service, normalize_part_number, trigrams
+from app.services.component_search import ComponentQuery, component_search_service
+
+pytestmark = pytest.mark.usefixtures("catalog")
+
+
+def _part_numbers(db: Session, query: ComponentQuery) -> list[str]:
+    result = component_search_service.search(db, query)
+    return [item.data.part_number for item in result.items]
+
+
+def test_normalize_and_trigrams():
+    """
+    Test that part numbers are compared on their upper-cased alphanumerics.
+    """
+    assert normalize_part_number("df13-3s 1.25c") == "DF133S125C"
+    assert trigrams("ph-r3") == {"PHR", "HR3"}
+    assert trigrams("J1") == {"J1"}
+
+
+def test_prefix_search_ignores_case_and_punctuation(db_session: Session):
+    """
+    Test that a query matching the start of part numbers finds them.
+    """
+    # Prefix matches rank ahead of similar part numbers
+    assert _part_numbers(db_session, ComponentQuery(q="ul1007 22")) == [
+        "UL1007-22-BK",
+        "UL1007-26-RD",
+    ]
+    assert _part_numbers(db_session, ComponentQuery(q="DF13")) == [
+        "DF13-2630SCF",
+        "DF13-3S-1.25C",
+    ]
+
+
+def test_fuzzy_search_tolerates_typos_and_matches_names(db_session: Session):
+    """
+    Test that trigram matching finds parts despite typos, ranking prefix
+    matches first and closer matches higher.
+    """
+    # One wrong character in the middle of the part number
+    assert _part_numbers(db_session, ComponentQuery(q="SPH-002X-P0.5S"))[0] == (
+        "SPH-002T-P0.5S"
+    )
+    # Words from the name
+    assert _part_numbers(db_session, ComponentQuery(q="crimp terminal")) == [
+        "171662-0153",
+        "DF13-2630SCF",
+        "SPH-002T-P0.5S",
+    ]
+    assert _part_numbers(db_session, ComponentQuery(q="zzzz")) == []
+
+
+def test_filters_facets_and_pagination(db_session: Session):
+    """
+    Test that filters narrow the results, facets count the matching parts and
+    pages slice them in a stable order.
+    """
+    result = component_search_service.search(
+        db_session, ComponentQuery(component_type="connector", page_size=2)
+    )
+    assert result.total == 3
+    assert [item.id for item in result.items] == ["DF13-3S-1.25C", "OLD-CONN-01"]
+    assert result.items[0].data.pins[-1].id == "3"
+    assert result.facets.component_type == {"connector": 3}
+    assert result.facets.manufacturer == {"Hirose": 1, "JST": 1}
+    assert result.facets.pin_count == {"3": 2, "4": 1}
+
+    page_2 = component_search_service.search(
+        db_session, ComponentQuery(component_type="connector", page=2, page_size=2)
+    )
+    assert [item.id for item in page_2.items] == ["PHR-3"]
+
+    wires = component_search_service.search(db_session, ComponentQuery(gauge=22))
+    assert [item.name for item in wires.items] == ["22 AWG Black"]
+
+
+def test_search_matches_the_query_once_per_statement(db_session: Session):
+    """
+    Test that the page, total and facets take two statements, each reading the
+    trigram index once.
+    """
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = component_search_service.search(
+            db_session, ComponentQuery(q="crimp terminal")
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 2
+    assert [s.count("FROM catalog_part_trigrams") for s in statements] == [1, 1]
+    assert result.total == 3
+    assert result.facets.component_type == {"terminal": 3}
+
+
+def test_etag_changes_with_catalog(db_session: Session):
+    """
+    Test that the ETag is stable for a query until the catalog changes.
+    """
+    query = ComponentQuery(q="PHR")
+    etag = component_search_service.etag(db_session, query)
+
+    assert component_search_service.etag(db_session, query) == etag
+    assert component_search_service.etag(db_session, ComponentQuery(q="X")) != etag
+
+    catalog_service.upsert_specifications(db_session, {"PHR-4": {"pins": None}})
+    assert component_search_service.etag(db_session, query) != etag
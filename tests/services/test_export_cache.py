@@ -0,0 +1,90 @@
+import os
+import time
+from pathlib import Path
+
+from app.services.export_cache import ExportCache, cache_key
+
+
+def _writer(content: bytes, calls: list[str]):
+    def create(path: str) -> None:
+        calls.append(path)
+        Path(path).write_bytes(content)
+
+    return create
+
+
+def test_cache_key_ignores_dict_order():
+    assert cache_key({"a": 1, "b": [1, 2]}) == cache_key({"b": [1, 2], "a": 1})
+    assert cache_key({"a": 1}) != cache_key({"a": 2})
+
+
+def test_get_or_create_writes_once(tmp_path):
+    cache = ExportCache(tmp_path, max_bytes=1000)
+    calls: list[str] = []
+
+    first = cache.get_or_create("ab12", ".dxf", _writer(b"dxf", calls))
+    second = cache.get_or_create("ab12", ".dxf", _writer(b"other", calls))
+
+    assert first == second
+    assert Path(first).read_bytes() == b"dxf"
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Only the output is left, no temporary file
+    assert os.listdir(Path(first).parent) == [Path(first).name]
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = ExportCache(tmp_path, max_bytes=250)
+    calls: list[str] = []
+    paths = {
+        key: cache.get_or_create(key, ".csv", _writer(b"x" * 100, calls))
+        for key in ("aa", "bb")
+    }
+    # Using "aa" makes "bb" the least recently used
+    cache.get_or_create("aa", ".csv", _writer(b"", calls))
+
+    cache.get_or_create("cc", ".csv", _writer(b"x" * 100, calls))
+
+    assert cache.size == 200
+    assert Path(paths["aa"]).exists()
+    assert not Path(paths["bb"]).exists()
+
+    # A new instance picks up the files left on disk
+    reopened = ExportCache(tmp_path, max_bytes=250)
+    assert reopened.size == 200
+    reopened.get_or_create("aa", ".csv", _writer(b"", calls))
+    assert reopened.hits == 1
+
+
+def test_recently_returned_files_are_kept(tmp_path):
+    cache = ExportCache(tmp_path, max_bytes=150, min_age=60)
+    calls: list[str] = []
+    old = cache.get_or_create("aa", ".csv", _writer(b"x" * 100, calls))
+    recent = cache.get_or_create("bb", ".csv", _writer(b"x" * 100, calls))
+    # "aa" was last used before the minimum age, "bb" was just returned
+    past = time.time() - 120
+    os.utime(old, (past, past))
+
+    cache.get_or_create("cc", ".csv", _writer(b"x" * 100, calls))
+
+    assert not Path(old).exists()
+    assert Path(recent).exists()
+    assert cache.size == 200
+
+
+def test_instances_share_the_directory(tmp_path):
+    """
+    Test that processes sharing the directory see each other's files and uses.
+    """
+    first = ExportCache(tmp_path, max_bytes=250)
+    second = ExportCache(tmp_path, max_bytes=250)
+    calls: list[str] = []
+    shared = first.get_or_create("aa", ".csv", _writer(b"x" * 100, calls))
+    first.get_or_create("bb", ".csv", _writer(b"x" * 100, calls))
+    # A hit in the second instance makes "bb" the least recently used
+    assert second.get_or_create("aa", ".csv", _writer(b"", calls)) == shared
+
+    second.get_or_create("cc", ".csv", _writer(b"x" * 100, calls))
+
+    assert Path(shared).exists()
+    assert sorted(p.name for p in tmp_path.glob("*/*")) == ["aa.csv", "cc.csv"]
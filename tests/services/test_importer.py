@@ -0,0 +1,271 @@
+import io
+import math
+from unittest.mock import patch
+
+import ezdxf
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.catalog import CatalogService
+from app.services.importer import ImporterService, decode_dxf
+from app.services.spatial_index import GridIndex
+
+pytestmark = pytest.mark.usefixtures("catalog")
+
+
+def _new_doc(dxfversion: str = "R2013") -> ezdxf.document.Drawing:
+    doc = ezdxf.new(dxfversion)
+    block = doc.blocks.new(name="CONNECTOR")
+    block.add_attdef("REF_DES", (0, 0))
+    block.add_attdef("PART_NUMBER", (0, 1))
+    return doc
+
+
+def _add_connector(
+    doc: ezdxf.document.Drawing,
+    ref_des: str,
+    part_number: str,
+    insert: tuple[float, float],
+    rotation: float = 0.0,
+) -> None:
+    block_ref = doc.modelspace().add_blockref(
+        "CONNECTOR", insert, dxfattribs={"rotation": rotation}
+    )
+    block_ref.add_auto_attribs({"REF_DES": ref_des, "PART_NUMBER": part_number})
+
+
+def _to_stream(doc: ezdxf.document.Drawing) -> io.BytesIO:
+    stream = io.StringIO()
+    doc.write(stream)
+    return io.BytesIO(stream.getvalue().encode("utf-8"))
+
+
+def _build_dxf(blocks: list[tuple[str, str]]) -> io.BytesIO:
+    """Builds an in-memory DXF with one connector INSERT per (ref_des, part)."""
+    doc = _new_doc()
+    for i, (ref_des, part_number) in enumerate(blocks):
+        _add_connector(doc, ref_des, part_number, (i * 10, 0))
+    return _to_stream(doc)
+
+
+@pytest.fixture
+def project(db_session: Session) -> models.Project:
+    project = models.Project(name="Import Project")
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+def test_import_dxf_creates_connectors_and_pins(
+    db_session: Session, project: models.Project
+):
+    """
+    Test that connectors are imported with catalog specs and catalog-driven pins.
+    """
+    dxf_file = _build_dxf(
+        [("J1", "PHR-3"), ("J2", "OLD-CONN-01"), ("J3", "UNKNOWN-PART")]
+    )
+
+    importer = ImporterService(catalog_service=CatalogService())
+    harness = importer.import_dxf(
+        db=db_session, dxf_file=dxf_file, project_id=project.id
+    )
+
+    connectors = {c.logical_id: c for c in harness.connectors}
+    assert set(connectors) == {"J1", "J2", "J3"}
+    assert connectors["J1"].voltage_rating == 100.0
+    assert len(connectors["J1"].pins) == 3
+    assert connectors["J2"].is_rohs is False
+    assert len(connectors["J2"].pins) == 4
+    # Parts missing from the catalog are imported without specs or pins
+    assert connectors["J3"].voltage_rating is None
+    assert connectors["J3"].pins == []
+
+    design = (
+        db_session.query(models.HarnessDesign)
+        .filter(models.HarnessDesign.harness_id == harness.id)
+        .one()
+    )
+    assert design.project_id == project.id
+
+
+def test_import_dxf_resolves_catalog_in_one_batch(
+    db_session: Session, project: models.Project
+):
+    """
+    Test that all distinct part numbers are resolved with a single batch lookup.
+    """
+    dxf_file = _build_dxf([(f"J{i}", "PHR-3") for i in range(20)])
+    catalog = CatalogService()
+
+    with (
+        patch.object(
+            catalog, "get_specifications", wraps=catalog.get_specifications
+        ) as batch_lookup,
+        patch.object(catalog, "get_specification") as single_lookup,
+    ):
+        importer = ImporterService(catalog_service=catalog)
+        harness = importer.import_dxf(
+            db=db_session, dxf_file=dxf_file, project_id=project.id
+        )
+
+    batch_lookup.assert_called_once_with(db_session, {"PHR-3"})
+    single_lookup.assert_not_called()
+    assert len(harness.connectors) == 20
+
+
+def test_import_dxf_snaps_wires_to_pins(db_session: Session, project: models.Project):
+    """
+    Test that LINE and LWPOLYLINE wires become wires and connections between the
+    pins their endpoints snap to.
+    """
+    doc = _new_doc()
+    # PHR-3 pins sit at x = 0, 2, 4 relative to the insertion point
+    _add_connector(doc, "J1", "PHR-3", (0, 0))
+    _add_connector(doc, "J2", "PHR-3", (100, 50), rotation=90)
+    msp = doc.modelspace()
+    # J1-2 to J2-2, drawn on a layer named after a catalog wire
+    msp.add_line((2, 0), (100, 52), dxfattribs={"layer": "UL1007-26-RD"})
+    # J1-3 to J2-3, within snap tolerance at both ends
+    msp.add_lwpolyline([(4.2, 0.1), (50, 0), (99.9, 54)])
+    # Dangling and closed geometry is not imported
+    msp.add_line((500, 500), (600, 600))
+    msp.add_lwpolyline([(0, 0), (4, 0), (4, 4)], close=True)
+
+    importer = ImporterService(catalog_service=CatalogService())
+    harness = importer.import_dxf(
+        db=db_session, dxf_file=_to_stream(doc), project_id=project.id
+    )
+
+    assert len(harness.wires) == 2
+    routes = {
+        (
+            f"{c.from_pin.connector.logical_id}-{c.from_pin.logical_id}",
+            f"{c.to_pin.connector.logical_id}-{c.to_pin.logical_id}",
+        ): c.wire
+        for c in harness.connections
+    }
+    assert set(routes) == {("J1-2", "J2-2"), ("J1-3", "J2-3")}
+
+    line_wire = routes[("J1-2", "J2-2")]
+    assert line_wire.part_number == "UL1007-26-RD"
+    assert line_wire.outer_diameter == 1.2
+    assert line_wire.length == pytest.approx(math.hypot(98, 52))
+
+    polyline_wire = routes[("J1-3", "J2-3")]
+    assert polyline_wire.part_number == "Unknown"
+    assert polyline_wire.length == pytest.approx(
+        math.hypot(45.8, 0.1) + math.hypot(49.9, 54)
+    )
+
+
+def test_import_dxf_returns_existing_harness_for_same_file(
+    db_session: Session, project: models.Project
+):
+    """
+    Test that re-importing identical bytes into the same project returns the
+    existing harness without parsing the file again.
+    """
+    content = _build_dxf([("J1", "PHR-3")]).getvalue()
+    importer = ImporterService(catalog_service=CatalogService())
+
+    first = importer.import_dxf(
+        db=db_session, dxf_file=io.BytesIO(content), project_id=project.id
+    )
+    with patch.object(importer, "parse_dxf") as parse:
+        second = importer.import_dxf(
+            db=db_session, dxf_file=io.BytesIO(content), project_id=project.id
+        )
+
+    parse.assert_not_called()
+    assert second.id == first.id
+    assert db_session.query(models.Harness).count() == 1
+
+    # The same file imported into another project creates its own harness
+    other = models.Project(name="Other Project")
+    db_session.add(other)
+    db_session.commit()
+    third = importer.import_dxf(
+        db=db_session, dxf_file=io.BytesIO(content), project_id=other.id
+    )
+    assert third.id != first.id
+
+
+def _legacy_dxf_bytes(ref_des: str, encoding: str, codepage: str) -> bytes:
+    """Builds an R2000 DXF declaring `codepage`, encoded with `encoding`."""
+    doc = _new_doc("R2000")
+    _add_connector(doc, ref_des, "PHR-3", (0, 0))
+    stream = io.StringIO()
+    doc.write(stream)
+    text = stream.getvalue().replace("ANSI_1252", codepage)
+    return text.encode(encoding)
+
+
+def test_decode_dxf():
+    """
+    Test encoding detection from the DXF version, content and $DWGCODEPAGE.
+    """
+
+    def encoding(data: bytes) -> str:
+        return decode_dxf(data)[0]
+
+    # R2007+ files are always UTF-8
+    assert encoding(_to_stream(_new_doc()).getvalue()) == "utf-8"
+    # Legacy files use their declared code page
+    japanese = _legacy_dxf_bytes("コネクタ1", "cp932", "ANSI_932")
+    assert decode_dxf(japanese) == ("cp932", japanese.decode("cp932"))
+    western = _legacy_dxf_bytes("STECKER-Ü", "cp1252", "ANSI_1252")
+    assert encoding(western) == "cp1252"
+    # UTF-8 content in a legacy file is still detected
+    mislabeled = _legacy_dxf_bytes("STECKER-Ü", "utf-8", "ANSI_1252")
+    assert decode_dxf(mislabeled) == ("utf-8", mislabeled.decode())
+    # ...also when it only appears past the start of the file
+    late = _legacy_dxf_bytes("J1", "ascii", "ANSI_1252").replace(
+        b"EOF", b"999\n" + b"x" * 100_000 + "STECKER-Ü".encode() + b"\n  0\nEOF"
+    )
+    assert encoding(late) == "utf-8"
+    # CRLF line ends, with a "…" (\x85) that is not a line break
+    crlf = _legacy_dxf_bytes("J…1", "cp1253", "ANSI_1253").replace(b"\n", b"\r\n")
+    assert encoding(crlf) == "cp1253"
+
+
+def test_parse_rejects_text_invalid_in_its_encoding():
+    dxf_file = io.BytesIO(_legacy_dxf_bytes("J1", "ascii", "ANSI_1252") + b"\x81")
+    importer = ImporterService(catalog_service=CatalogService())
+
+    with pytest.raises(ValueError, match="not valid cp1252 text"):
+        importer.parse_dxf(dxf_file)
+
+
+@pytest.mark.parametrize(
+    "ref_des, encoding, codepage",
+    [("コネクタ1", "cp932", "ANSI_932"), ("STECKER-Ü", "cp1252", "ANSI_1252")],
+)
+def test_parse_legacy_encoding_in_single_pass(
+    ref_des: str, encoding: str, codepage: str
+):
+    """
+    Test that non-UTF-8 drawings are decoded correctly with a single parse.
+    """
+    dxf_file = io.BytesIO(_legacy_dxf_bytes(ref_des, encoding, codepage))
+    importer = ImporterService(catalog_service=CatalogService())
+
+    with patch("app.services.importer.ezdxf.read", wraps=ezdxf.read) as read:
+        parsed = importer.parse_dxf(dxf_file)
+
+    read.assert_called_once()
+    assert [c.logical_id for c in parsed.connectors] == [ref_des]
+
+
+def test_grid_index_nearest_within_tolerance():
+    """
+    Test that the grid index returns the closest item within the tolerance only.
+    """
+    index: GridIndex[str] = GridIndex(tolerance=1.0)
+    index.insert(0.0, 0.0, "a")
+    index.insert(1.5, 0.0, "b")
+
+    assert index.nearest(0.4, 0.0) == "a"
+    assert index.nearest(1.1, 0.0) == "b"  # Crosses a cell boundary
+    assert index.nearest(0.75, 0.9) is None
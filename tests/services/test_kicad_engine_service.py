@@ -1,9 +1,20 @@
+import os
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app.schemas.harness_design import HarnessDesign, Node, NodeData
+from app.schemas.harness_design import (
+    Edge,
+    EdgeData,
+    HarnessDesign,
+    Node,
+    NodeData,
+)
+from app.services.export_cache import ExportCache
 from app.services.kicad_engine_service import KiCadEngineService
+from app.services.kicad_runner import KiCadCliRunner
+from app.services.scratch import ScratchWorkspace
 
 
 @pytest.fixture
@@ -27,14 +38,31 @@ def dummy_design_data() -> HarnessDesign:
                 data=NodeData(id="3", label="CONN2"),
             ),
         ],
-        edges=[],
+        edges=[
+            Edge(
+                id="e1",
+                source="1",
+                target="3",
+                sourceHandle="1",
+                targetHandle="2",
+                data=EdgeData(wire_id="W1", color="red"),
+            ),
+            Edge(
+                id="e2",
+                source="3",
+                target="1",
+                sourceHandle="1",
+                targetHandle="2",
+                data=EdgeData(wire_id="W2", color="black"),
+            ),
+        ],
     )
 
 
 def test_generate_sch_from_json(dummy_design_data):
     """
-    Test that generate_sch_from_json correctly processes nodes
-    and interacts with the kicad_sch_api mock.
+    Test that generate_sch_from_json places a connector symbol with a pin for
+    each wire end, and labels each pin with its net.
     """
     with patch("app.services.kicad_engine_service.ksa") as mock_ksa:
         # Arrange
@@ -50,64 +78,208 @@ def test_generate_sch_from_json(dummy_design_data):
         # Only connector nodes should result in a call to add component
         assert mock_sch.components.add.call_count == 2
         mock_sch.components.add.assert_any_call(
-            lib_id="Connector:Conn_01x02", ref="U1", value="Conn", unit=1
+            lib_id="Connector_Generic:Conn_01x02",
+            reference="J1",
+            value="CONN1",
+            position=(50.8, 25.4),
         )
         mock_sch.components.add.assert_any_call(
-            lib_id="Connector:Conn_01x02", ref="U3", value="Conn", unit=1
+            lib_id="Connector_Generic:Conn_01x02",
+            reference="J2",
+            value="CONN2",
+            position=(50.8, 38.1),
         )
+        labels = {
+            call.kwargs["pin"]: call.args[0] for call in mock_sch.add_label.mock_calls
+        }
+        assert labels == {
+            ("J1", "1"): "CONN1-1",
+            ("J2", "2"): "CONN1-1",
+            ("J1", "2"): "CONN1-2",
+            ("J2", "1"): "CONN1-2",
+        }
         mock_sch.save.assert_called_once_with(sch_path)
 
 
-def test_export_dxf():
+def test_generate_sch_keeps_handle_pin_numbers():
     """
-    Test that export_dxf calls subprocess.run with the correct arguments.
+    Test that pins keep the numbers of their handles, with unwired pins left
+    in between, and that symbols are sized from the catalog pin count.
     """
-    with patch("app.services.kicad_engine_service.subprocess.run") as mock_subprocess:
-        # Arrange
-        cli_path = "/usr/bin/kicad-cli"
-        service = KiCadEngineService(cli_path=cli_path)
-        sch_path = "/tmp/dummy.kicad_sch"
+    design = HarnessDesign(
+        nodes=[
+            Node(
+                id="1",
+                type="connector",
+                position={},
+                data=NodeData(id="1", label="CONN1"),
+            ),
+            Node(
+                id="2",
+                type="connector",
+                position={},
+                data=NodeData(id="2", label="CONN2", part_number="PHR-6"),
+            ),
+        ],
+        edges=[
+            Edge(
+                id="e1",
+                source="1",
+                target="2",
+                sourceHandle="1",
+                targetHandle="1",
+                data=EdgeData(wire_id="W1", color="red"),
+            ),
+            Edge(
+                id="e2",
+                source="1",
+                target="2",
+                sourceHandle="4",
+                targetHandle="3",
+                data=EdgeData(wire_id="W2", color="black"),
+            ),
+        ],
+    )
+    with patch("app.services.kicad_engine_service.ksa") as mock_ksa:
+        mock_sch = MagicMock()
+        mock_ksa.Schematic.return_value = mock_sch
+        service = KiCadEngineService(cli_path="/usr/bin/kicad-cli")
 
-        # Act
+        service.generate_sch_from_json(design, pin_counts={"PHR-6": 6})
+
+        lib_ids = [call.kwargs["lib_id"] for call in mock_sch.components.add.mock_calls]
+        assert lib_ids == [
+            "Connector_Generic:Conn_01x04",
+            "Connector_Generic:Conn_01x06",
+        ]
+        labels = {
+            call.kwargs["pin"]: call.args[0] for call in mock_sch.add_label.mock_calls
+        }
+        assert labels == {
+            ("J1", "1"): "CONN1-1",
+            ("J2", "1"): "CONN1-1",
+            ("J1", "4"): "CONN1-4",
+            ("J2", "3"): "CONN1-4",
+        }
+
+
+def test_generate_sch_writes_connected_schematic(
+    dummy_design_data, symbol_cache, tmp_path
+):
+    """
+    Test that a generated schematic embeds the connector symbols and labels
+    both ends of each wire, parsing the symbol library once.
+    """
+    workspace = ScratchWorkspace(tmp_path / "scratch", quota_bytes=1 << 20, max_age=60)
+    service = KiCadEngineService(cli_path="/usr/bin/kicad-cli", workspace=workspace)
+
+    content = Path(service.generate_sch_from_json(dummy_design_data)).read_text()
+
+    assert '(symbol "Connector_Generic:Conn_01x02"' in content
+    assert content.count('(label "CONN1-1"') == 2
+    assert content.count('(label "CONN1-2"') == 2
+    assert symbol_cache.parsed_files == 1
+
+
+def test_export_dxf(stub_kicad_cli: str, tmp_path):
+    """
+    Test that export_dxf runs kicad-cli and returns the DXF it wrote.
+    """
+    service = KiCadEngineService(
+        cli_path=stub_kicad_cli, runner=KiCadCliRunner(stub_kicad_cli)
+    )
+    sch_path = str(tmp_path / "dummy.kicad_sch")
+
+    dxf_path = service.export_dxf(sch_path)
+
+    assert dxf_path.endswith(".dxf")
+    assert Path(dxf_path).read_text().startswith("0\nSECTION")
+    os.remove(dxf_path)
+
+
+def test_export_bom(stub_kicad_cli: str, tmp_path):
+    """
+    Test that export_bom runs kicad-cli and returns the BOM it wrote, and
+    that a scratch scope removes the BOM and kicad-cli's output directory.
+    """
+    workspace = ScratchWorkspace(tmp_path / "scratch", quota_bytes=1 << 20, max_age=60)
+    service = KiCadEngineService(
+        cli_path=stub_kicad_cli,
+        runner=KiCadCliRunner(stub_kicad_cli),
+        workspace=workspace,
+    )
+    sch_path = str(tmp_path / "dummy.kicad_sch")
+
+    with workspace.scope() as scope:
+        bom_path = service.export_bom(sch_path, scope=scope)
+
+        assert bom_path.endswith(".csv")
+        assert Path(bom_path).read_text() == "Reference,Value\n"
+        assert os.listdir(workspace.root) == [scope.path.name]
+
+    assert os.listdir(workspace.root) == []
+
+
+def test_exports_are_cached(dummy_design_data, stub_kicad_cli: str, tmp_path):
+    """
+    Test that with a cache, an unchanged design is neither regenerated nor
+    exported again, and that a changed design is.
+    """
+    runner = KiCadCliRunner(stub_kicad_cli)
+    cache = ExportCache(tmp_path / "cache", max_bytes=1 << 20)
+    service = KiCadEngineService(cli_path=stub_kicad_cli, runner=runner, cache=cache)
+
+    with patch("app.services.kicad_engine_service.ksa") as mock_ksa:
+        mock_sch = mock_ksa.Schematic.return_value
+        mock_sch.save.side_effect = lambda path: Path(path).write_text("(kicad_sch)")
+
+        sch_path = service.generate_sch_from_json(dummy_design_data)
         dxf_path = service.export_dxf(sch_path)
+        bom_path = service.export_bom(sch_path)
+        with patch.object(runner, "run") as run:
+            assert service.generate_sch_from_json(dummy_design_data) == sch_path
+            assert service.export_dxf(sch_path) == dxf_path
+            assert service.export_bom(sch_path) == bom_path
+            run.assert_not_called()
+        assert mock_ksa.Schematic.call_count == 1
 
-        # Assert
-        mock_subprocess.assert_called_once()
-        call_args = mock_subprocess.call_args[0][0]
-        assert call_args[0] == cli_path
-        assert "sch" in call_args
-        assert "export" in call_args
-        assert "dxf" in call_args
-        assert "--output" in call_args
-        assert dxf_path in call_args
-        assert sch_path in call_args
-
-
-def test_export_bom():
+        dummy_design_data.nodes.pop()
+        assert service.generate_sch_from_json(dummy_design_data) != sch_path
+        assert mock_ksa.Schematic.call_count == 2
+
+    assert Path(dxf_path).read_text().startswith("0\nSECTION")
+    assert (cache.hits, cache.misses) == (3, 4)
+
+
+def test_run_pipeline(dummy_design_data, stub_kicad_cli: str, tmp_path):
     """
-    Test that export_bom calls subprocess.run with the correct arguments.
+    Test that run_pipeline generates the schematic once and returns it with
+    every requested export.
     """
-    with (
-        patch("app.services.kicad_engine_service.subprocess.run") as mock_subprocess,
-        patch("app.services.kicad_engine_service.Path.rename"),
-        patch(
-            "app.services.kicad_engine_service.Path.glob", return_value=[MagicMock()]
-        ),
-    ):
-        # Arrange
-        cli_path = "/usr/bin/kicad-cli"
-        service = KiCadEngineService(cli_path=cli_path)
-        sch_path = "/tmp/dummy.kicad_sch"
+    workspace = ScratchWorkspace(tmp_path / "scratch", quota_bytes=1 << 20, max_age=60)
+    service = KiCadEngineService(
+        cli_path=stub_kicad_cli,
+        runner=KiCadCliRunner(stub_kicad_cli, max_workers=2),
+        workspace=workspace,
+    )
 
-        # Act
-        service.export_bom(sch_path)
+    with patch("app.services.kicad_engine_service.ksa") as mock_ksa:
+        mock_sch = mock_ksa.Schematic.return_value
+        mock_sch.save.side_effect = lambda path: Path(path).write_text("(kicad_sch)")
 
-        # Assert
-        mock_subprocess.assert_called_once()
-        call_args = mock_subprocess.call_args[0][0]
-        assert call_args[0] == cli_path
-        assert "sch" in call_args
-        assert "export" in call_args
-        assert "bom" in call_args
-        assert "--output-dir" in call_args
-        assert sch_path in call_args
+        with pytest.raises(ValueError, match="svg"):
+            service.run_pipeline(dummy_design_data, ["dxf", "svg"])
+        mock_ksa.Schematic.assert_not_called()
+
+        with workspace.scope() as scope:
+            artifacts = service.run_pipeline(
+                dummy_design_data, ["bom", "dxf", "bom"], scope=scope
+            )
+
+            assert mock_ksa.Schematic.call_count == 1
+            assert list(artifacts) == ["kicad_sch", "bom", "dxf"]
+            assert Path(artifacts["kicad_sch"]).read_text() == "(kicad_sch)"
+            assert Path(artifacts["dxf"]).read_text().startswith("0\nSECTION")
+            assert Path(artifacts["bom"]).read_text() == "Reference,Value\n"
+
+    assert not Path(artifacts["dxf"]).exists()
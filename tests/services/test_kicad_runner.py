@@ -0,0 +1,108 @@
+import asyncio
+import subprocess
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from app.exceptions import KiCadBusyException, KiCadTimeoutException
+from app.services.kicad_runner import KiCadCliRunner
+
+
+def test_run_is_limited_to_the_pool(stub_kicad_cli: str):
+    """
+    Test that commands beyond the number of workers wait for a free one.
+    """
+    runner = KiCadCliRunner(stub_kicad_cli, max_workers=2, queue_size=4)
+
+    start = time.perf_counter()
+    futures = [runner.submit(["sleep", "0.3"]) for _ in range(4)]
+    results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    assert [result.returncode for result in results] == [0] * 4
+    assert elapsed >= 0.6
+    assert runner.pending == 0
+    runner.shutdown()
+
+
+def test_full_queue_rejects_commands(stub_kicad_cli: str):
+    runner = KiCadCliRunner(stub_kicad_cli, max_workers=1, queue_size=1)
+    running = runner.submit(["sleep", "0.5"])
+    queued = runner.submit(["sleep", "0"])
+
+    with pytest.raises(KiCadBusyException):
+        runner.submit(["sleep", "0"])
+
+    queued.cancel()
+    running.result()
+    # The cancelled command freed its place in the queue
+    assert runner.pending == 0
+    assert runner.run(["sleep", "0"]).returncode == 0
+    runner.shutdown()
+
+
+def test_failures_and_timeouts(stub_kicad_cli: str):
+    runner = KiCadCliRunner(stub_kicad_cli, timeout=0.2)
+
+    with pytest.raises(subprocess.CalledProcessError) as failure:
+        runner.run(["fail"])
+    assert b"stub kicad-cli failure" in failure.value.stderr
+
+    start = time.perf_counter()
+    with pytest.raises(KiCadTimeoutException):
+        runner.run(["sleep", "10"])
+    assert time.perf_counter() - start < 5
+    assert runner.pending == 0
+    runner.shutdown()
+
+
+def test_cancelling_run_async_kills_the_process(stub_kicad_cli: str):
+    runner = KiCadCliRunner(stub_kicad_cli, max_workers=1)
+
+    async def cancel_after_start() -> float:
+        task = asyncio.create_task(runner.run_async(["sleep", "10"]))
+        await asyncio.sleep(0.3)
+        start = time.perf_counter()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The worker is free again once the killed process is reaped
+        await runner.run_async(["sleep", "0"])
+        return time.perf_counter() - start
+
+    assert asyncio.run(cancel_after_start()) < 5
+    assert runner.pending == 0
+    runner.shutdown()
+
+
+def test_shutdown_fails_pending_commands(stub_kicad_cli: str):
+    """
+    Test that callers waiting on running or queued commands are released when
+    the runner shuts down.
+    """
+    runner = KiCadCliRunner(stub_kicad_cli, max_workers=1)
+    errors: dict[str, BaseException] = {}
+
+    def run(name: str) -> None:
+        try:
+            runner.run(["sleep", "10"])
+        except BaseException as e:
+            errors[name] = e
+
+    callers = [threading.Thread(target=run, args=(name,)) for name in ("a", "b")]
+    for caller in callers:
+        caller.start()
+    time.sleep(0.3)
+
+    start = time.perf_counter()
+    runner.shutdown()
+    for caller in callers:
+        caller.join(timeout=5)
+
+    assert time.perf_counter() - start < 5
+    assert not any(caller.is_alive() for caller in callers)
+    assert all(isinstance(e, CancelledError) for e in errors.values())
+    assert len(errors) == 2
+    assert runner.pending == 0
@@ -0,0 +1,148 @@
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.exceptions import HarnessNotFoundException
+from app.services.netlist import (
+    DisjointSet,
+    HarnessTopology,
+    build_nets,
+    continuity_tests,
+    netlist_service,
+)
+
+
+def test_disjoint_set_merges_sets():
+    sets = DisjointSet(range(6))
+    sets.union(0, 1)
+    sets.union(2, 3)
+    sets.union(1, 3)
+
+    assert sets.find(0) == sets.find(3)
+    assert sets.find(4) != sets.find(5)
+    assert sorted(sorted(group) for group in sets.groups().values()) == [
+        [0, 1, 2, 3],
+        [4],
+        [5],
+    ]
+
+
+def test_build_nets_on_a_long_chain():
+    """
+    Test that a chain of tens of thousands of wires forms one net, with the
+    unwired pins left as single-pin nets.
+    """
+    pins = [uuid.uuid4() for _ in range(20_002)]
+    labels = {pin_id: f"J{n}-1" for n, pin_id in enumerate(pins)}
+    connections = [(pins[n], pins[n + 1], f"W{n}") for n in range(20_000)]
+
+    nets = build_nets(labels, connections)
+
+    assert len(nets) == 2
+    chain = next(net for net in nets if len(net.pins) > 1)
+    assert len(chain.pins) == 20_001
+    assert len(chain.wires) == 20_000
+    assert chain.name == "J0-1"
+    assert [net.pins for net in nets if net is not chain] == [["J20001-1"]]
+
+
+def test_topology_counts_wire_ends_and_shorts():
+    connector_a, connector_b = uuid.uuid4(), uuid.uuid4()
+    a1, a2, a3, b1 = (uuid.uuid4() for _ in range(4))
+    topology = HarnessTopology(
+        [(a1, connector_a), (a2, connector_a), (a3, connector_a), (b1, connector_b)],
+        # A1 and A2 meet at B1, so they are shorted through two wires; a
+        # loopback on A3 is one wire on it
+        [(a1, b1), (a2, b1), (a3, a3)],
+    )
+
+    assert (topology.usage[a1], topology.usage[b1], topology.usage[a3]) == (1, 2, 1)
+    assert topology.shorted_with(connector_a, a1) == [a2]
+    assert topology.shorted_with(connector_a, a3) == []
+    assert topology.shorted_with(connector_b, b1) == []
+
+    # A jumper between two pins of a connector is not a short, even when the
+    # net continues to another connector
+    chain = HarnessTopology(
+        [(a1, connector_a), (a2, connector_a), (b1, connector_b)],
+        [(a1, a2), (a2, b1)],
+    )
+    assert chain.shorted_with(connector_a, a1) == []
+    assert chain.shorted_with(connector_a, a2) == []
+
+
+def test_get_nets(db_session: Session):
+    harness = models.Harness(name="Nets")
+    db_session.add(harness)
+    db_session.flush()
+    pins = {}
+    for connector_label in ("J1", "J2"):
+        connector = models.Connector(
+            logical_id=connector_label,
+            manufacturer="Test",
+            part_number="CONN",
+            harness_id=harness.id,
+        )
+        db_session.add(connector)
+        for pin_label in ("1", "2"):
+            pin = models.Pin(logical_id=pin_label, connector=connector)
+            db_session.add(pin)
+            pins[f"{connector_label}-{pin_label}"] = pin
+    wire = models.Wire(
+        logical_id="W1",
+        manufacturer="Test",
+        part_number="WIRE",
+        color="RD",
+        gauge=22,
+        length=100,
+        harness_id=harness.id,
+    )
+    db_session.add(wire)
+    db_session.flush()
+    db_session.add(
+        models.Connection(
+            harness_id=harness.id,
+            wire_id=wire.id,
+            from_pin_id=pins["J1-1"].id,
+            to_pin_id=pins["J2-2"].id,
+        )
+    )
+    db_session.commit()
+
+    nets = netlist_service.get_nets(db_session, harness.id)
+
+    assert [(net.name, net.pins, net.wires) for net in nets] == [
+        ("J1-1", ["J1-1", "J2-2"], ["W1"]),
+        ("J1-2", ["J1-2"], []),
+        ("J2-1", ["J2-1"], []),
+    ]
+
+
+def test_get_nets_unknown_harness(db_session: Session):
+    with pytest.raises(HarnessNotFoundException):
+        netlist_service.get_nets(db_session, uuid.uuid4())
+
+
+def test_continuity_tests_cover_every_pin_pair():
+    nets = [
+        schemas.Net(name="J1-1", pins=["J1-1", "J2-1", "J3-1"], wires=["W1", "W2"]),
+        schemas.Net(name="J1-2", pins=["J1-2"], wires=[]),
+        schemas.Net(name="J2-2", pins=["J2-2", "J3-2"], wires=["W3"]),
+    ]
+
+    rows = list(continuity_tests(nets))
+
+    assert rows[:4] == [
+        ("CONTINUITY", "J1-1", "J2-1", "J1-1", "J1-1"),
+        ("CONTINUITY", "J1-1", "J3-1", "J1-1", "J1-1"),
+        ("CONTINUITY", "J2-1", "J3-1", "J1-1", "J1-1"),
+        ("CONTINUITY", "J2-2", "J3-2", "J2-2", "J2-2"),
+    ]
+    isolation = rows[4:]
+    assert {row[0] for row in isolation} == {"ISOLATION"}
+    # 6 pins make 15 pairs, 4 of them within a net
+    assert len(isolation) == 11
+    assert len({frozenset(row[1:3]) for row in rows}) == 15
+    assert ("ISOLATION", "J1-2", "J3-2", "J1-2", "J2-2") in isolation
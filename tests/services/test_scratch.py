@@ -0,0 +1,69 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.exceptions import ScratchQuotaException
+from app.services.scratch import ScratchWorkspace
+
+
+def test_scope_removes_its_files(tmp_path):
+    workspace = ScratchWorkspace(tmp_path, quota_bytes=1000, max_age=3600)
+
+    with workspace.scope() as scope:
+        path = Path(scope.new_file(".dxf"))
+        path.write_bytes(b"x" * 10)
+        Path(scope.new_dir()).joinpath("bom.csv").write_bytes(b"y" * 5)
+        assert path.suffix == ".dxf"
+        assert workspace.metrics()["active_scopes"] == 1
+        assert workspace.metrics()["bytes_in_use"] == 15
+
+    assert not path.exists()
+    assert os.listdir(tmp_path) == []
+    metrics = workspace.metrics()
+    assert metrics["active_scopes"] == 0
+    assert metrics["bytes_in_use"] == 0
+    assert metrics["bytes_released"] == 15
+
+
+def test_sweep_removes_old_unscoped_files(tmp_path):
+    workspace = ScratchWorkspace(tmp_path, quota_bytes=1000, max_age=60)
+    old = Path(workspace.new_file(".sch"))
+    old.write_bytes(b"x" * 10)
+    stale = time.time() - 120
+    os.utime(old, (stale, stale))
+    new = Path(workspace.new_file(".sch"))
+    new.write_bytes(b"x" * 10)
+
+    with workspace.scope() as scope:
+        # A scope in use is never swept, however old
+        os.utime(scope.path, (stale, stale))
+        assert workspace.sweep() == 10
+        assert scope.path.exists()
+
+    assert not old.exists()
+    assert new.exists()
+
+
+def test_quota_refuses_new_files(tmp_path):
+    workspace = ScratchWorkspace(tmp_path, quota_bytes=10, max_age=3600)
+    Path(workspace.new_file()).write_bytes(b"x" * 10)
+
+    with pytest.raises(ScratchQuotaException):
+        workspace.new_file()
+    with pytest.raises(ScratchQuotaException):
+        with workspace.scope():
+            pass
+
+    assert workspace.metrics()["quota_rejections"] == 2
+
+
+def test_quota_counts_files_left_by_previous_processes(tmp_path):
+    tmp_path.joinpath("left-over.dxf").write_bytes(b"x" * 10)
+    workspace = ScratchWorkspace(tmp_path, quota_bytes=10, max_age=3600)
+
+    # The first allocation sweeps, which counts what it keeps
+    with pytest.raises(ScratchQuotaException):
+        workspace.new_file()
+    assert workspace.usage() == 10
@@ -0,0 +1,25 @@
+import os
+
+from app.services.symbol_library import SymbolLibraryCache
+
+
+def test_library_is_parsed_once(symbol_cache: SymbolLibraryCache):
+    for pins in range(1, 5):
+        symbol = symbol_cache.get_symbol(f"Connector_Generic:Conn_01x{pins:02d}")
+        assert symbol is not None
+        assert len(symbol.pins) == pins
+        assert symbol.reference_prefix == "J"
+    assert symbol_cache.get_symbol("Connector_Generic:Conn_01x05") is None
+    assert symbol_cache.parsed_files == 1
+
+
+def test_changed_library_is_parsed_again(symbol_cache: SymbolLibraryCache, tmp_path):
+    library = tmp_path / "Connector_Generic.kicad_sym"
+    symbols = symbol_cache.library_symbols(library)
+    assert symbol_cache.library_symbols(library) is symbols
+
+    stat = library.stat()
+    os.utime(library, (stat.st_atime, stat.st_mtime + 1))
+
+    assert symbol_cache.library_symbols(library).keys() == symbols.keys()
+    assert symbol_cache.parsed_files == 2
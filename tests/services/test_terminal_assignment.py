@@ -0,0 +1,138 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.exceptions import HarnessNotFoundException
+from app.services.catalog import CatalogService, catalog_service
+from app.services.compatibility import CompatibilityService
+from app.services.terminal_assignment import TerminalAssignmentService
+
+pytestmark = pytest.mark.usefixtures("catalog")
+
+
+def _service() -> TerminalAssignmentService:
+    return TerminalAssignmentService(CompatibilityService(CatalogService()))
+
+
+def _make_harness(
+    db: Session, gauges: list[float], terminals: tuple[str | None, str | None]
+) -> models.Harness:
+    """Builds a harness wiring a PHR-3 to a DF13-3S-1.25C, one wire per gauge."""
+    harness = models.Harness(name="Assignment Harness")
+    db.add(harness)
+    db.flush()
+    pins = []
+    for logical_id, part_number in (("J1", "PHR-3"), ("J2", "DF13-3S-1.25C")):
+        connector = models.Connector(
+            id=uuid.uuid4(),
+            logical_id=logical_id,
+            manufacturer="Test",
+            part_number=part_number,
+            harness_id=harness.id,
+        )
+        pin = models.Pin(id=uuid.uuid4(), logical_id="1", connector_id=connector.id)
+        db.add_all([connector, pin])
+        pins.append(pin)
+    for n, gauge in enumerate(gauges):
+        wire = models.Wire(
+            id=uuid.uuid4(),
+            logical_id=f"W{n}",
+            manufacturer="Test",
+            part_number="WIRE",
+            color="RD",
+            gauge=gauge,
+            length=100,
+            harness_id=harness.id,
+        )
+        db.add_all(
+            [
+                wire,
+                models.Connection(
+                    harness_id=harness.id,
+                    wire_id=wire.id,
+                    from_pin_id=pins[0].id,
+                    to_pin_id=pins[1].id,
+                    terminal_part_number_a=terminals[0],
+                    terminal_part_number_b=terminals[1],
+                ),
+            ]
+        )
+    db.commit()
+    return harness
+
+
+def _terminals(db: Session, harness: models.Harness) -> list[tuple[str | None, ...]]:
+    return [
+        tuple(row)
+        for row in db.execute(
+            select(
+                models.Connection.terminal_part_number_a,
+                models.Connection.terminal_part_number_b,
+            ).where(models.Connection.harness_id == harness.id)
+        )
+    ]
+
+
+def test_auto_assign_picks_tightest_compatible_terminal(db_session: Session):
+    """
+    Test that each end gets the compatible terminal with the narrowest gauge
+    range, and that ends without one are reported as unresolved.
+    """
+    catalog_service.upsert_specifications(
+        db_session,
+        {
+            "SPH-WIDE": {
+                "applicable_wire_gauge_min": 20,
+                "applicable_wire_gauge_max": 30,
+                "compatible_connector_series": ["PHR"],
+            }
+        },
+    )
+    harness = _make_harness(db_session, [26, 22], (None, None))
+
+    report = _service().auto_assign(db_session, harness.id)
+
+    assert (report.assigned, report.kept, report.unresolved) == (3, 0, 1)
+    assert sorted(_terminals(db_session, harness), key=str) == sorted(
+        [("SPH-002T-P0.5S", "DF13-2630SCF"), ("SPH-WIDE", None)], key=str
+    )
+    unresolved = [a for a in report.assignments if a.terminal_part_number is None]
+    assert [a.side for a in unresolved] == ["b"]
+
+
+def test_auto_assign_keeps_existing_terminals_unless_overwrite(db_session: Session):
+    """
+    Test that terminals already set are only replaced when asked to.
+    """
+    harness = _make_harness(db_session, [26], ("MANUAL-A", None))
+    service = _service()
+
+    report = service.auto_assign(db_session, harness.id)
+    assert (report.assigned, report.kept) == (1, 1)
+    assert _terminals(db_session, harness) == [("MANUAL-A", "DF13-2630SCF")]
+
+    report = service.auto_assign(db_session, harness.id, overwrite=True)
+    assert (report.assigned, report.kept) == (2, 0)
+    assert _terminals(db_session, harness) == [("SPH-002T-P0.5S", "DF13-2630SCF")]
+    db_session.refresh(harness)
+    assert harness.revision == 2
+
+
+def test_auto_assign_large_harness(db_session: Session):
+    """
+    Test that a harness with thousands of connections is assigned in one pass.
+    """
+    harness = _make_harness(db_session, [26, 28] * 2500, (None, None))
+
+    report = _service().auto_assign(db_session, harness.id)
+
+    assert report.assigned == 10000
+    assert set(_terminals(db_session, harness)) == {("SPH-002T-P0.5S", "DF13-2630SCF")}
+
+
+def test_auto_assign_unknown_harness(db_session: Session):
+    with pytest.raises(HarnessNotFoundException):
+        _service().auto_assign(db_session, uuid.uuid4())
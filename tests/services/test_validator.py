@@ -1,10 +1,18 @@
 # tests/services/test_validator.py
 
+import uuid
+
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models, schemas
+from app.schemas import ValidationError
+from app.services import harness_service
+from app.services.catalog import catalog_service
+from app.services.validator import RuleRegistry, ValidationContext, ValidationService
 
-from app import models
-from app.services.validator import ValidationService
+pytestmark = pytest.mark.usefixtures("catalog")
 
 
 # A reusable mock project settings object for tests
@@ -369,3 +377,404 @@ def test_terminal_compatibility_connector_series_error(
     assert len(errors) == 1
     assert errors[0].error_type == "CompatibilityError"
     assert "not compatible with connector series DF13" in errors[0].message
+
+
+def test_disabled_rules_are_skipped(
+    db_session: Session,
+    mock_harness: models.Harness,
+    mock_project_settings: models.ProjectSettings,
+):
+    """
+    Test that rules disabled in the project settings do not run.
+    """
+    connector = models.Connector(
+        logical_id="C1",
+        manufacturer="Test",
+        part_number="LOW-VOLTAGE-CONN",
+        harness_id=mock_harness.id,
+        voltage_rating=12.0,
+        is_rohs=False,
+    )
+    db_session.add(connector)
+    db_session.commit()
+    validator = ValidationService()
+
+    errors = validator.validate_harness(db_session, mock_harness, mock_project_settings)
+    assert [e.error_type for e in errors] == [
+        "DataQualityError",
+        "ElectricalError",
+        "ComplianceError",
+    ]
+
+    mock_project_settings.disabled_rules = ["missing_specs", "rohs_compliance"]
+    errors = validator.validate_harness(db_session, mock_harness, mock_project_settings)
+    assert [e.error_type for e in errors] == ["ElectricalError"]
+
+
+def test_rules_visit_each_entity_once_and_are_timed(
+    db_session: Session,
+    mock_harness: models.Harness,
+    mock_project_settings: models.ProjectSettings,
+):
+    """
+    Test that a single traversal dispatches each entity to the rules for its
+    type, reports errors grouped by rule and counts rule calls.
+    """
+    for n in range(3):
+        db_session.add(
+            models.Wire(
+                logical_id=f"W{n}",
+                manufacturer="Test",
+                part_number="WIRE",
+                harness_id=mock_harness.id,
+                color="RD",
+                gauge=22,
+                length=100,
+            )
+        )
+    db_session.commit()
+
+    registry = RuleRegistry()
+    visited: list[tuple[str, str]] = []
+
+    @registry.register("first", "wire", description="Flags every wire.")
+    def first(wire: models.Wire, context: ValidationContext):
+        visited.append(("first", wire.logical_id))
+        yield ValidationError(
+            component_id=str(wire.id),
+            component_type="Wire",
+            message=f"first {wire.logical_id}",
+            error_type="TestError",
+        )
+
+    @registry.register("second", "wire", "connector", description="Flags wires.")
+    def second(component: models.Wire, context: ValidationContext):
+        visited.append(("second", component.logical_id))
+        yield ValidationError(
+            component_id=str(component.id),
+            component_type="Wire",
+            message=f"second {component.logical_id}",
+            error_type="TestError",
+        )
+
+    validator = ValidationService(registry=registry)
+    errors = validator.validate_harness(db_session, mock_harness, mock_project_settings)
+
+    wires = sorted(w.logical_id for w in mock_harness.wires)
+    assert sorted(visited) == sorted(
+        [(rule, w) for rule in ("first", "second") for w in wires]
+    )
+    # Grouped by rule in registration order
+    assert [e.message.split()[0] for e in errors] == ["first"] * 3 + ["second"] * 3
+
+    stats = {rule.name: rule for rule in validator.describe_rules()}
+    assert (stats["first"].runs, stats["first"].calls, stats["first"].errors) == (
+        1,
+        3,
+        3,
+    )
+    assert stats["second"].entity_types == ["wire", "connector"]
+    assert stats["second"].seconds >= 0
+
+
+def test_rule_names_are_unique():
+    registry = RuleRegistry()
+    registry.register("rule", "wire", description="")(lambda wire, context: [])
+
+    with pytest.raises(ValueError):
+        registry.register("rule", "connector", description="")(
+            lambda connector, context: []
+        )
+
+
+def _harness_in(wire_gauges: list[float]) -> schemas.HarnessCreate:
+    return schemas.HarnessCreate.model_validate(
+        {
+            "name": "Incremental",
+            "connectors": [
+                {
+                    "id": connector_id,
+                    "manufacturer": "JST",
+                    "part_number": "PHR-3",
+                    "pins": [{"id": str(n)} for n in range(len(wire_gauges))],
+                }
+                for connector_id in ("J1", "J2")
+            ],
+            "wires": [
+                {
+                    "id": f"W{n}",
+                    "manufacturer": "Generic",
+                    "part_number": "UL1007-26-RD",
+                    "color": "RD",
+                    "gauge": gauge,
+                    "length": 100.0,
+                }
+                for n, gauge in enumerate(wire_gauges)
+            ],
+            "connections": [
+                {
+                    "wire_id": f"W{n}",
+                    "from_connector_id": "J1",
+                    "from_pin_id": str(n),
+                    "to_connector_id": "J2",
+                    "to_pin_id": str(n),
+                    "terminal_part_number_a": "SPH-002T-P0.5S",
+                }
+                for n in range(len(wire_gauges))
+            ],
+        }
+    )
+
+
+def _calls(validator: ValidationService) -> dict[str, tuple[int, int]]:
+    return {r.name: (r.calls, r.reused) for r in validator.describe_rules()}
+
+
+def test_revalidation_only_checks_changed_entities(
+    db_session: Session, mock_project_settings: models.ProjectSettings
+):
+    """
+    Test that after an edit only the changed entities and their neighbors are
+    re-checked, with the same result as a full validation.
+    """
+    harness = harness_service.create_harness(
+        db_session, _harness_in([26.0, 22.0, 26.0, 26.0])
+    )
+    connection_ids = {c.id for c in harness.connections}
+    validator = ValidationService()
+    [error] = validator.validate_harness(db_session, harness, mock_project_settings)
+    assert "Wire gauge AWG22.0" in error.message
+    assert _calls(validator)["terminal_compatibility"] == (4, 0)
+
+    # Change the gauge of one wire: only its connection is re-checked, and
+    # the error of W1 is kept
+    harness = harness_service.update_harness(
+        db_session, harness.id, _harness_in([26.0, 22.0, 22.0, 26.0])
+    )
+    assert harness.revision == 1
+    assert {c.id for c in harness.connections} == connection_ids
+    errors = validator.validate_harness(db_session, harness, mock_project_settings)
+
+    calls = _calls(validator)
+    assert calls["terminal_compatibility"] == (5, 1)
+    # Connectors are not re-checked: two calls, both from the first run
+    assert calls["connector_shorts"] == (2, 0)
+    by_wire = {c.id: c.wire.logical_id for c in harness.connections}
+    assert [by_wire[uuid.UUID(e.component_id)] for e in errors] == ["W1", "W2"]
+    assert db_session.scalars(select(models.HarnessChange)).all() == []
+
+    # Unchanged harness: the last result is served without running any rule
+    assert (
+        validator.validate_harness(db_session, harness, mock_project_settings) == errors
+    )
+    assert _calls(validator)["terminal_compatibility"] == (5, 1)
+
+    # Rewire W3 onto J2-0, shorting J1-0 and J1-3: its connectors and those
+    # on their nets are re-checked
+    harness_in = _harness_in([26.0, 22.0, 22.0, 26.0])
+    harness_in.connections[3].to_pin_id = "0"
+    harness = harness_service.update_harness(db_session, harness.id, harness_in)
+    errors = validator.validate_harness(db_session, harness, mock_project_settings)
+    calls = _calls(validator)
+    assert calls["shared_pins"] == (4, 0)
+    assert calls["connector_shorts"] == (4, 0)
+    assert calls["terminal_compatibility"] == (9, 1)
+    assert {e.error_type for e in errors} == {
+        "CompatibilityError",
+        "TopologyWarning",
+        "TopologyError",
+    }
+
+    # Same as a full validation
+    snapshot = db_session.get(models.ValidationSnapshot, harness.id)
+    db_session.delete(snapshot)
+    db_session.commit()
+    assert (
+        ValidationService().validate_harness(db_session, harness, mock_project_settings)
+        == errors
+    )
+
+
+def test_revalidation_reruns_everything_when_settings_change(
+    db_session: Session, mock_project_settings: models.ProjectSettings
+):
+    harness = harness_service.create_harness(db_session, _harness_in([26.0] * 2))
+    validator = ValidationService()
+    validator.validate_harness(db_session, harness, mock_project_settings)
+
+    mock_project_settings.system_voltage = 200.0
+    errors = validator.validate_harness(db_session, harness, mock_project_settings)
+
+    assert _calls(validator)["terminal_compatibility"] == (4, 0)
+    assert {e.error_type for e in errors} == {"ElectricalError"}
+
+
+def test_cached_result_follows_settings_and_catalog(
+    db_session: Session, mock_project_settings: models.ProjectSettings
+):
+    """
+    Test that a stored result is only served for the settings and catalog
+    version it was computed with.
+    """
+    harness = harness_service.create_harness(db_session, _harness_in([26.0] * 2))
+    validator = ValidationService()
+    validator.validate_harness(db_session, harness, mock_project_settings)
+    validator.validate_harness(db_session, harness, mock_project_settings)
+    assert _calls(validator)["terminal_compatibility"] == (2, 0)
+
+    mock_project_settings.require_ul = True
+    validator.validate_harness(db_session, harness, mock_project_settings)
+    assert _calls(validator)["terminal_compatibility"] == (4, 0)
+
+    catalog_service.upsert_specifications(
+        db_session, {"PHR-3": {"voltage_rating": 12.0}}
+    )
+    errors = validator.validate_harness(db_session, harness, mock_project_settings)
+    assert _calls(validator)["terminal_compatibility"] == (6, 0)
+    # Component specs were copied at creation, so the result is unchanged
+    assert errors == []
+
+
+def test_snapshot_is_saved_apart_from_the_callers_session(
+    db_session: Session, mock_project_settings: models.ProjectSettings
+):
+    """
+    Test that saving the snapshot neither commits nor discards the caller's
+    pending changes, and that deleting the harness removes its snapshot.
+    """
+    harness = harness_service.create_harness(db_session, _harness_in([26.0] * 2))
+    harness_id = harness.id
+    harness.name = "Pending rename"
+    ValidationService().validate_harness(db_session, harness, mock_project_settings)
+
+    assert harness.name == "Pending rename"
+    assert db_session.get(models.ValidationSnapshot, harness_id) is not None
+    db_session.rollback()
+    assert harness.name == "Incremental"
+
+    db_session.delete(harness)
+    db_session.commit()
+    assert db_session.get(models.ValidationSnapshot, harness_id) is None
+
+
+def test_sql_rules_run_without_loading_the_harness(
+    db_session: Session, mock_project_settings: models.ProjectSettings
+):
+    """
+    Test that rules with a SQL form report the offending rows without loading
+    the harness graph when no Python rule is active.
+    """
+    harness_in = _harness_in([26.0, 26.0])
+    harness_in.connectors[0].part_number = "OLD-CONN-01"  # 50V, not RoHS
+    harness_in.wires[1].part_number = "UNKNOWN-WIRE"
+    harness_id = harness_service.create_harness(db_session, harness_in).id
+    db_session.execute(
+        update(models.Wire)
+        .where(models.Wire.harness_id == harness_id)
+        .values(outer_diameter=2.5)
+    )
+    db_session.commit()
+    db_session.expunge_all()
+    harness = db_session.get(models.Harness, harness_id)
+    assert harness is not None
+    mock_project_settings.system_voltage = 60.0
+    mock_project_settings.disabled_rules = [
+        "terminal_compatibility",
+        "shared_pins",
+        "floating_pins",
+        "connector_shorts",
+    ]
+    validator = ValidationService()
+
+    errors = validator.validate_harness(db_session, harness, mock_project_settings)
+
+    assert "connections" in inspect(harness).unloaded
+    assert [(e.error_type, e.message) for e in errors] == [
+        (
+            "DataQualityError",
+            "Wire W1 (UNKNOWN-WIRE) has missing technical specifications.",
+        ),
+        (
+            "ElectricalError",
+            "Connector J1 voltage rating (50.0V) is less than system voltage (60.0V).",
+        ),
+        ("ComplianceError", "Component J1 (OLD-CONN-01) is not RoHS compliant."),
+        (
+            "PhysicalError",
+            "Wire W0 diameter (2.5mm) exceeds max diameter for connector J1 (2.0mm).",
+        ),
+        (
+            "PhysicalError",
+            "Wire W1 diameter (2.5mm) exceeds max diameter for connector J1 (2.0mm).",
+        ),
+    ]
+    assert errors[0].component_type == "Wire"
+    assert errors[-1].component_type == "Connection"
+    # Checks only run for the offending rows
+    assert _calls(validator)["missing_specs"] == (1, 0)
+    assert _calls(validator)["wire_diameter"] == (2, 0)
+
+
+def test_topology_rules(
+    db_session: Session, mock_project_settings: models.ProjectSettings
+):
+    """
+    Test that loopback wires, pins with several wire ends, unwired pins and
+    connector pins shorted through the harness are reported.
+    """
+    harness_in = _harness_in([26.0] * 3)
+    harness_in.connectors[0].pins.append(schemas.harness.PinCreate(id="9"))
+    # J1-0 -> J2-0 <- J1-1 shorts J1-0 and J1-1; W2 loops back on J2-2
+    harness_in.connections[1].to_pin_id = "0"
+    harness_in.connections[2].from_connector_id = "J2"
+    harness_in.connections[2].from_pin_id = "2"
+    harness = harness_service.create_harness(db_session, harness_in)
+
+    errors = ValidationService().validate_harness(
+        db_session, harness, mock_project_settings
+    )
+
+    topology = [
+        (e.error_type, e.message) for e in errors if e.error_type.startswith("Topo")
+    ]
+    assert topology == [
+        ("TopologyError", "Wire W2 starts and ends on pin J2-2."),
+        ("TopologyWarning", "Pin J2-0 terminates 2 wire ends."),
+        ("TopologyWarning", "Pin J1-2 is not connected to any wire."),
+        ("TopologyWarning", "Pin J1-9 is not connected to any wire."),
+        ("TopologyWarning", "Pin J2-1 is not connected to any wire."),
+        (
+            "TopologyError",
+            "Pins 0, 1 of connector J1 are shorted together through the harness.",
+        ),
+    ]
+
+
+def test_validate_harnesses_streams_every_result(
+    db_session: Session, mock_project_settings: models.ProjectSettings
+):
+    """
+    Test that harnesses validated concurrently each get a result, and that a
+    harness that cannot be validated is reported instead of aborting the rest.
+    """
+    harnesses = [
+        harness_service.create_harness(db_session, _harness_in(gauges))
+        for gauges in ([26.0], [22.0], [26.0, 26.0])
+    ]
+    missing_id = uuid.uuid4()
+    session_factory = sessionmaker(bind=db_session.get_bind())
+
+    results = {
+        r.harness_id: r
+        for r in ValidationService().validate_harnesses(
+            session_factory,
+            [h.id for h in harnesses] + [missing_id],
+            mock_project_settings,
+            max_workers=2,
+        )
+    }
+
+    assert set(results) == {h.id for h in harnesses} | {missing_id}
+    assert results[missing_id].failure == "Harness not found"
+    assert [len(results[h.id].errors) for h in harnesses] == [0, 1, 0]
+    assert results[harnesses[1].id].name == "Incremental"